@@ -0,0 +1,72 @@
+"""
+Micro-benchmark of the per-page overhead of converting Markdown to HTML.
+
+Compares creating a new converter for every page (``markdown.markdown``) with reusing the cached converter of
+:func:`ssg.content.markdown_file.get_converter`, on a corpus of small pages where the setup cost dominates.
+
+Usage:
+    python benchmarks/markdown_converter.py [--pages N] [--repeat R]
+"""
+
+import argparse
+import statistics
+import time
+
+import markdown
+
+from ssg.config import DEFAULT_MARKDOWN_EXTENSIONS
+from ssg.content.markdown_file import MarkDownFile
+from ssg.content.site_links import SiteLinksExtension
+
+PAGE_TEMPLATE = """\
+# Page {i}
+
+A short page with a [link](page-{next}.md), some *emphasis* and "quotes".
+
+## Section {i}
+
+- item one
+- item two
+"""
+
+
+def _corpus(pages: int) -> list[str]:
+    return [PAGE_TEMPLATE.format(i=i, next=i + 1) for i in range(pages)]
+
+
+def _convert_with_new_converter(corpus: list[str]):
+    for content in corpus:
+        markdown.markdown(content, extensions=DEFAULT_MARKDOWN_EXTENSIONS + [SiteLinksExtension()])
+
+
+def _convert_with_cached_converter(corpus: list[str]):
+    for content in corpus:
+        MarkDownFile(content).convert_to_html()
+
+
+def _time_per_page(function, corpus: list[str], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(corpus)
+        timings.append((time.perf_counter() - start) / len(corpus))
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=500, help="Number of pages in the corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of times the corpus is converted")
+    args = parser.parse_args()
+
+    corpus = _corpus(args.pages)
+    before = _time_per_page(_convert_with_new_converter, corpus, args.repeat)
+    after = _time_per_page(_convert_with_cached_converter, corpus, args.repeat)
+
+    print(f'New converter per page:    {before * 1e6:8.1f} us/page')
+    print(f'Cached converter:          {after * 1e6:8.1f} us/page')
+    print(f'Speedup:                   {before / after:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+"""
+End-to-end benchmark of building a synthetic site.
+
+Usage:
+    python -m benchmarks.site_build [--pages N] [--output results.json] [--baseline baseline.json]
+"""
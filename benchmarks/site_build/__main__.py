@@ -0,0 +1,73 @@
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.site_build.synthetic_site import SiteSpec, generate_site
+from benchmarks.site_build.timing import compare, run_benchmark
+
+
+def main() -> int:
+    defaults = SiteSpec()
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.site_build',
+                                     description='Build a synthetic site and time the build and each of its stages')
+    parser.add_argument('--pages', type=int, default=defaults.pages, help='Number of Markdown pages')
+    parser.add_argument('--depth', type=int, default=defaults.depth, help='Number of folder levels pages are spread on')
+    parser.add_argument('--fanout', type=int, default=defaults.fanout, help='Number of folders on each level')
+    parser.add_argument('--page-size', type=int, default=defaults.page_size, help='Approximate size of a page in bytes')
+    parser.add_argument('--code-blocks', type=int, default=defaults.code_blocks, help='Fenced code blocks per page')
+    parser.add_argument('--images', type=int, default=defaults.images, help='Images per page')
+    parser.add_argument('--cover-ratio', type=float, default=defaults.cover_ratio,
+                        help='Share of the pages having an img-* folder with a cover image')
+    parser.add_argument('--frames', type=int, default=defaults.frames, help='Number of frames')
+    parser.add_argument('--feeds', type=int, default=defaults.feeds, help='Number of RSS feeds')
+    parser.add_argument('--commits', type=int, default=defaults.commits, help='Length of the git history')
+    parser.add_argument('--seed', type=int, default=defaults.seed, help='Seed of the generated content')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of builds timed')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Number of worker processes used for rendering')
+    parser.add_argument('--output', type=Path, help='Write the results as JSON into this file')
+    parser.add_argument('--baseline', type=Path, help='Compare the results with the JSON results of an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Allowed slowdown compared to the baseline (default: 0.1, i.e. 10%%)')
+    parser.add_argument('--verbose', action='store_true', help='Print the output of the builds')
+    args = parser.parse_args()
+
+    spec = SiteSpec(pages=args.pages, depth=args.depth, fanout=args.fanout, page_size=args.page_size,
+                    code_blocks=args.code_blocks, images=args.images, cover_ratio=args.cover_ratio,
+                    frames=args.frames, feeds=args.feeds, commits=args.commits, seed=args.seed)
+
+    with tempfile.TemporaryDirectory(prefix='ssg-benchmark-') as workspace:
+        config_path = generate_site(Path(workspace), spec)
+        results = {'site': spec.to_dict(), **run_benchmark(config_path, args.repeat, args.jobs, args.verbose)}
+
+    print(f'{"Stage":<30} {"Median":>10} {"Min":>10} {"Calls":>7}')
+    print(f'{"total":<30} {results["total"]["median"] * 1000:>8.1f}ms {results["total"]["min"] * 1000:>8.1f}ms')
+    for name, stage in results['stages'].items():
+        print(f'{name:<30} {stage["median"] * 1000:>8.1f}ms {stage["min"] * 1000:>8.1f}ms {stage["calls"]:>7}')
+
+    if args.output is not None:
+        with open(args.output, mode='w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline is None:
+        return 0
+
+    with open(args.baseline, mode='r', encoding='utf-8') as file:
+        baseline = json.load(file)
+    if baseline.get('site') != results['site']:
+        print('Warning! The baseline was recorded on a different site, the comparison is not meaningful.')
+
+    print()
+    print(f'{"Stage":<30} {"Baseline":>10} {"Current":>10} {"Change":>8}')
+    regressed = False
+    for name, before, after, is_regression in compare(results, baseline, args.threshold):
+        change = (after - before) / before * 100 if before else 0.0
+        print(f'{name:<30} {before * 1000:>8.1f}ms {after * 1000:>8.1f}ms {change:>+7.1f}%'
+              f'{"  REGRESSION" if is_regression else ""}')
+        regressed |= is_regression
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""Generation of reproducible synthetic sites, along with their git history and config.json."""
+
+import json
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import pygit2
+
+WORDS = ('static', 'site', 'generator', 'markdown', 'frame', 'article', 'python', 'build', 'feed', 'cover', 'image',
+         'page', 'link', 'commit', 'history', 'template', 'render', 'cache', 'stage', 'benchmark', 'the', 'a', 'of',
+         'and', 'to', 'in', 'with', 'for', 'is', 'on')
+
+CODE_BLOCK = """\
+```python
+def fibonacci(n: int) -> int:
+    if n < 2:
+        return n
+    return fibonacci(n - 1) + fibonacci(n - 2)
+```
+"""
+
+FRAME = """\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <title>Synthetic site</title>
+    <link rel="stylesheet" href="style.css">
+</head>
+<body>
+<nav><a href="index.html">Home</a> <a href="https://example.org/">External</a></nav>
+<h2>Frame {index}</h2>
+<article id="main-content"></article>
+<footer><a href="about.html">About</a></footer>
+</body>
+</html>
+"""
+
+# Smallest valid PNG file, 1x1 pixel.
+PNG = bytes.fromhex('89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+                    '1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082')
+
+
+@dataclass(frozen=True)
+class SiteSpec:
+    """Shape of a synthetic site. The same spec and seed always produce the same site."""
+    pages: int = 200
+    depth: int = 2
+    fanout: int = 4
+    page_size: int = 4000
+    code_blocks: int = 1
+    images: int = 1
+    cover_ratio: float = 0.5
+    frames: int = 3
+    feeds: int = 2
+    commits: int = 100
+    seed: int = 1
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def page_path(spec: SiteSpec, index: int) -> Path:
+    """
+    :return: path of a page relative to the source folder. Pages are spread over ``fanout`` folders on each of the
+    ``depth`` levels.
+    """
+    parts = [f'section-{(index // spec.fanout ** level) % spec.fanout}' for level in range(spec.depth)]
+    return Path(*parts, f'page-{index}.md')
+
+
+def generate_site(workspace: Path, spec: SiteSpec) -> Path:
+    """
+    Write a synthetic site into an empty folder: the source folder with its git history and a config.json building
+    it into a destination folder next to it.
+    :param workspace: folder receiving the ``source`` and ``destination`` folders and ``config.json``
+    :param spec: shape of the site
+    :return: path of config.json
+    """
+    rng = random.Random(spec.seed)
+    source = workspace / 'source'
+    destination = workspace / 'destination'
+    source.mkdir(parents=True)
+    destination.mkdir(parents=True, exist_ok=True)
+
+    frames = [Path('frames', f'frame-{index}.html') for index in range(max(spec.frames, 1))]
+    for index, frame in enumerate(frames):
+        _write(source / frame, FRAME.format(index=index))
+    _write(source / 'style.css', 'body { font-family: sans-serif; }\n')
+    _write_bytes(source / 'images' / 'banner.png', PNG)
+
+    paths = [page_path(spec, index) for index in range(spec.pages)]
+    for index, path in enumerate(paths):
+        _write(source / path, _page(spec, rng, index, path, paths))
+        for image in range(spec.images):
+            _write_bytes(source / path.parent / f'{path.stem}-{image}.png', PNG)
+        if rng.random() < spec.cover_ratio:
+            _write_bytes(source / path.parent / f'img-{path.stem}' / 'cover.png', PNG)
+
+    _create_history(source, paths, spec, rng)
+
+    config_path = workspace / 'config.json'
+    with open(config_path, mode='w', encoding='utf-8') as file:
+        json.dump(_config(source, destination, frames, spec), file, indent=2)
+    return config_path
+
+
+def _page(spec: SiteSpec, rng: random.Random, index: int, path: Path, paths: list[Path]) -> str:
+    lines = [f'# Page {index}', '']
+    target = paths[rng.randrange(len(paths))]
+    lines += [f'See also [page {target.stem}]({Path(*[".."] * len(path.parent.parts), target).as_posix()}).', '']
+    for image in range(spec.images):
+        lines += [f'![Figure {image}]({path.stem}-{image}.png)', '']
+    blocks = 0
+    size = sum(len(line) + 1 for line in lines)
+    while size < spec.page_size or blocks < spec.code_blocks:
+        if size >= spec.page_size or (blocks < spec.code_blocks and rng.random() < 0.2):
+            lines += [CODE_BLOCK]
+            blocks += 1
+            size += len(CODE_BLOCK)
+            continue
+        if rng.random() < 0.1:
+            lines += [f'## Section {len(lines)}', '']
+        paragraph = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(30, 80))).capitalize() + '.'
+        lines += [paragraph, '']
+        size += len(paragraph) + 2
+    return '\n'.join(lines)
+
+
+def _create_history(source: Path, paths: list[Path], spec: SiteSpec, rng: random.Random):
+    """
+    Commit the whole site, then edit one random page in each of the following commits.
+    """
+    repo = pygit2.init_repository(source)
+    repo.index.add_all()
+    parents = []
+    for commit in range(max(spec.commits, 1)):
+        if commit > 0:
+            path = paths[rng.randrange(len(paths))] if paths else Path('style.css')
+            with open(source / path, mode='a', encoding='utf-8') as file:
+                file.write(f'\nEdited in commit {commit}.\n')
+            repo.index.add(path.as_posix())
+        repo.index.write()
+        # One commit per hour, starting at 2024-01-01.
+        signature = pygit2.Signature('Benchmark', 'benchmark@example.com', 1704067200 + commit * 3600, 0)
+        parents = [repo.create_commit('HEAD', signature, signature, f'Commit {commit}', repo.index.write_tree(),
+                                      parents)]
+
+
+def _config(source: Path, destination: Path, frames: list[Path], spec: SiteSpec) -> dict:
+    frame_rules = [{'file': f'section-{index}/*.md', 'frame': frame.as_posix()}
+                   for index, frame in enumerate(frames[:-1])] if spec.depth > 0 else []
+    frame_rules.append({'file': '*.md', 'frame': frames[-1].as_posix()})
+
+    feeds = [{'title': 'All', 'description': 'Every page', 'link': 'https://example.com/',
+              'feed_url': 'https://example.com/rss.xml', 'language': 'en', 'matcher': '*.md', 'limit': 20,
+              'outputLocation': 'rss.xml'}]
+    feeds += [{'title': f'Section {index}', 'description': f'Pages of section {index}',
+               'link': 'https://example.com/', 'feed_url': f'https://example.com/section-{index}.xml',
+               'language': 'en', 'matcher': f'section-{index}/*.md', 'outputLocation': f'section-{index}.xml'}
+              for index in range(spec.feeds - 1)]
+
+    return {
+        'source': source.as_posix(),
+        'destination': destination.as_posix(),
+        'hostname': 'example.com',
+        'baseHref': 'https://example.com/',
+        'meta': {
+            'default': {
+                'og:title': 'Synthetic site',
+                'og:image': 'images/banner.png',
+                'og:description': 'Synthetic site used for benchmarking',
+                'og:url': 'https://example.com/',
+            },
+            'matchers': [{'file': '*.md', 'action': 'TAKE_FROM_CONTENT'}],
+        },
+        'frames': frame_rules,
+        'rssFeeds': feeds[:spec.feeds],
+    }
+
+
+def _write(path: Path, content: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding='utf-8')
+
+
+def _write_bytes(path: Path, content: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
@@ -0,0 +1,123 @@
+"""Timing of a whole build and of its stages, and comparison of the results with a baseline."""
+
+import contextlib
+import io
+import platform
+import shutil
+import statistics
+import time
+from pathlib import Path
+
+import ssg.engine.engine
+import ssg.template.html_file
+from ssg.config import read_config
+from ssg.content.markdown_file import MarkDownFile
+from ssg.engine.engine import Engine
+from ssg.git.git import GitClient
+from ssg.rss.rss_feed_generator import RssFeedGenerator
+from ssg.template.compiled_template import CompiledTemplate
+
+# Timed stages: name -> (owner, attribute) of the function timed. Pages are rendered by splicing the content into a
+# compiled template, which replaced HTMLFile.from_article, and are written by write_html, which replaced
+# HTMLFile.write. Times are inclusive: render_page includes convert_to_html.
+STAGES = {
+    'create_directory_tree': (ssg.engine.engine, 'create_directory_tree'),
+    'get_last_edit_time_for_files': (GitClient, 'get_last_edit_time_for_files'),
+    'convert_to_html': (MarkDownFile, 'convert_to_html'),
+    'render_page': (CompiledTemplate, 'render'),
+    'write_html': (ssg.template.html_file, 'write_html'),
+    'generate_feeds': (RssFeedGenerator, 'generate_feeds'),
+}
+
+
+class StageTimer:
+    """
+    Replace the functions of :data:`STAGES` with wrappers adding up the time spent in them and counting the calls,
+    while inside the context. Only calls made in the current process are timed.
+    """
+
+    def __init__(self):
+        self.seconds: dict[str, float] = {name: 0.0 for name in STAGES}
+        self.calls: dict[str, int] = {name: 0 for name in STAGES}
+        self._originals = {}
+
+    def __enter__(self):
+        for name, (owner, attribute) in STAGES.items():
+            original = getattr(owner, attribute)
+            self._originals[name] = original
+            setattr(owner, attribute, self._wrap(name, original))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for name, (owner, attribute) in STAGES.items():
+            setattr(owner, attribute, self._originals[name])
+        return False
+
+    def _wrap(self, name, function):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.seconds[name] += time.perf_counter() - start
+                self.calls[name] += 1
+        return timed
+
+
+def run_benchmark(config_path: Path, repeat: int = 3, jobs: int = 1, verbose: bool = False) -> dict:
+    """
+    Build a site several times from scratch, timing the whole build and each stage.
+    :param config_path: path of config.json
+    :param repeat: number of builds
+    :param jobs: passed to :class:`Engine`. With more than one job, stages run in worker processes are not timed
+    :param verbose: print the output of the builds
+    :return: JSON serializable results, the median and the minimum of each time in seconds
+    """
+    config = read_config(config_path)
+    totals = []
+    stages = {name: [] for name in STAGES}
+    calls = {}
+    for _ in range(repeat):
+        shutil.rmtree(config.destination, ignore_errors=True)
+        config.destination.mkdir(parents=True)
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        with output, StageTimer() as timer:
+            start = time.perf_counter()
+            Engine(config, jobs=jobs).run()
+            totals.append(time.perf_counter() - start)
+        for name in STAGES:
+            stages[name].append(timer.seconds[name])
+        calls = timer.calls
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'jobs': jobs,
+        'total': _summary(totals),
+        'stages': {name: {**_summary(times), 'calls': calls[name]} for name, times in stages.items()},
+    }
+
+
+def _summary(times: list[float]) -> dict:
+    return {'median': statistics.median(times), 'min': min(times)}
+
+
+def compare(results: dict,
+            baseline: dict,
+            threshold: float,
+            min_difference: float = 0.005) -> list[tuple[str, float, float, bool]]:
+    """
+    Compare the median times of two runs.
+    :param results: results of :func:`run_benchmark`
+    :param baseline: results of an earlier run
+    :param threshold: allowed slowdown, e.g. 0.1 allows times up to 10% slower than the baseline
+    :param min_difference: slowdowns of fewer seconds are not regressions, so stages taking a few milliseconds do not
+    fail the comparison because of noise
+    :return: for the total and each stage present in both: name, baseline time, time and whether it regressed
+    """
+    rows = [('total', baseline['total']['median'], results['total']['median'])]
+    rows += [(name, baseline['stages'][name]['median'], stage['median'])
+             for name, stage in results['stages'].items() if name in baseline.get('stages', {})]
+    return [(name, before, after, after > before * (1 + threshold) and after - before > min_difference)
+            for name, before, after in rows]
@@ -1,21 +1,134 @@
 import argparse
+import sys
 from pathlib import Path
 
-from ssg.config import read_config
-from ssg.engine.engine import Engine
-
 
 def main():
     """
-    Entry point.
+    Entry point. The engine is imported only when a build is made, so ``--check`` and ``--help`` return quickly.
+    ``ssg merge`` merges the shards of a build, see :func:`merge`, and ``--check`` is handled by :func:`check`.
     :return: None
     """
+    if sys.argv[1:2] == ['merge']:
+        merge(sys.argv[2:])
+        return
+    if '--check' in sys.argv[1:]:
+        check(sys.argv[1:])
+        return
     parser = argparse.ArgumentParser()
     parser.add_argument("config", help="Path of the config.json file", type=Path)
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only render pages whose inputs changed since the previous build")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Number of worker processes used for rendering pages (default: 1)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and rebuild the pages affected by every change of the source folder")
+    parser.add_argument("--explain", type=Path, metavar="FILE",
+                        help="Write the dependencies of every output of the build into FILE as JSON")
+    parser.add_argument("--changed", type=Path, action="append", metavar="PATH",
+                        help="Source path, relative to the source folder, whose affected outputs are added to the "
+                             "--explain output. Can be given multiple times")
+    parser.add_argument("--profile", type=Path, metavar="FILE",
+                        help="Record the time spent in each stage of the build and on each page, write it into FILE as "
+                             "JSON and print the slowest pages")
+    parser.add_argument("--profile-top", type=int, default=10, metavar="N",
+                        help="Number of the slowest pages printed with --profile (default: 10)")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="Also record the peak memory allocated during the build with --profile. Makes the build "
+                             "several times slower")
+    parser.add_argument("--cprofile", type=Path, metavar="FILE",
+                        help="Profile the loop rendering pages with cProfile and dump the stats into FILE. "
+                             "Requires --profile")
+    parser.add_argument("--check", action="store_true",
+                        help="Do not build, exit with status 1 if the source folder, config.json or the git HEAD "
+                             "changed since the last build, 0 otherwise")
+    parser.add_argument("--shard", type=_shard, metavar="I/N",
+                        help="Split the pages and assets into N shards of about the same size and only build the I-th "
+                             "one, along with a partial result merged by 'ssg merge'")
+    parser.add_argument("--destination", type=Path, metavar="DIR",
+                        help="Write the site into DIR instead of the destination folder of config.json")
     args = parser.parse_args()
-    config = read_config(args.config)
-    ssg_engine = Engine(config)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.changed and args.explain is None:
+        parser.error("--changed requires --explain")
+    if (args.cprofile is not None or args.profile_memory) and args.profile is None:
+        parser.error("--cprofile and --profile-memory require --profile")
+    if args.profile is not None and args.watch:
+        parser.error("--profile cannot be used with --watch")
+    if args.shard is not None and args.watch:
+        parser.error("--shard cannot be used with --watch")
+    if args.watch:
+        from ssg.engine.watch import Watcher
+        Watcher(args.config, incremental=args.incremental, jobs=args.jobs, destination=args.destination).watch()
+        return
+    from ssg.engine.engine import Engine
+    from ssg.engine.profiler import BuildProfiler
+    config = _read_config(args.config, args.destination)
+    profiler = BuildProfiler(trace_memory=args.profile_memory, cprofile_path=args.cprofile) if args.profile is not None else None
+    ssg_engine = Engine(config, incremental=args.incremental, jobs=args.jobs, profiler=profiler, shard=args.shard)
     ssg_engine.run()
+    if args.explain is not None:
+        ssg_engine.dependencies.save(args.explain, args.changed)
+    if profiler is not None:
+        profiler.save(args.profile)
+        print(profiler.summary(args.profile_top))
+
+
+def check(arguments: list[str]):
+    """
+    Entry point of ``--check``. Its parser only knows the options which can be used with ``--check``, and the
+    configuration model is not imported, see :func:`ssg.engine.check.is_config_file_up_to_date`.
+    :param arguments: command line arguments
+    :return: None
+    """
+    parser = argparse.ArgumentParser(prog="ssg",
+                                     description="Exit with status 1 if the site is out of date, 0 otherwise")
+    parser.add_argument("config", help="Path of the config.json file", type=Path)
+    parser.add_argument("--check", action="store_true", required=True)
+    parser.add_argument("--destination", type=Path, metavar="DIR",
+                        help="Check the site in DIR instead of the destination folder of config.json")
+    args = parser.parse_args(arguments)
+    from ssg.engine.check import is_config_file_up_to_date
+    if is_config_file_up_to_date(args.config, args.destination):
+        print('Site is up to date.')
+        return
+    print('Site is out of date.')
+    sys.exit(1)
+
+
+def merge(arguments: list[str]):
+    """
+    Entry point of ``ssg merge``: merge the destination folders of the shards of a build into the site.
+    :param arguments: command line arguments following ``merge``
+    :return: None
+    """
+    parser = argparse.ArgumentParser(prog="ssg merge",
+                                     description="Merge the destination folders of the shards built with --shard")
+    parser.add_argument("config", help="Path of the config.json file", type=Path)
+    parser.add_argument("shards", nargs="+", type=Path, metavar="SHARD_DIR",
+                        help="Destination folder of a shard, every shard of the build must be given")
+    parser.add_argument("--destination", type=Path, metavar="DIR",
+                        help="Write the site into DIR instead of the destination folder of config.json")
+    args = parser.parse_args(arguments)
+    from ssg.engine.shard import merge_shards
+    merge_shards(_read_config(args.config, args.destination), args.shards)
+
+
+def _read_config(path: Path, destination: Path | None):
+    from ssg.config import read_config
+    config = read_config(path)
+    if destination is not None:
+        config.destination = destination
+    return config
+
+
+def _shard(value: str):
+    from ssg.engine.shard import Shard
+    try:
+        return Shard.parse(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
 
 
 if __name__ == '__main__':
@@ -1 +1,6 @@
-from .config import *
+import importlib
+
+
+def __getattr__(name):
+    # The configuration model imports dataclasses, which is slow to import and not needed by ``--check``.
+    return getattr(importlib.import_module(f'{__name__}.config'), name)
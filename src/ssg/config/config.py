@@ -1,10 +1,22 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Literal
 
+from ssg.config.config_file import DEFAULT_EXCLUDE, content_hash, read_config_file
+
+
+HtmlOutputFormat = Literal['pretty', 'compact', 'as-is']
+
+AssetSyncMode = Literal['always', 'size-mtime', 'hash']
+
+AssetLinkMode = Literal['copy', 'hardlink', 'reflink']
+
+OutputWriteMode = Literal['always', 'if-changed']
+
+DEFAULT_MARKDOWN_EXTENSIONS = ['extra', 'sane_lists', 'smarty', 'pymdownx.tilde']
+
 
 @dataclass
 class MetaFields:
@@ -31,6 +43,14 @@ class Meta:
     matchers: list[Matcher]
 
 
+@dataclass
+class SyntaxHighlight:
+    """Settings of the highlighting of fenced code blocks with Pygments."""
+    style: str = 'default'
+    stylesheet: Path = Path('highlight.css')
+    cssClass: str = 'highlight'
+
+
 @dataclass
 class Frame:
     file: str
@@ -62,6 +82,21 @@ class Config:
     meta: Optional[Meta]
     frames: list[Frame]
     rssFeeds: list[RssFeed] = field(default_factory=list)
+    cacheDir: Optional[Path] = None
+    # Maximum size of the cache of converted Markdown in the cache directory, in megabytes. 0 disables the cache.
+    htmlCacheSize: int = 100
+    htmlOutput: HtmlOutputFormat = 'pretty'
+    assetSync: AssetSyncMode = 'always'
+    assetLink: AssetLinkMode = 'copy'
+    outputWrite: OutputWriteMode = 'always'
+    scanThreads: int = 1
+    markdownExtensions: list[str] = field(default_factory=lambda: list(DEFAULT_MARKDOWN_EXTENSIONS))
+    markdownExtensionConfigs: dict[str, dict] = field(default_factory=dict)
+    # Code blocks are highlighted only if set.
+    syntaxHighlight: Optional[SyntaxHighlight] = None
+    # Hash of the content of config.json, set by read_config. Used in place of the other fields by ``--check``, which
+    # does not build a Config.
+    configHash: Optional[str] = None
 
     @staticmethod
     def from_json(json_config: dict) -> Config:
@@ -123,14 +158,54 @@ class Config:
             for feed in json_config.get('rssFeeds', [])
         ]
 
+        html_output = json_config.get('htmlOutput', 'pretty')
+        if html_output not in ('pretty', 'compact', 'as-is'):
+            raise Exception(f"Invalid htmlOutput {html_output}")
+
+        asset_sync = json_config.get('assetSync', 'always')
+        if asset_sync not in ('always', 'size-mtime', 'hash'):
+            raise Exception(f"Invalid assetSync {asset_sync}")
+
+        asset_link = json_config.get('assetLink', 'copy')
+        if asset_link not in ('copy', 'hardlink', 'reflink'):
+            raise Exception(f"Invalid assetLink {asset_link}")
+
+        output_write = json_config.get('outputWrite', 'always')
+        if output_write not in ('always', 'if-changed'):
+            raise Exception(f"Invalid outputWrite {output_write}")
+
+        html_cache_size = json_config.get('htmlCacheSize', 100)
+        if not isinstance(html_cache_size, int) or isinstance(html_cache_size, bool) or html_cache_size < 0:
+            raise Exception(f"Invalid htmlCacheSize {html_cache_size}")
+
+        syntax_highlight = None
+        if 'syntaxHighlight' in json_config:
+            highlight_dict = json_config['syntaxHighlight']
+            if not isinstance(highlight_dict, dict) or not all(
+                    isinstance(highlight_dict.get(key, ''), str) for key in ('style', 'stylesheet', 'cssClass')):
+                raise Exception(f"Invalid syntaxHighlight {highlight_dict}")
+            syntax_highlight = SyntaxHighlight(style=highlight_dict.get('style', 'default'),
+                                               stylesheet=Path(highlight_dict.get('stylesheet', 'highlight.css')),
+                                               cssClass=highlight_dict.get('cssClass', 'highlight'))
+
         return Config(source=Path(json_config['source']),
                       destination=Path(json_config['destination']),
                       hostname=json_config['hostname'],
                       baseHref=json_config['baseHref'],
-                      exclude=json_config.get('exclude', ['.git', 'ignore', 'README.md']),
+                      exclude=json_config.get('exclude', list(DEFAULT_EXCLUDE)),
                       meta=meta,
                       frames=frames,
-                      rssFeeds=rss_feeds)
+                      rssFeeds=rss_feeds,
+                      cacheDir=Path(json_config['cacheDir']) if 'cacheDir' in json_config else None,
+                      htmlCacheSize=html_cache_size,
+                      htmlOutput=html_output,
+                      assetSync=asset_sync,
+                      assetLink=asset_link,
+                      outputWrite=output_write,
+                      scanThreads=json_config.get('scanThreads', 1),
+                      markdownExtensions=json_config.get('markdownExtensions', list(DEFAULT_MARKDOWN_EXTENSIONS)),
+                      markdownExtensionConfigs=json_config.get('markdownExtensionConfigs', {}),
+                      syntaxHighlight=syntax_highlight)
 
 
 def read_config(path: Path) -> Config:
@@ -139,6 +214,7 @@ def read_config(path: Path) -> Config:
     :param path: path of the config file
     :return: a Config object with all the properties from the config file.
     """
-    with open(path, 'r', encoding='utf-8') as file:
-        config = json.load(file)
-        return Config.from_json(config)
+    content = read_config_file(path)
+    config = Config.from_json(content)
+    config.configHash = content_hash(content)
+    return config
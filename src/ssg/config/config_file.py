@@ -0,0 +1,28 @@
+"""
+Reading of the config.json file, apart from the configuration model built from it, so ``--check`` can read the few
+settings it needs without importing the model.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+# Names and paths excluded from the source folder if config.json does not list any.
+DEFAULT_EXCLUDE = ['.git', 'ignore', 'README.md']
+
+
+def read_config_file(path: Path) -> dict:
+    """
+    :param path: path of the config file
+    :return: the content of the config file
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def content_hash(content: dict) -> str:
+    """
+    :param content: content of a config file
+    :return: hex digest of the content, which does not depend on the formatting of the file
+    """
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
@@ -0,0 +1,120 @@
+"""Glob patterns of the configuration compiled into regular expressions, so paths are matched in one lookup."""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from ssg.config.config import Config, Matcher, RssFeed
+
+# fnmatch.fnmatch normalizes the case of both the name and the pattern on case-insensitive platforms.
+_FLAGS = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+
+
+class PatternList:
+    """
+    An ordered list of fnmatch patterns compiled into a single regex. Each pattern becomes a named alternative, and
+    since alternatives are tried in order, the name of the matching group is the index of the first matching pattern.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        :param patterns: fnmatch patterns, in order of precedence
+        """
+        self.patterns = list(patterns)
+        self._pattern_regexes = [re.compile(fnmatch.translate(pattern), _FLAGS) for pattern in self.patterns]
+        self._regex = re.compile('|'.join(f'(?P<p{i}>{fnmatch.translate(pattern)})'
+                                          for i, pattern in enumerate(self.patterns)), _FLAGS) \
+            if self.patterns else None
+
+    def first_match(self, path: str) -> int | None:
+        """
+        :param path: POSIX path or name to be matched
+        :return: index of the first pattern matching the path or None if no pattern matches
+        """
+        if self._regex is None:
+            return None
+        match = self._regex.match(path)
+        return int(match.lastgroup[1:]) if match else None
+
+    def all_matches(self, path: str) -> list[int]:
+        """
+        :param path: POSIX path or name to be matched
+        :return: indices of all the patterns matching the path, in order
+        """
+        first = self.first_match(path)
+        if first is None:
+            return []
+        return [first] + [i for i in range(first + 1, len(self.patterns)) if self._pattern_regexes[i].match(path)]
+
+    def matches(self, path: str) -> bool:
+        """
+        :param path: POSIX path or name to be matched
+        :return: True if any of the patterns matches the path
+        """
+        return self.first_match(path) is not None
+
+    def matches_name_or_path(self, name: str, path: str) -> bool:
+        """
+        :param name: name of a file or directory
+        :param path: POSIX path of the same file or directory
+        :return: True if any of the patterns matches either the name or the path
+        """
+        return self.matches(name) or self.matches(path)
+
+
+class PathRouter:
+    """
+    Answers which frame, meta matcher and RSS feeds apply to a source file, and whether it is excluded, using the
+    patterns of the configuration compiled once.
+
+    Paths are relative to the source folder.
+    """
+
+    def __init__(self, config: Config):
+        """
+        :param config: site configuration
+        """
+        self.config = config
+        self.exclude = PatternList(config.exclude)
+        self.frames = PatternList(frame.file for frame in config.frames)
+        self.meta_matchers = PatternList(matcher.file for matcher in config.meta.matchers) \
+            if config.meta is not None else PatternList([])
+        self.feeds = PatternList(feed.matcher for feed in config.rssFeeds)
+        self.frame_paths = frozenset(frame.frame for frame in config.frames)
+
+    def is_excluded(self, path: Path) -> bool:
+        """
+        :return: True if the name or the path of the file matches any of the exclude patterns
+        """
+        return self.exclude.matches_name_or_path(path.name, path.as_posix())
+
+    def get_frame(self, path: Path) -> Path | None:
+        """
+        :return: the frame of the first frame pattern matching the path or None if there is no such pattern
+        """
+        index = self.frames.first_match(path.as_posix())
+        return self.config.frames[index].frame if index is not None else None
+
+    def is_frame(self, path: Path) -> bool:
+        """
+        :return: True if the file is used as a frame
+        """
+        return path in self.frame_paths
+
+    def get_meta_matcher(self, path: Path) -> Matcher | None:
+        """
+        :return: the first meta matcher matching the path or None if there is no such matcher
+        """
+        index = self.meta_matchers.first_match(path.as_posix())
+        return self.config.meta.matchers[index] if index is not None else None
+
+    def get_feeds(self, path: Path) -> list[RssFeed]:
+        """
+        :return: every RSS feed whose matcher matches the path
+        """
+        return [self.config.rssFeeds[i] for i in self.feeds.all_matches(path.as_posix())]
@@ -0,0 +1,137 @@
+"""
+Highlighting of fenced code blocks with Pygments, applied to the HTML converted from Markdown. Highlighted blocks are
+cached, so a code block repeated across pages and builds is lexed once.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import html
+import json
+import re
+from typing import Optional
+
+from ssg.config import SyntaxHighlight
+from ssg.content.html_cache import HtmlCache
+
+HIGHLIGHT_CACHE_DIR_NAME = 'highlight'
+
+# Bump whenever the HTML produced for the same code block changes.
+HIGHLIGHT_CACHE_VERSION = 1
+
+# Code block with a language, as written by the fenced_code extension: ```python becomes
+# <pre><code class="language-python">, with the code escaped. Blocks given other attributes, e.g. with
+# ```{.python #example}, are not matched, since the highlighted block could not keep them.
+_CODE_BLOCK_RE = re.compile(r'<pre><code class="language-([^"\s]+)">(.*?)</code></pre>', re.DOTALL)
+
+
+@functools.cache
+def _pygments_version() -> str:
+    import pygments
+    return pygments.__version__
+
+
+@functools.cache
+def _lexer(language: str):
+    """
+    :param language: name or alias of a language, in lower case
+    :return: the Pygments lexer of the language, None if Pygments does not know it
+    """
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+    try:
+        return get_lexer_by_name(language)
+    except ClassNotFound:
+        return None
+
+
+class CodeHighlighter:
+    """
+    Replace the fenced code blocks of converted Markdown with their highlighted HTML. Tokens are marked with CSS
+    classes instead of inline styles, and the colors are defined once in the stylesheet returned by
+    :meth:`stylesheet`.
+
+    Highlighted blocks are kept in memory, and in ``cache`` if given, keyed by the language, a hash of the code and the
+    formatter options. The style only changes the stylesheet, so changing it does not invalidate the cache. Blocks
+    without a language, with a language Pygments does not know, or with other attributes than their language, are left
+    as they are.
+
+    Pygments is imported when the first block is highlighted.
+    """
+
+    def __init__(self, settings: SyntaxHighlight, cache: Optional[HtmlCache] = None):
+        """
+        :param settings: highlighting settings of the site
+        :param cache: persistent cache of highlighted blocks, shared between builds, if given
+        """
+        self.settings = settings
+        self.cache = cache
+        # None for the blocks whose language Pygments does not know.
+        self._highlighted: dict[str, Optional[str]] = {}
+
+    def options(self) -> dict:
+        """
+        :return: the options changing the HTML of highlighted blocks, which are part of the key of a converted page
+        """
+        return {'version': HIGHLIGHT_CACHE_VERSION, 'cssClass': self.settings.cssClass}
+
+    def highlight_html(self, content: str) -> str:
+        """
+        Highlight every fenced code block of an HTML fragment.
+        :param content: HTML converted from Markdown
+        :return: the HTML with highlighted code blocks
+        """
+        if '<pre><code class="language-' not in content:
+            return content
+        return _CODE_BLOCK_RE.sub(self._highlight_block, content)
+
+    def highlight(self, language: str, code: str) -> Optional[str]:
+        """
+        Highlight a code block, reusing the cached HTML of the same block.
+        :param language: name or alias of the language, e.g. ``python``
+        :param code: code of the block
+        :return: the highlighted block, or None if the language is not known
+        """
+        key = self.key(language, code)
+        if key in self._highlighted:
+            return self._highlighted[key]
+        highlighted = self.cache.get(key) if self.cache is not None else None
+        if highlighted is None:
+            lexer = _lexer(language.lower())
+            if lexer is None:
+                self._highlighted[key] = None
+                return None
+            from pygments import highlight
+            from pygments.formatters.html import HtmlFormatter
+            highlighted = highlight(code, lexer, HtmlFormatter(cssclass=self.settings.cssClass, wrapcode=True))
+            if self.cache is not None:
+                self.cache.put(key, highlighted)
+        self._highlighted[key] = highlighted
+        return highlighted
+
+    def key(self, language: str, code: str) -> str:
+        """
+        :return: key of a highlighted code block
+        """
+        digest = hashlib.sha256(json.dumps([self.options(), _pygments_version(), language.lower()]).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(code.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def stylesheet(self) -> str:
+        """
+        :return: the CSS rules of the configured style for the highlighted blocks
+        :raise Exception: if Pygments does not know the style
+        """
+        from pygments.formatters.html import HtmlFormatter
+        from pygments.util import ClassNotFound
+        try:
+            formatter = HtmlFormatter(style=self.settings.style, cssclass=self.settings.cssClass)
+        except ClassNotFound:
+            raise Exception(f'Invalid syntaxHighlight style {self.settings.style}')
+        return formatter.get_style_defs(f'.{self.settings.cssClass}') + '\n'
+
+    def _highlight_block(self, match: re.Match) -> str:
+        highlighted = self.highlight(html.unescape(match.group(1)), html.unescape(match.group(2)))
+        return highlighted if highlighted is not None else match.group(0)
@@ -0,0 +1,205 @@
+"""
+Content-addressed cache of the HTML converted from Markdown, stored in the cache directory and shared between builds,
+worker processes and machines.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import importlib.metadata
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ssg.content.markdown_file import MarkDownFile
+
+if TYPE_CHECKING:
+    from ssg.content.highlight import CodeHighlighter
+
+HTML_CACHE_DIR_NAME = 'html'
+
+# Bump whenever the HTML produced from the same Markdown changes (e.g. a change of SiteLinksExtension).
+HTML_CACHE_VERSION = 2
+
+# Distributions whose version changes the HTML produced from the same Markdown.
+CONVERTER_DISTRIBUTIONS = ('ssg', 'Markdown', 'pymdown-extensions', 'python-slugify', 'Pygments')
+
+_ENTRY_SUFFIX = '.html'
+_TEMPORARY_PREFIX = '.tmp-'
+
+# Temporary files older than this are left over by a crashed process, and are deleted while evicting entries.
+_STALE_TEMPORARY_SECONDS = 3600
+
+
+@functools.cache
+def converter_versions() -> tuple[tuple[str, str | None], ...]:
+    """
+    :return: the installed version of each of :data:`CONVERTER_DISTRIBUTIONS`, None for the missing ones
+    """
+    versions = []
+    for name in CONVERTER_DISTRIBUTIONS:
+        try:
+            versions.append((name, importlib.metadata.version(name)))
+        except importlib.metadata.PackageNotFoundError:
+            versions.append((name, None))
+    return tuple(versions)
+
+
+@dataclass
+class CacheStats:
+    """Number of cache hits and misses."""
+    hits: int = 0
+    misses: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def merge(self, other: CacheStats):
+        with self._lock:
+            self.hits += other.hits
+            self.misses += other.misses
+
+    def __getstate__(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __str__(self):
+        return f'{self.hits} hits, {self.misses} misses'
+
+
+class HtmlCache:
+    """
+    Cache of the output of :meth:`MarkDownFile.convert_to_html`.
+
+    Entries are keyed by a hash of the Markdown source, the extensions and their settings, the base href, the options
+    of the highlighting of code blocks and the versions of the libraries used for converting, so the cache does not
+    depend on paths or modification times and can be saved and restored between machines (e.g. as a CI cache). Each
+    entry is a file named after its key, written to a temporary file and moved into place, so processes sharing the
+    directory never read partial entries.
+
+    The modification time of an entry is updated on every hit, and :meth:`evict` deletes the least recently used
+    entries until the cache fits its maximum size.
+    """
+
+    def __init__(self, directory: Path, max_size: int):
+        """
+        :param directory: directory holding the entries, created when the first entry is written
+        :param max_size: maximum size of the entries in bytes, enforced by :meth:`evict`
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.stats = CacheStats()
+
+    @staticmethod
+    def key(markdown: MarkDownFile, base_href: str | None, highlighter: CodeHighlighter | None = None) -> str:
+        """
+        :return: key of the HTML converted from a Markdown file
+        """
+        settings = json.dumps([HTML_CACHE_VERSION, converter_versions(), markdown.extensions,
+                               markdown.extension_configs, base_href,
+                               highlighter.options() if highlighter is not None else None], sort_keys=True)
+        digest = hashlib.sha256(settings.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(markdown.content.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def convert(self, markdown: MarkDownFile, base_href: str | None, highlighter: CodeHighlighter | None = None) -> str:
+        """
+        Convert a Markdown file into HTML, reusing the cached HTML if the same Markdown was converted before.
+        :param markdown: Markdown file
+        :param base_href: base href of the site, see :meth:`MarkDownFile.convert_to_html`
+        :param highlighter: highlighter of code blocks, see :meth:`MarkDownFile.convert_to_html`
+        :return: HTML fragment
+        """
+        key = self.key(markdown, base_href, highlighter)
+        html = self.get(key)
+        self.stats.add(html is not None)
+        if html is None:
+            html = markdown.convert_to_html(base_href, highlighter)
+            self.put(key, html)
+        return html
+
+    def get(self, key: str) -> str | None:
+        """
+        :return: the cached HTML, or None if it is not cached
+        """
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8', newline='') as file:
+                html = file.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            # Evicted by another process meanwhile, or the directory is read-only: the entry is still valid.
+            pass
+        return html
+
+    def put(self, key: str, html: str):
+        """
+        Store HTML in the cache. An error while writing is reported and otherwise ignored, since the cache is only an
+        optimization.
+        """
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', newline='', dir=path.parent,
+                                             prefix=_TEMPORARY_PREFIX, delete=False) as file:
+                file.write(html)
+            os.replace(file.name, path)
+        except OSError as error:
+            print(f'Warning! Could not write {path.as_posix()} into the HTML cache: {error}')
+
+    def evict(self) -> int:
+        """
+        Delete the least recently used entries until the size of the cache is at most its maximum size. Entries
+        deleted by another process meanwhile are skipped.
+        :return: number of entries deleted
+        """
+        entries = []
+        size = 0
+        now = time.time()
+        if not self.directory.is_dir():
+            return 0
+        for sub_directory in os.scandir(self.directory):
+            if not sub_directory.is_dir(follow_symlinks=False):
+                continue
+            for entry in os.scandir(sub_directory.path):
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                if entry.name.startswith(_TEMPORARY_PREFIX):
+                    if now - stat.st_mtime > _STALE_TEMPORARY_SECONDS:
+                        Path(entry.path).unlink(missing_ok=True)
+                elif entry.name.endswith(_ENTRY_SUFFIX):
+                    entries.append((stat.st_mtime_ns, entry.path, stat.st_size))
+                    size += stat.st_size
+
+        deleted = 0
+        for _, path, entry_size in sorted(entries):
+            if size <= self.max_size:
+                break
+            Path(path).unlink(missing_ok=True)
+            size -= entry_size
+            deleted += 1
+        return deleted
+
+    def _path(self, key: str) -> Path:
+        # Entries are spread over sub-directories named after the first two characters of their key, so no
+        # directory holds too many files.
+        return self.directory / key[:2] / f'{key}{_ENTRY_SUFFIX}'
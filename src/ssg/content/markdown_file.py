@@ -1,7 +1,12 @@
+import json
 import re
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import markdown
+from ssg.config import DEFAULT_MARKDOWN_EXTENSIONS
+
+if TYPE_CHECKING:
+    import markdown
+    from ssg.content.highlight import CodeHighlighter
 
 # ATX heading: 1–6 leading '#', a space, then the title text. Trailing '#'s are stripped.
 _ATX_HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
@@ -9,18 +14,62 @@ _ATX_HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
 _FENCE_RE = re.compile(r'^(?:`{3,}|~{3,})')
 
 
+# Markdown converters are expensive to create, since every extension has to be resolved and instantiated. They are
+# created once per process for each extension configuration and reset between documents.
+_converters: dict[str, 'markdown.Markdown'] = {}
+
+
+def get_converter(extensions: list[str],
+                  extension_configs: Optional[dict[str, dict]] = None,
+                  base_href: Optional[str] = None) -> 'markdown.Markdown':
+    """
+    Return the cached Markdown converter for the given extension configuration, creating it if needed. Python-Markdown
+    and its extensions are imported along with the first converter, so reading pages which are not rendered again
+    does not pay for importing them.
+    :param extensions: names of the Python-Markdown extensions to be used
+    :param extension_configs: configuration of the extensions, keyed by extension name
+    :param base_href: base href of the site, used for recognizing external links
+    :return: a Markdown converter
+    """
+    key = json.dumps([extensions, extension_configs, base_href], sort_keys=True)
+    converter = _converters.get(key)
+    if converter is None:
+        import markdown
+        from ssg.content.site_links import SiteLinksExtension
+        converter = markdown.Markdown(extensions=list(extensions) + [SiteLinksExtension(base_href=base_href or '')],
+                                      extension_configs=extension_configs or {})
+        _converters[key] = converter
+    return converter
+
+
 class MarkDownFile:
-    def __init__(self, content: str):
+    def __init__(self,
+                 content: str,
+                 extensions: Optional[list[str]] = None,
+                 extension_configs: Optional[dict[str, dict]] = None):
         self.content = content
-        self.extensions = ['extra',
-                           'sane_lists',
-                           'smarty',
-                           'pymdownx.tilde']
+        self.extensions = list(extensions) if extensions is not None else list(DEFAULT_MARKDOWN_EXTENSIONS)
+        self.extension_configs = extension_configs or {}
+
+    def convert_to_html(self,
+                        base_href: Optional[str] = None,
+                        highlighter: Optional['CodeHighlighter'] = None) -> str:
+        """
+        Convert the Markdown content into HTML.
 
-    def convert_to_html(self) -> str:
-        html_content = markdown.markdown(self.content,
-                                         extensions=self.extensions)
-        return html_content
+        Links to Markdown files are rewritten to the generated HTML files and <h2> headings get anchor links. If
+        ``base_href`` is given, links pointing outside the site get target="_blank". If ``highlighter`` is given,
+        fenced code blocks with a language are highlighted.
+        :param base_href: base href of the site
+        :param highlighter: highlighter of code blocks
+        :return: HTML fragment
+        """
+        converter = get_converter(self.extensions, self.extension_configs, base_href)
+        try:
+            content = converter.convert(self.content)
+        finally:
+            converter.reset()
+        return highlighter.highlight_html(content) if highlighter is not None else content
 
     def get_title(self) -> Optional[str]:
         """
@@ -61,6 +110,8 @@ class MarkDownFile:
         return first_heading
 
     @staticmethod
-    def read_from_file(path):
+    def read_from_file(path,
+                       extensions: Optional[list[str]] = None,
+                       extension_configs: Optional[dict[str, dict]] = None):
         with open(path, encoding='utf-8') as file:
-            return MarkDownFile(file.read())
+            return MarkDownFile(file.read(), extensions, extension_configs)
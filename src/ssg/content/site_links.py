@@ -0,0 +1,235 @@
+"""Python-Markdown extension rewriting links and adding heading anchors while the document is converted."""
+
+import html
+import xml.etree.ElementTree as etree
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+
+from markdown import Extension, Markdown, util
+from markdown.extensions.toc import render_inner_html, strip_tags
+from markdown.treeprocessors import Treeprocessor
+from slugify import slugify
+
+# Elements whose whitespace-only text is kept as is. Elsewhere, it is collapsed like BeautifulSoup used to do when
+# pages were serialized through it.
+_PRESERVE_WHITESPACE_TAGS = {'pre', 'textarea'}
+
+
+def rewrite_href(url: str) -> str:
+    """
+    Replace links to Markdown files with links to the HTML files generated from them.
+    """
+    return url.replace('.md', '.html') if url.endswith('.md') else url
+
+
+def is_external_url(url: str, base_href: str) -> bool:
+    """
+    Check whether an url is absolute and does not start with the base path of the site.
+    """
+    return bool(urlparse(url).netloc) and not url.startswith(base_href)
+
+
+class SiteLinksTreeprocessor(Treeprocessor):
+    """
+    In a single pass over the converted document:
+    - replace href attributes which end with .md (Markdown) with attributes which end with .html,
+    - add target="_blank" to links pointing outside the site,
+    - add anchor links to <h2> headings,
+    - collapse whitespace-only text outside <pre> and <textarea> into a single newline or space.
+
+    Raw HTML embedded in the Markdown source is processed the same way.
+    """
+
+    def __init__(self, md: Markdown, base_href: str | None):
+        super().__init__(md)
+        self.base_href = base_href
+
+    def run(self, root: etree.Element) -> None:
+        self._process_tree(root)
+
+        for i, block in enumerate(self.md.htmlStash.rawHtmlBlocks):
+            if isinstance(block, str):
+                self.md.htmlStash.rawHtmlBlocks[i] = self._process_raw_html(block)
+            else:
+                self._process_tree(block)
+
+    def _process_tree(self, root: etree.Element):
+        preserved = {descendant
+                     for tag in _PRESERVE_WHITESPACE_TAGS for element in root.iter(tag)
+                     for descendant in element.iter() if descendant is not element}
+
+        # Iterate over a snapshot, since anchors are added to the tree along the way.
+        for element in list(root.iter()):
+            if element not in preserved:
+                if element.tag not in _PRESERVE_WHITESPACE_TAGS and element.text:
+                    element.text = self._collapse_whitespace(element.text)
+                if element.tail:
+                    element.tail = self._collapse_whitespace(element.tail)
+
+            if element.tag == 'a':
+                url = element.get('href')
+                if url is not None:
+                    url = rewrite_href(url)
+                    element.set('href', url)
+                    if self.base_href is not None and is_external_url(url, self.base_href):
+                        element.set('target', '_blank')
+            elif element.tag == 'h2':
+                slug = slugify(html.unescape(strip_tags(render_inner_html(element, self.md))))
+                anchor = etree.SubElement(element, 'a', {'class': 'anchor-link', 'href': f'#{slug}', 'id': slug})
+                anchor.text = '<<'
+
+            # Pages used to be serialized by BeautifulSoup, which sorts attributes. Keep doing so, so the generated
+            # pages do not change.
+            if len(element.attrib) > 1:
+                attributes = sorted(element.attrib.items())
+                element.attrib.clear()
+                element.attrib.update(attributes)
+
+    def _collapse_whitespace(self, text: str) -> str:
+        """
+        Collapse the whitespace-only runs of a text between tags, including the tags of inline raw HTML stashed in
+        the text, into a single newline or space.
+        """
+        parts = []
+        start = 0
+        for match in util.HTML_PLACEHOLDER_RE.finditer(text):
+            block = self.md.htmlStash.rawHtmlBlocks[int(match.group(1))]
+            # Stashed entities are part of the text, stashed tags and elements end it.
+            if not isinstance(block, str) or block.startswith('<'):
+                parts.append(_collapse_blank(text[start:match.start()]))
+                parts.append(match.group(0))
+                start = match.end()
+        parts.append(_collapse_blank(text[start:]))
+        return ''.join(parts)
+
+    def _process_raw_html(self, block: str) -> str:
+        rewriter = _RawHtmlRewriter(self.base_href)
+        rewriter.feed(block)
+        rewriter.close()
+        return rewriter.result()
+
+
+class _RawHtmlRewriter(HTMLParser):
+    """
+    Rewrite a raw HTML block of the Markdown source the way the pages used to be processed by BeautifulSoup: links and
+    headings are handled like the ones of the converted document, attributes are sorted and whitespace-only text is
+    collapsed into a single newline or space.
+
+    The block is tokenized instead of being parsed into a tree, since inline HTML is stashed one tag at a time, e.g.
+    ``<a href="page.md">`` without its end tag. The content of ``<script>`` and ``<style>`` elements and comments are
+    left untouched. Whitespace-only text at the start and end of the block is dropped, as it merges with the newline
+    separating the block from the rest of the document.
+    """
+
+    def __init__(self, base_href: str | None):
+        super().__init__(convert_charrefs=False)
+        self.base_href = base_href
+        self.parts: list[str] = []
+        # Index in ``parts`` of each whitespace-only text, collapsed or preserved.
+        self.blank_parts: set[int] = set()
+        self.preserve_whitespace = 0
+        self.in_raw_text = False
+        # Text of the <h2> elements being read, innermost last.
+        self.headings: list[list[str]] = []
+
+    def result(self) -> str:
+        start = 0
+        end = len(self.parts)
+        while start < end and start in self.blank_parts:
+            start += 1
+        while end > start and end - 1 in self.blank_parts:
+            end -= 1
+        return ''.join(self.parts[start:end])
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]):
+        self.parts.append(self._start_tag(tag, attrs, '>'))
+        if tag in self.CDATA_CONTENT_ELEMENTS:
+            self.in_raw_text = True
+        elif tag in _PRESERVE_WHITESPACE_TAGS:
+            self.preserve_whitespace += 1
+        elif tag == 'h2':
+            self.headings.append([])
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]):
+        self.parts.append(self._start_tag(tag, attrs, '/>'))
+
+    def handle_endtag(self, tag: str):
+        if tag in self.CDATA_CONTENT_ELEMENTS:
+            self.in_raw_text = False
+        elif tag in _PRESERVE_WHITESPACE_TAGS and self.preserve_whitespace:
+            self.preserve_whitespace -= 1
+        elif tag == 'h2' and self.headings:
+            slug = slugify(''.join(self.headings.pop()))
+            self.parts.append(f'<a class="anchor-link" href="#{slug}" id="{slug}">&lt;&lt;</a>')
+        self.parts.append(f'</{tag}>')
+
+    def handle_data(self, data: str):
+        if not data.strip() and not self.in_raw_text:
+            if not self.preserve_whitespace:
+                data = _collapse_blank(data)
+            self.blank_parts.add(len(self.parts))
+        self._add_text(data, data)
+
+    def handle_entityref(self, name: str):
+        self._add_text(f'&{name};', html.unescape(f'&{name};'))
+
+    def handle_charref(self, name: str):
+        self._add_text(f'&#{name};', html.unescape(f'&#{name};'))
+
+    def handle_comment(self, data: str):
+        self.parts.append(f'<!--{data}-->')
+
+    def handle_decl(self, decl: str):
+        self.parts.append(f'<!{decl}>')
+
+    def handle_pi(self, data: str):
+        self.parts.append(f'<?{data}>')
+
+    def unknown_decl(self, data: str):
+        self.parts.append(f'<![{data}]>')
+
+    def _add_text(self, raw: str, text: str):
+        self.parts.append(raw)
+        if self.headings and not self.in_raw_text:
+            self.headings[-1].append(text)
+
+    def _start_tag(self, tag: str, attrs: list[tuple[str, str | None]], end: str) -> str:
+        attributes: dict[str, str | None] = {}
+        for name, value in attrs:
+            attributes.setdefault(name, value)
+
+        if tag == 'a' and attributes.get('href') is not None:
+            url = rewrite_href(attributes['href'])
+            attributes['href'] = url
+            if self.base_href is not None and is_external_url(url, self.base_href):
+                attributes['target'] = '_blank'
+
+        rendered = ''.join(f' {name}' if value is None else f' {name}="{html.escape(value)}"'
+                           for name, value in sorted(attributes.items()))
+        return f'<{tag}{rendered}{end}'
+
+
+def _collapse_blank(text: str) -> str:
+    """
+    :return: a single newline or space for whitespace-only text, depending on whether it contains a newline, otherwise
+    the text itself
+    """
+    if not text or text.strip():
+        return text
+    return '\n' if '\n' in text else ' '
+
+
+class SiteLinksExtension(Extension):
+    """
+    Register :class:`SiteLinksTreeprocessor`. Links to external sites only get a target when ``base_href`` is set.
+    """
+
+    def __init__(self, **kwargs):
+        self.config = {
+            'base_href': ['', 'Base href of the site, used to recognize external links'],
+        }
+        super().__init__(**kwargs)
+
+    def extendMarkdown(self, md: Markdown):
+        # Run after every other treeprocessor, including `unescape`, so heading texts are final.
+        md.treeprocessors.register(SiteLinksTreeprocessor(md, self.getConfig('base_href') or None), 'site_links', -10)
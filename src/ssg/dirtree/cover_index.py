@@ -0,0 +1,33 @@
+from pathlib import Path
+
+from ssg.dirtree.directory_node import DirectoryNode
+from ssg.dirtree.node import NodeType
+
+COVER_IMAGE_EXTENSIONS = frozenset(('.tif', '.tiff', '.jpg', '.jpeg', '.gif', '.png', '.eps', ".bmp", '.ppm', '.heif',
+                                    '.avif'))
+
+
+def index_cover_images(root: DirectoryNode):
+    """
+    Build the cover image index of every directory of the tree.
+
+    A file named ``cover.*`` with an accepted image extension inside a sub-directory whose name ends with
+    ``img-<name>`` is a cover image of the files named ``<name>.*`` of the directory. Since a sub-directory name may
+    contain ``img-`` more than once, it may provide covers for more than one name.
+
+    :param root: root of the tree
+    """
+    for directory in root.traverse(NodeType.DIR):
+        cover_images: dict[str, list[Path]] = {}
+        for sub_directory in directory.directories:
+            covers = [file.path for file in sub_directory.files
+                      if file.name_with_extension.startswith('cover.') and file.path.suffix in COVER_IMAGE_EXTENSIONS]
+            if not covers:
+                continue
+
+            folder_name = sub_directory.path.name
+            start = folder_name.find('img-')
+            while start != -1:
+                cover_images.setdefault(folder_name[start + len('img-'):], []).extend(covers)
+                start = folder_name.find('img-', start + 1)
+        directory.cover_images = cover_images
@@ -1,46 +1,79 @@
-import fnmatch
 import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Iterable
 
+from ssg.config.path_router import PatternList
+from ssg.dirtree.cover_index import index_cover_images
 from ssg.dirtree.directory_node import DirectoryNode
-from ssg.dirtree.file_node import FileNode
+from ssg.dirtree.file_node import FileNode, FileStat
 
 def create_directory_tree(path: Path,
-                          exclude: frozenset[str] = frozenset()) -> DirectoryNode:
+                          exclude: Iterable[str] | PatternList = frozenset(),
+                          threads: int = 1) -> DirectoryNode:
+    """
+    Scan the source directory into a tree of nodes. Files and directories whose name or relative path matches any of
+    the exclude patterns are skipped. The stat data of every file is kept on its node, so it does not have to be
+    read again later, and the cover images of every directory are indexed (see :func:`index_cover_images`).
+
+    Symbolic links to directories are added to the tree, but not followed.
+
+    :param path: source directory
+    :param exclude: exclude patterns
+    :param threads: if more than 1, directories are scanned concurrently on a pool of threads, which helps on network
+    file systems
+    :return: root of the tree, having an empty path
+    """
+    if not isinstance(exclude, PatternList):
+        exclude = PatternList(exclude)
+
     root = DirectoryNode(Path(''))
-    dir_nodes = {path: root}
-    for current_dir_path, sub_directories, file_names in os.walk(path):
-        # Exclude directories whose name or relative path matches any pattern
-        sub_directories[:] = [
-            d for d in sub_directories
-            if not any(
-                fnmatch.fnmatch(d, pattern) or
-                fnmatch.fnmatch(
-                    (Path(current_dir_path) / d).relative_to(path).as_posix(),
-                    pattern
-                )
-                for pattern in exclude
-            )
-        ]
-
-        # Retrieve current node from the cache. This should have been populated before we reach this point
-        # because we add all the subdirectories for a parent directory
-        current_node = dir_nodes[Path(current_dir_path)]
-
-        for file_name in file_names:
-            file_path = Path(current_dir_path) / file_name
-            relative = file_path.relative_to(path)
-            if not any(
-                    fnmatch.fnmatch(file_name, pattern) or
-                    fnmatch.fnmatch(relative.as_posix(), pattern)
-                    for pattern in exclude
-            ):
-                current_node.add_file(FileNode(relative, current_node))
-
-        for sub_directory in sub_directories:
-            dir_path = Path(current_dir_path) / sub_directory
-            relative = dir_path.relative_to(path)
-            node = DirectoryNode(relative)
-            dir_nodes[dir_path] = node
-            current_node.add_directory(node)
-    return root
\ No newline at end of file
+    if threads <= 1:
+        pending = [(str(path), root, '')]
+        while pending:
+            pending.extend(_scan_directory(*pending.pop(), exclude))
+        index_cover_images(root)
+        return root
+
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='ssg-scan') as executor:
+        in_flight: set[Future] = {executor.submit(_scan_directory, str(path), root, '', exclude)}
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                for sub_directory in future.result():
+                    in_flight.add(executor.submit(_scan_directory, *sub_directory, exclude))
+    index_cover_images(root)
+    return root
+
+
+def _scan_directory(directory: str,
+                    node: DirectoryNode,
+                    prefix: str,
+                    exclude: PatternList) -> list[tuple[str, DirectoryNode, str]]:
+    """
+    Add the files and directories of a directory to its node.
+    :param directory: path of the directory
+    :param node: node of the directory
+    :param prefix: POSIX path of the directory relative to the source directory, with a trailing slash
+    :param exclude: exclude patterns
+    :return: sub-directories to be scanned, along with their nodes and prefixes
+    """
+    sub_directories = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            relative = prefix + entry.name
+            if exclude.matches_name_or_path(entry.name, relative):
+                continue
+
+            if entry.is_dir():
+                child = DirectoryNode(Path(relative))
+                node.add_directory(child)
+                if not entry.is_symlink():
+                    sub_directories.append((entry.path, child, f'{relative}/'))
+            else:
+                try:
+                    stat = FileStat.from_stat_result(entry.stat())
+                except OSError:
+                    stat = None
+                node.add_file(FileNode(Path(relative), node, stat))
+    return sub_directories
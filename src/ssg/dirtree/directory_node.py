@@ -11,6 +11,8 @@ class DirectoryNode(Node):
         super().__init__(path)
         self.directories: list[DirectoryNode] = []
         self.files: list[FileNode] = []
+        # Cover images of the files of this directory, keyed by file name without extension. See index_cover_images.
+        self.cover_images: dict[str, list[Path]] = {}
 
     def add_directory(self, child: 'DirectoryNode'):
         self.directories.append(child)
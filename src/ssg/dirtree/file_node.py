@@ -1,3 +1,5 @@
+import os
+from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional
 
@@ -7,14 +9,28 @@ if TYPE_CHECKING:
     from ssg.dirtree.directory_node import DirectoryNode
 
 
+@dataclass(frozen=True)
+class FileStat:
+    """Stat data of a file, recorded while scanning the source directory."""
+    size: int
+    mtime_ns: int
+    inode: int
+    device: int
+
+    @staticmethod
+    def from_stat_result(stat: os.stat_result) -> 'FileStat':
+        return FileStat(size=stat.st_size, mtime_ns=stat.st_mtime_ns, inode=stat.st_ino, device=stat.st_dev)
+
+
 class FileNode(Node):
     """Represents a file in the source directory, along with its metadata."""
 
-    def __init__(self, path: Path, parent: Optional['DirectoryNode'] = None):
+    def __init__(self, path: Path, parent: Optional['DirectoryNode'] = None, stat: Optional[FileStat] = None):
         super().__init__(path)
         self.name: str = path.stem
         self.name_with_extension: str = path.name
         self.parent = parent
+        self.stat = stat
 
     def is_markdown(self):
-        return self.path.suffix == '.md'
\ No newline at end of file
+        return self.path.suffix == '.md'
@@ -0,0 +1,228 @@
+"""Copying of the files which are not rendered (images, downloads, stylesheets, ...) into the destination folder."""
+
+import hashlib
+import os
+import shutil
+import sys
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ssg.config import AssetLinkMode, AssetSyncMode, Config
+from ssg.dirtree.file_node import FileStat
+from ssg.engine.output_writer import OutputWriter
+
+if TYPE_CHECKING:
+    from ssg.engine.profiler import BuildProfiler
+
+# ioctl request cloning a file on Linux file systems supporting copy-on-write (btrfs, XFS, ...).
+_FICLONE = 0x40049409
+
+
+class SyncAction(Enum):
+    COPIED = 'copied'
+    LINKED = 'linked'
+    SKIPPED = 'skipped'
+
+
+@dataclass
+class AssetSyncStats:
+    """Number of files and bytes per action taken while syncing assets."""
+    copied: int = 0
+    copied_bytes: int = 0
+    linked: int = 0
+    linked_bytes: int = 0
+    skipped: int = 0
+    skipped_bytes: int = 0
+
+    def add(self, action: SyncAction, size: int):
+        setattr(self, action.value, getattr(self, action.value) + 1)
+        setattr(self, f'{action.value}_bytes', getattr(self, f'{action.value}_bytes') + size)
+
+    def __str__(self):
+        return (f'Assets: {self.copied} copied ({format_size(self.copied_bytes)}), '
+                f'{self.linked} linked ({format_size(self.linked_bytes)}), '
+                f'{self.skipped} skipped ({format_size(self.skipped_bytes)})')
+
+
+def format_size(size: int) -> str:
+    """
+    Format a number of bytes for humans, e.g. 1536 -> '1.5 KB'.
+    """
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f'{size} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+
+
+def asset_sync_mode(config: Config) -> AssetSyncMode:
+    """
+    :return: the asset sync mode of the site, ``hash`` instead of ``always`` with the ``if-changed`` output write mode,
+    so assets which did not change keep their modification time like pages and feeds do
+    """
+    if config.outputWrite == 'if-changed' and config.assetSync == 'always':
+        return 'hash'
+    return config.assetSync
+
+
+def is_unchanged(source: Path,
+                 destination: Path,
+                 mode: AssetSyncMode,
+                 source_stat: FileStat | None = None) -> bool:
+    """
+    Check whether the destination is already up to date with the source.
+    :param source: source file
+    :param destination: destination file
+    :param mode: ``always`` never considers the destination up to date, ``size-mtime`` compares the size and the
+    modification time, ``hash`` compares the size and the content of the files
+    :param source_stat: stat data of the source recorded while scanning the source directory, read if not given
+    :return: True if the source does not need to be copied
+    """
+    if mode == 'always':
+        return False
+
+    try:
+        destination_stat = FileStat.from_stat_result(destination.stat())
+    except FileNotFoundError:
+        return False
+    if source_stat is None:
+        source_stat = FileStat.from_stat_result(source.stat())
+
+    if (source_stat.device, source_stat.inode) == (destination_stat.device, destination_stat.inode):
+        return True
+    if source_stat.size != destination_stat.size:
+        return False
+    if mode == 'size-mtime':
+        return source_stat.mtime_ns == destination_stat.mtime_ns
+    return _file_hash(source) == _file_hash(destination)
+
+
+def sync_file(source: Path,
+              destination: Path,
+              mode: AssetSyncMode,
+              link: AssetLinkMode,
+              source_stat: FileStat | None = None) -> tuple[SyncAction, int]:
+    """
+    Bring a destination file up to date with its source.
+
+    The destination is removed before it is written, so a file hardlinked by a previous build is replaced instead of
+    being written through to the source. If linking is not possible (e.g. across file systems or on a file system
+    without copy-on-write support), the file is copied instead.
+
+    :param source: source file
+    :param destination: destination file
+    :param mode: how to decide whether the destination is up to date, see :func:`is_unchanged`
+    :param link: ``copy`` copies the file, ``hardlink`` creates a hard link to the source, ``reflink`` creates a
+    copy-on-write clone of the source
+    :param source_stat: stat data of the source recorded while scanning the source directory, read if not given
+    :return: the action taken and the size of the file
+    """
+    if source_stat is None:
+        source_stat = FileStat.from_stat_result(source.stat())
+    size = source_stat.size
+    if is_unchanged(source, destination, mode, source_stat):
+        return SyncAction.SKIPPED, size
+
+    destination.unlink(missing_ok=True)
+    if link == 'hardlink':
+        try:
+            os.link(source, destination)
+            return SyncAction.LINKED, size
+        except OSError:
+            pass
+    elif link == 'reflink':
+        try:
+            _reflink(source, destination)
+            _copy_times(source_stat, destination)
+            return SyncAction.LINKED, size
+        except OSError:
+            destination.unlink(missing_ok=True)
+
+    shutil.copyfile(source, destination)
+    _copy_times(source_stat, destination)
+    return SyncAction.COPIED, size
+
+
+def _reflink(source: Path, destination: Path):
+    if not sys.platform.startswith('linux'):
+        raise OSError('Reflinks are only supported on Linux')
+
+    import fcntl
+    with open(source, 'rb') as source_file, open(destination, 'wb') as destination_file:
+        fcntl.ioctl(destination_file.fileno(), _FICLONE, source_file.fileno())
+
+
+def _copy_times(source_stat: FileStat, destination: Path):
+    # Keep the modification time of the source, so the size-mtime comparison works on the next build.
+    os.utime(destination, ns=(source_stat.mtime_ns, source_stat.mtime_ns))
+
+
+def _file_hash(path: Path) -> str:
+    with open(path, 'rb') as file:
+        return hashlib.file_digest(file, 'sha256').hexdigest()
+
+
+class AssetSync:
+    """
+    Sync assets into the destination folder on a pool of threads, so copies overlap with rendering pages. The number
+    of files waiting to be synced is bounded, see :class:`OutputWriter`.
+
+    A summary of the copied, linked and skipped files is printed once every file is synced. The first error raised
+    while syncing a file is raised again when leaving the context.
+
+    Usage:
+    with AssetSync(mode, link) as assets:
+        assets.submit(source, destination)
+    """
+
+    def __init__(self,
+                 mode: AssetSyncMode = 'always',
+                 link: AssetLinkMode = 'copy',
+                 threads: int | None = None,
+                 profiler: 'BuildProfiler | None' = None):
+        """
+        :param mode: how to decide whether a destination file is up to date, see :func:`is_unchanged`
+        :param link: how files are copied, see :func:`sync_file`
+        :param threads: number of threads, defaults to the default of ThreadPoolExecutor
+        :param profiler: records the time spent syncing each file, if given
+        """
+        self.mode = mode
+        self.link = link
+        self.threads = threads
+        self.profiler = profiler
+        self.stats = AssetSyncStats()
+        self.writer = OutputWriter(threads, thread_name_prefix='ssg-assets')
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.writer.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.writer.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None:
+            print(self.stats)
+        return False
+
+    def submit(self, source: Path, destination: Path, source_stat: FileStat | None = None):
+        """
+        Queue a file to be synced.
+        :param source: source file
+        :param destination: destination file, its directory must exist
+        :param source_stat: stat data of the source recorded while scanning the source directory, read if not given
+        """
+        self.writer.submit(self._sync_file, source, destination, source_stat).add_done_callback(self._add_stats)
+
+    def _add_stats(self, future: Future):
+        if not future.cancelled() and future.exception() is None:
+            with self._lock:
+                self.stats.add(*future.result())
+
+    def _sync_file(self, source: Path, destination: Path, source_stat: FileStat | None) -> tuple[SyncAction, int]:
+        if self.profiler is None:
+            return sync_file(source, destination, self.mode, self.link, source_stat)
+        with self.profiler.stage('asset_copy'):
+            return sync_file(source, destination, self.mode, self.link, source_stat)
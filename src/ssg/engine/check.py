@@ -0,0 +1,217 @@
+"""
+Fast check whether a build would change the site, used by ``--check``.
+
+The check only reads the configuration, the stat data of the source folder and the commit HEAD points to, and it does
+not import the libraries used for rendering (Markdown, BeautifulSoup, lxml, pygit2), so it returns quickly when
+nothing changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ssg.config.config_file import DEFAULT_EXCLUDE, content_hash, read_config_file
+from ssg.config.path_router import PatternList
+from ssg.dirtree.node import NodeType
+from ssg.engine.outputs_file import read_outputs_file
+
+if TYPE_CHECKING:
+    from ssg.config import Config
+    from ssg.dirtree.directory_node import DirectoryNode
+
+# Bump whenever the inputs taken into account by the fingerprint change.
+FINGERPRINT_VERSION = 2
+
+# Maximum number of symbolic references followed while resolving HEAD.
+_MAX_SYMBOLIC_REFS = 5
+
+
+# Entry of a file in the fingerprint: POSIX path relative to the source folder, size and modification time in
+# nanoseconds, or None for both if the file could not be read.
+FileEntry = tuple[str, int | None, int | None]
+
+
+def build_fingerprint(config: Config, root: DirectoryNode, head: str | None) -> str:
+    """
+    Fingerprint of the inputs of a build: the configuration, the path, size and modification time of every file of
+    the source folder, the directories of the source folder and the commit HEAD points to.
+    :param config: site configuration
+    :param root: root of the scanned source folder
+    :param head: hex OID of the commit HEAD points to, None for an empty repository
+    :return: hex digest of the inputs
+    """
+    files = [(file.path.as_posix(), file.stat.size, file.stat.mtime_ns) if file.stat is not None
+             else (file.path.as_posix(), None, None)
+             for file in root.traverse(NodeType.FILE)]
+    directories = [directory.path.as_posix() for directory in root.traverse(NodeType.DIR) if directory is not root]
+    return _fingerprint(_settings(config), files, directories, head)
+
+
+def source_fingerprint(config: Config) -> str:
+    """
+    Scan the source folder and compute the same fingerprint as :func:`build_fingerprint`, without building the tree
+    of nodes a build needs.
+    :param config: site configuration
+    :return: hex digest of the inputs
+    """
+    files, directories = _scan(config.source, PatternList(config.exclude))
+    return _fingerprint(_settings(config), files, directories, read_head(config.source))
+
+
+def is_up_to_date(config: Config) -> bool:
+    """
+    Check whether the last build was made from the current inputs, in which case building again would not change any
+    output (apart from the build date of the RSS feeds).
+
+    Outputs modified or deleted in the destination folder since the last build are not detected.
+    :param config: site configuration
+    :return: True if the fingerprint recorded by the last build matches the current inputs
+    """
+    fingerprint = _recorded_fingerprint(config.destination)
+    return fingerprint is not None and fingerprint == source_fingerprint(config)
+
+
+def is_config_file_up_to_date(path: Path, destination: Path | None = None) -> bool:
+    """
+    Same check as :func:`is_up_to_date` for the configuration of a config file, reading only the settings the check
+    needs from the file instead of building a Config, whose module takes longer to import than the check runs.
+    :param path: path of the config file
+    :param destination: destination folder replacing the one of the config file, if given
+    :return: True if the fingerprint recorded by the last build matches the current inputs
+    """
+    content = read_config_file(path)
+    if 'source' not in content or 'destination' not in content:
+        # Let the configuration report the missing fields.
+        from ssg.config import Config
+        Config.from_json(content)
+    source = Path(content['source'])
+    destination = destination if destination is not None else Path(content['destination'])
+    fingerprint = _recorded_fingerprint(destination)
+    if fingerprint is None:
+        return False
+    files, directories = _scan(source, PatternList(content.get('exclude', DEFAULT_EXCLUDE)))
+    settings = [content_hash(content), destination.as_posix()]
+    return fingerprint == _fingerprint(settings, files, directories, read_head(source))
+
+
+def _recorded_fingerprint(destination: Path) -> str | None:
+    content = read_outputs_file(destination)
+    return content.get('fingerprint') if content is not None else None
+
+
+def _settings(config: Config) -> list[str]:
+    # A configuration read from a config file is identified by the hash of the file, which is what --check reads, and
+    # by its destination folder, which can be replaced from the command line.
+    if config.configHash is not None:
+        return [config.configHash, config.destination.as_posix()]
+    from ssg.engine.manifest import config_fingerprint
+    return [config_fingerprint(config)]
+
+
+def _fingerprint(settings: list[str], files: list[FileEntry], directories: list[str], head: str | None) -> str:
+    digest = hashlib.sha256(json.dumps([FINGERPRINT_VERSION, settings, head]).encode('utf-8'))
+    for path, size, mtime_ns in sorted(files):
+        digest.update(f'\0f{path}\0{size}\0{mtime_ns}'.encode('utf-8', 'surrogateescape'))
+    for path in sorted(directories):
+        digest.update(f'\0d{path}'.encode('utf-8', 'surrogateescape'))
+    return digest.hexdigest()
+
+
+def _scan(source: Path, exclude: PatternList) -> tuple[list[FileEntry], list[str]]:
+    # Same walk as create_directory_tree: excluded names and paths are skipped, symbolic links to directories are
+    # listed but not followed.
+    files: list[FileEntry] = []
+    directories: list[str] = []
+    pending = [(str(source), '')]
+    while pending:
+        directory, prefix = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                relative = prefix + entry.name
+                if exclude.matches_name_or_path(entry.name, relative):
+                    continue
+                if entry.is_dir():
+                    directories.append(relative)
+                    if not entry.is_symlink():
+                        pending.append((entry.path, f'{relative}/'))
+                else:
+                    try:
+                        stat = entry.stat()
+                        files.append((relative, stat.st_size, stat.st_mtime_ns))
+                    except OSError:
+                        files.append((relative, None, None))
+    return files, directories
+
+
+def read_head(path: Path) -> str | None:
+    """
+    Find the commit HEAD points to in the repository containing a folder, reading the files of the git directory
+    directly. Layouts which are not understood (e.g. reftable) are read with pygit2, which is much slower to import.
+    :param path: folder inside the working tree of a repository
+    :return: hex OID of the commit, None for an empty repository
+    """
+    git_dir = _find_git_dir(path.resolve())
+    if git_dir is not None:
+        common_dir = _common_dir(git_dir)
+        ref = 'HEAD'
+        for _ in range(_MAX_SYMBOLIC_REFS):
+            value = _read_ref(git_dir, common_dir, ref)
+            if value is None:
+                if ref != 'HEAD' and _is_unborn(common_dir, ref):
+                    return None
+                break
+            if not value.startswith('ref: '):
+                return value
+            ref = value.removeprefix('ref: ')
+
+    from ssg.git.git import GitClient
+    head = GitClient(path).get_head()
+    return str(head) if head is not None else None
+
+
+def _find_git_dir(path: Path) -> Path | None:
+    for directory in (path, *path.parents):
+        dot_git = directory / '.git'
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            content = dot_git.read_text(encoding='utf-8').strip()
+            if content.startswith('gitdir: '):
+                return (directory / content.removeprefix('gitdir: ')).resolve()
+            return None
+    return None
+
+
+def _common_dir(git_dir: Path) -> Path:
+    # Linked worktrees keep their own HEAD, while branches are stored in the git directory of the main worktree.
+    try:
+        return (git_dir / (git_dir / 'commondir').read_text(encoding='utf-8').strip()).resolve()
+    except FileNotFoundError:
+        return git_dir
+
+
+def _read_ref(git_dir: Path, common_dir: Path, ref: str) -> str | None:
+    for directory in (git_dir, common_dir) if ref == 'HEAD' else (common_dir,):
+        try:
+            return (directory / ref).read_text(encoding='utf-8').strip()
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            pass
+    try:
+        with open(common_dir / 'packed-refs', encoding='utf-8') as file:
+            for line in file:
+                oid, _, name = line.rstrip('\n').partition(' ')
+                if name == ref and not line.startswith(('#', '^')):
+                    return oid
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def _is_unborn(common_dir: Path, ref: str) -> bool:
+    # HEAD points to a branch without commits, which is missing from the loose and packed refs. Repositories storing
+    # their refs in a reftable also miss them there, so they are left to pygit2.
+    return ref.startswith('refs/heads/') and not (common_dir / 'reftable').exists()
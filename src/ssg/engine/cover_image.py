@@ -1,4 +1,3 @@
-import fnmatch
 from pathlib import Path
 
 from ssg.dirtree.file_node import FileNode
@@ -13,21 +12,14 @@ def get_cover_image(file: FileNode) -> Path|None:
     accepted image extensions (e.g. ``.jpg``, ``.png``, ``.gif``, ``.tif``,
     ``.tiff``, ``.jpeg``, ``.eps``, ``.bmp``, ``.ppm``, ``.heif``, ``.avif``).
 
+    The cover images are looked up in the index of the parent directory,
+    built by :func:`index_cover_images` when the tree is created.
+
     :param file: The :class:`FileNode` to find the cover image for.
     :return: The :class:`~pathlib.Path` to the cover image if found,
              otherwise ``None``.
     """
-    accepted_image_extensions = ('.tif', '.tiff', '.jpg', '.jpeg', '.gif', '.png', '.eps', ".bmp", '.ppm',
-                                 '.heif',
-                                 '.avif')
-    img_folder_path = f'img-{file.name}'
-
-    covers = []
-    for directory in file.parent.directories if file.parent else []:
-        if directory.path.name.endswith(img_folder_path):
-            for file in directory.files:
-                if fnmatch.fnmatch(file.name_with_extension, 'cover.*') and file.path.suffix in accepted_image_extensions:
-                    covers.append(file.path)
+    covers = file.parent.cover_images.get(file.name, []) if file.parent else []
 
     if len(covers) == 0:
         return None
@@ -35,4 +27,4 @@ def get_cover_image(file: FileNode) -> Path|None:
     if len(covers) > 1:
         print(f'Warning! Multiple cover images found for {file.path}! Choosing {covers[0]}')
 
-    return Path(covers[0])
\ No newline at end of file
+    return Path(covers[0])
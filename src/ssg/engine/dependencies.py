@@ -0,0 +1,194 @@
+"""Record of the inputs every output of a build depends on."""
+
+from __future__ import annotations
+
+import glob
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Literal
+
+from ssg.config import Config
+from ssg.config.path_router import PatternList
+
+OutputKind = Literal['page', 'asset', 'feed', 'stylesheet']
+
+# Configuration fragments every output depends on: changing them may change the set of outputs itself.
+GLOBAL_CONFIG_FRAGMENTS = frozenset({'source', 'destination', 'exclude'})
+
+# Configuration fragments used for rendering a page.
+PAGE_CONFIG_FRAGMENTS = ['baseHref', 'hostname', 'meta', 'frames', 'htmlOutput', 'markdownExtensions',
+                         'markdownExtensionConfigs', 'outputWrite', 'syntaxHighlight']
+
+# Configuration fragments used for syncing an asset.
+ASSET_CONFIG_FRAGMENTS = ['assetSync', 'assetLink', 'outputWrite']
+
+
+def cover_image_pattern(source: Path) -> str:
+    """
+    :param source: path of a Markdown file, relative to the source folder
+    :return: pattern matching the paths of the cover images :func:`get_cover_image` may find for the file
+    """
+    prefix = f'{glob.escape(source.parent.as_posix())}/' if source.parent != Path('') else ''
+    return f'{prefix}*img-{glob.escape(source.stem)}/cover.*'
+
+
+def feed_config_fragment(title: str) -> str:
+    """
+    :return: name of the configuration fragment holding the settings of an RSS feed
+    """
+    return f'rssFeeds.{title}'
+
+
+def config_fragments(config: Config) -> dict[str, object]:
+    """
+    Split the configuration into fragments, so a change of the configuration only invalidates the outputs depending
+    on the changed fragments. Each RSS feed is a fragment of its own.
+    :param config: site configuration
+    :return: dict mapping the name of each fragment to its value
+    """
+    fragments = asdict(config)
+    for feed in fragments.pop('rssFeeds'):
+        fragments[feed_config_fragment(feed['title'])] = feed
+    return fragments
+
+
+def changed_config_fragments(old: Config, new: Config) -> set[str]:
+    """
+    :return: names of the configuration fragments which differ between two configurations
+    """
+    old_fragments = config_fragments(old)
+    new_fragments = config_fragments(new)
+    return {name for name in old_fragments.keys() | new_fragments.keys()
+            if old_fragments.get(name) != new_fragments.get(name)}
+
+
+@dataclass
+class OutputDependencies:
+    """
+    Inputs of a single output. Paths are POSIX paths relative to the source folder.
+
+    - A page depends on its Markdown source, its frame, its cover image and on the creation of a cover image matching
+      ``cover_pattern``. ``meta_matcher`` and ``feeds`` are the meta matcher and the feeds matching the source.
+    - An asset depends on its source.
+    - A feed depends on the Markdown files matching ``matcher`` and on the cover images of its ``pages``.
+    - The stylesheet of highlighted code blocks only depends on the configuration.
+    """
+    kind: OutputKind
+    source: str | None = None
+    frame: str | None = None
+    cover_image: str | None = None
+    cover_pattern: str | None = None
+    meta_matcher: str | None = None
+    feeds: list[str] = field(default_factory=list)
+    matcher: str | None = None
+    pages: list[str] = field(default_factory=list)
+    config: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Convert into a JSON serializable dictionary, leaving out empty fields."""
+        return {key: value for key, value in asdict(self).items() if value}
+
+
+class DependencyGraph:
+    """
+    Dependencies of every output of a build, keyed by the POSIX path of the output relative to the destination
+    folder. Answers which outputs must be rebuilt when source files or configuration fragments change.
+    """
+
+    def __init__(self):
+        self.outputs: dict[str, OutputDependencies] = {}
+        # Compiled cover patterns and the outputs depending on each of them, built when needed.
+        self._cover_patterns: PatternList | None = None
+        self._cover_outputs: dict[str, list[str]] = {}
+
+    def add(self, output: str, dependencies: OutputDependencies):
+        """
+        Record the dependencies of an output, replacing the ones recorded before.
+        :param output: path of the output, relative to the destination folder
+        :param dependencies: inputs of the output
+        """
+        self.outputs[output] = dependencies
+        self._cover_patterns = None
+
+    def remove(self, output: str):
+        """
+        Forget an output which is no longer produced.
+        :param output: path of the output, relative to the destination folder
+        """
+        if self.outputs.pop(output, None) is not None:
+            self._cover_patterns = None
+
+    def affected(self, paths: Iterable[Path], fragments: Iterable[str] = ()) -> list[str]:
+        """
+        Find the outputs which must be rebuilt.
+
+        Files which are not inputs of any output yet (e.g. a new Markdown file) produce outputs of their own, which are
+        not part of the result. The feeds which would include a new Markdown file are part of it.
+
+        :param paths: paths, relative to the source folder, of the files which were modified, created or deleted
+        :param fragments: names of the configuration fragments which changed
+        :return: sorted paths of the affected outputs, relative to the destination folder
+        """
+        changed = {path.as_posix() for path in paths}
+        fragments = set(fragments)
+        if fragments & GLOBAL_CONFIG_FRAGMENTS:
+            return sorted(self.outputs)
+
+        affected: set[str] = set()
+        # Pages whose feed entry may change, as opposed to pages affected only by their frame.
+        content_affected: set[str] = set()
+
+        cover_patterns = self._get_cover_patterns()
+        for path in changed:
+            for index in cover_patterns.all_matches(path):
+                for output in self._cover_outputs[cover_patterns.patterns[index]]:
+                    affected.add(output)
+                    content_affected.add(self.outputs[output].source)
+
+        for output, dependencies in self.outputs.items():
+            if dependencies.kind == 'feed':
+                continue
+            if dependencies.source in changed or dependencies.cover_image in changed:
+                affected.add(output)
+                content_affected.add(dependencies.source)
+            elif dependencies.frame in changed or fragments.intersection(dependencies.config):
+                affected.add(output)
+
+        for output, dependencies in self.outputs.items():
+            if dependencies.kind != 'feed':
+                continue
+            matcher = PatternList([dependencies.matcher])
+            if (fragments.intersection(dependencies.config)
+                    or content_affected.intersection(dependencies.pages)
+                    or any(path.endswith('.md') and matcher.matches(path) for path in changed)):
+                affected.add(output)
+
+        return sorted(affected)
+
+    def to_dict(self) -> dict:
+        """Convert into a JSON serializable dictionary."""
+        return {'outputs': {output: dependencies.to_dict() for output, dependencies in sorted(self.outputs.items())}}
+
+    def save(self, path: Path, changed: Iterable[Path] | None = None):
+        """
+        Write the graph as JSON.
+        :param path: path of the JSON file
+        :param changed: if given, the outputs affected by these source paths are written under ``affected``
+        """
+        content = self.to_dict()
+        if changed is not None:
+            changed = sorted(Path(p).as_posix() for p in changed)
+            content['changed'] = changed
+            content['affected'] = self.affected(Path(p) for p in changed)
+        with open(path, mode='w', encoding='utf-8') as file:
+            json.dump(content, file, indent=2)
+
+    def _get_cover_patterns(self) -> PatternList:
+        if self._cover_patterns is None:
+            self._cover_outputs = {}
+            for output, dependencies in self.outputs.items():
+                if dependencies.cover_pattern is not None:
+                    self._cover_outputs.setdefault(dependencies.cover_pattern, []).append(output)
+            self._cover_patterns = PatternList(self._cover_outputs)
+        return self._cover_patterns
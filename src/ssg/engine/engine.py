@@ -1,21 +1,48 @@
-import shutil
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import urljoin
 
 from ssg.content.article import Author
-from ssg.rss.rss_feed_generator import RssFeedGenerator
+from ssg.content.html_cache import CacheStats
+from ssg.engine.asset_sync import AssetSync, asset_sync_mode
+from ssg.engine.check import build_fingerprint
+from ssg.engine.dependencies import (ASSET_CONFIG_FRAGMENTS, PAGE_CONFIG_FRAGMENTS, DependencyGraph, OutputDependencies,
+                                     cover_image_pattern, feed_config_fragment)
+from ssg.engine.manifest import BuildManifest, PageRecord, config_fingerprint, hash_bytes, meta_to_dict
+from ssg.rss.rss_feed_generator import FeedItem, RssFeedGenerator
 from ssg.dirtree.create_directory_tree import create_directory_tree
-from ssg.engine.meta import get_meta
+from ssg.engine.meta import ResolvedMeta, get_meta
+from ssg.engine.output_writer import OutputWriter, WriteStats, write_if_changed
+from ssg.engine.outputs import OutputRecord, prune_outputs
+from ssg.engine.profiler import BuildProfiler
+from ssg.engine.renderer import ParallelRenderer, RenderJob, SerialRenderer
+from ssg.engine.schedule import PageCost, RenderCosts, Schedule, schedule_pages
+from ssg.engine.shard import Shard, ShardFeedItem, ShardResult, shard_config, shard_files
 from ssg.git import git
+from ssg.git.last_edit_index import get_last_edit_time_for_files_cached
 from ssg.config import Config
+from ssg.config.path_router import PathRouter
 from ssg.content.article import Article
 from ssg.dirtree.directory_node import DirectoryNode
+from ssg.dirtree.file_node import FileNode, FileStat
 from ssg.dirtree.node import NodeType
 from ssg.content.markdown_file import MarkDownFile
 from ssg.template.template_engine import TemplateEngine
 
 
+@dataclass
+class EngineUpdate:
+    """Outputs rebuilt by :meth:`Engine.update`. Paths are relative to the source folder."""
+    pages: list[Path] = field(default_factory=list)
+    assets: list[Path] = field(default_factory=list)
+    removed: list[Path] = field(default_factory=list)
+    feeds: list[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.pages or self.assets or self.removed or self.feeds)
+
+
 class Engine:
     """
 
@@ -24,57 +51,532 @@ class Engine:
     engine.run()
     """
 
-    def __init__(self, config: Config):
+    def __init__(self,
+                 config: Config,
+                 incremental: bool = False,
+                 jobs: int = 1,
+                 profiler: BuildProfiler | None = None,
+                 shard: Shard | None = None):
         self.config = config
-        self.template_engine = TemplateEngine(config)
+        self.incremental = incremental
+        self.jobs = jobs
+        self.profiler = profiler if profiler is not None else BuildProfiler(enabled=False)
+        self.shard = shard
+        self.router = PathRouter(config)
+        self.template_engine = TemplateEngine(config, self.router, self.profiler)
         self.rssFeedGenerator = RssFeedGenerator(config.rssFeeds)
 
+        # State of the last build, kept for updating the site.
+        self.root: DirectoryNode | None = None
+        self.git_client: git.GitClient | None = None
+        self.head = None
+        self.last_edited: dict[Path, datetime] = {}
+        self.manifest: BuildManifest | None = None
+        self.frame_hashes: dict[Path, str] = {}
+        self.feed_items: dict[Path, FeedItem] = {}
+        self.dependencies = DependencyGraph()
+        self.feed_write_stats = WriteStats()
+        self.output_record: OutputRecord | None = None
+
     def run(self) -> None:
         """
         Entry point. Generate a new static site project by traversing the source directory and transforming Markdown files
         into HTML.
+
+        Markdown files are rendered into pages, on a pool of worker processes with more than one job, the pages expected
+        to take longest first, and the other files are copied while pages are rendered. In incremental mode, pages whose
+        inputs did not change since the previous build, according to the manifest kept in the destination folder, are
+        not rendered again. The RSS feeds and the stylesheet of highlighted code blocks are written once every page is,
+        and outputs of the previous build which are no longer produced are deleted. With a :attr:`shard`, only part of
+        the site is built, see :func:`ssg.engine.shard.merge_shards`.
+
+        The directory tree, the last-edit times, the feed entries and the dependencies of every output are kept, so
+        :meth:`update` can rebuild parts of the site afterward.
         :return: None
         """
-        root = create_directory_tree(self.config.source, frozenset(self.config.exclude))
-        root.mk_dir_tree(self.config.destination)
-
-        last_edited = get_last_edited_for_markdown_files(root, self.config.source)
-
-        for file in root.traverse(NodeType.FILE):
-            if file.is_markdown():
-                resolved = get_meta(file, self.config.meta, self.config.baseHref)
-                markdown = MarkDownFile.read_from_file(self.config.source / file.path)
-                cover_image_path = resolved.cover_image.as_posix() if resolved.cover_image else None
-                cover_image = urljoin(self.config.baseHref, cover_image_path) if cover_image_path else None
-                article = Article(
-                    markdown=markdown,
-                    title=resolved.title if resolved.title is not None else markdown.get_title(),
-                    description=resolved.description,
-                    cover_image=cover_image,
-                    url=resolved.url,
-                    last_edited=last_edited.get(self.config.source / file.path),
-                    author=Author(
-                        name=resolved.author,
-                        email=resolved.author_email,
-                        twitter_handle=resolved.twitter_handle
-                    )
-                )
-                self.rssFeedGenerator.add_to_feed(file, article)
-                destination_path = self.config.destination / file.path.parent / Path(f'{file.name}.html')
-                self.template_engine.render(file, article, destination_path)
-                print(f'Created {destination_path.as_posix()}')
-            else:
-                if file.path not in frozenset(frame.frame for frame in self.config.frames):
-                    shutil.copyfile(self.config.source / file.path, self.config.destination / file.path)
-                    print(f'Copied {(self.config.destination / file.path).as_posix()}')
-
-        self.rssFeedGenerator.generate_feeds(self.config.destination)
-
-
-def get_last_edited_for_markdown_files(root: DirectoryNode, source_dir: Path) -> dict[Path, datetime]:
-    git_client = git.GitClient(source_dir)
+        self.profiler.start()
+        try:
+            self._run()
+        finally:
+            self.profiler.stop()
+
+    def _run(self):
+        with self.profiler.stage('tree_walk'):
+            self.root = create_directory_tree(self.config.source, self.router.exclude, self.config.scanThreads)
+            self.root.mk_dir_tree(self.config.destination)
+        selected = shard_files(self.root, self.router, self.shard) if self.shard is not None else None
+
+        with self.profiler.stage('git_index'):
+            self.git_client = git.GitClient(self.config.source)
+            self.head = self.git_client.get_head()
+            self.last_edited = get_last_edited_for_markdown_files(self.root,
+                                                                  self.config.source,
+                                                                  self.config.cacheDir,
+                                                                  self.git_client,
+                                                                  selected)
+        fingerprint = build_fingerprint(self.config, self.root, _oid_to_str(self.head))
+
+        self.manifest = BuildManifest(config_fingerprint=config_fingerprint(self.config))
+        previous_manifest = self._load_previous_manifest(self.manifest.config_fingerprint)
+        self.frame_hashes = {}
+        self.feed_items = {}
+        self.dependencies = DependencyGraph()
+        self._reset_stats()
+
+        files = [file for file in self.root.traverse(NodeType.FILE) if selected is None or file.path in selected]
+        render_costs = RenderCosts.load(self.config.cacheDir) if self.config.cacheDir is not None else None
+        schedule = schedule_pages([file for file in files if file.is_markdown()], render_costs, self.jobs) \
+            if self.jobs > 1 else None
+
+        with (self.profiler.render_loop(),
+              AssetSync(asset_sync_mode(self.config), self.config.assetLink, profiler=self.profiler) as assets,
+              OutputWriter() as writer,
+              self._create_renderer(writer, schedule) as renderer):
+            if schedule is not None:
+                # Pages are sent longest first, and assets keep their places in the tree between them, so they are
+                # copied while pages are rendered.
+                pages = iter(schedule.pages)
+                files = [next(pages) if file.is_markdown() else file for file in files]
+            for file in files:
+                if file.is_markdown():
+                    self._build_page(file, renderer, previous_manifest)
+                elif not self.router.is_frame(file.path):
+                    self._add_asset(file.path)
+                    assets.submit(self.config.source / file.path, self.config.destination / file.path, file.stat)
+        self._finish_html_cache()
+        self._finish_render_costs(renderer, render_costs, schedule)
+        self._write_stylesheet()
+
+        if self.shard is None:
+            with self.profiler.stage('feed_generation'):
+                self._generate_feeds()
+        else:
+            self._save_shard_result()
+        self._print_write_stats()
+        self._prune_outputs(OutputRecord.load(self.config.destination), fingerprint)
+
+        if self.incremental:
+            self.manifest.save(self.config.destination)
+
+    def update(self, paths: set[Path]) -> EngineUpdate:
+        """
+        Rebuild only the outputs affected by changes to the source folder, reusing the state kept by the previous
+        :meth:`run`: the directory tree, the parsed templates, the last-edit times and the feed entries.
+
+        - The pages and feeds depending on a changed file, according to the dependency graph of the build, are
+          rendered again. New Markdown files are rendered, and the pages of deleted ones are deleted.
+        - Changed assets are synced again, and deleted ones are deleted from the destination, along with the
+          directories of deleted source folders once they are empty.
+        - If HEAD moved, the last-edit times are looked up again and the pages whose time changed are rendered again,
+          along with their feeds.
+
+        :param paths: paths, relative to the source folder, of the files which were modified, created or deleted
+        :return: what was rebuilt
+        """
+        result = EngineUpdate()
+        # Taken before reading any source file, so a change made during the update makes the fingerprint outdated.
+        head = self.git_client.get_head()
+
+        known = {file.path for file in self.root.traverse(NodeType.FILE)}
+        existing = {path for path in paths if (self.config.source / path).is_file()}
+        if existing - known or (paths - existing) & known:
+            self.root = create_directory_tree(self.config.source, self.router.exclude, self.config.scanThreads)
+            self.root.mk_dir_tree(self.config.destination)
+        files = {file.path: file for file in self.root.traverse(NodeType.FILE)}
+        # The tree keeps the stats of the previous scan, only the changed files are read again.
+        for path in existing & files.keys():
+            try:
+                files[path].stat = FileStat.from_stat_result((self.config.source / path).stat())
+            except FileNotFoundError:
+                files[path].stat = None
+
+        for path in paths:
+            if self.router.is_frame(path):
+                self.template_engine.invalidate(path)
+                self.frame_hashes.pop(path, None)
+
+        pages: set[Path] = set()
+        feeds: set[str] = set()
+        for output in self.dependencies.affected(paths):
+            dependencies = self.dependencies.outputs[output]
+            if dependencies.kind == 'page':
+                pages.add(Path(dependencies.source))
+            elif dependencies.kind == 'feed':
+                feeds.update(dependencies.feeds)
+
+        for path in sorted(paths):
+            file = files.get(path)
+            if file is None:
+                pages.discard(path)
+                if not self.router.is_frame(path):
+                    self._remove_output(path)
+                    result.removed.append(path)
+            elif file.is_markdown():
+                pages.add(path)
+            elif not self.router.is_frame(path):
+                result.assets.append(path)
+
+        if head != self.head:
+            self.head = head
+            last_edited = get_last_edited_for_markdown_files(self.root,
+                                                             self.config.source,
+                                                             self.config.cacheDir,
+                                                             self.git_client)
+            edited = [page for page, file in files.items()
+                      if file.is_markdown()
+                      and last_edited.get(self.config.source / page) != self.last_edited.get(self.config.source / page)]
+            pages.update(edited)
+            feeds.update(feed.title for page in edited for feed in self.router.get_feeds(page))
+            self.last_edited = last_edited
+
+        if result.assets:
+            with AssetSync(asset_sync_mode(self.config), self.config.assetLink) as assets:
+                for path in result.assets:
+                    self._add_asset(path)
+                    assets.submit(self.config.source / path, self.config.destination / path)
+
+        result.pages = sorted(pages)
+        self._reset_stats()
+        with OutputWriter() as writer, SerialRenderer(self.template_engine, writer) as renderer:
+            for path in result.pages:
+                self._build_page(files[path], renderer)
+        if result.pages:
+            self._finish_html_cache()
+
+        result.feeds = [feed.title for feed in self.config.rssFeeds if feed.title in feeds]
+        if result.feeds:
+            self._generate_feeds(set(result.feeds))
+        self._print_write_stats()
+        if not result.is_empty():
+            self._prune_outputs(self.output_record, build_fingerprint(self.config, self.root, _oid_to_str(head)))
+
+        if self.incremental and (result.pages or result.removed):
+            self.manifest.save(self.config.destination)
+
+        return result
+
+    def _build_page(self, file: FileNode, renderer: SerialRenderer | ParallelRenderer,
+                    previous_manifest: BuildManifest | None = None):
+        """
+        Render a Markdown file, unless the previous build rendered it from the same inputs, and record its feed entry.
+        """
+        with self.profiler.stage('meta', file.path):
+            resolved = get_meta(file, self.config.meta, self.config.baseHref, self.router.meta_matchers)
+        with self.profiler.stage('markdown_read', file.path):
+            markdown = MarkDownFile.read_from_file(self.config.source / file.path,
+                                                   self.config.markdownExtensions,
+                                                   self.config.markdownExtensionConfigs)
+        destination_path = self._page_destination(file.path)
+        self._add_page(file, resolved)
+
+        record = None
+        if self.incremental:
+            record = self._page_record(file, markdown, resolved, self.last_edited, self.frame_hashes)
+            self.manifest.pages[file.path.as_posix()] = record
+
+            previous_record = previous_manifest.pages.get(file.path.as_posix()) if previous_manifest else None
+            if (previous_record is not None
+                    and previous_record.feed_item is not None
+                    and previous_record.has_same_inputs(record)
+                    and destination_path.exists()):
+                record.feed_item = previous_record.feed_item
+                self.feed_items[file.path] = FeedItem.from_dict(record.feed_item)
+                return
+
+        article = self._create_article(file, markdown, resolved, self.last_edited)
+        feed_item = FeedItem.from_article(article)
+        if record is not None:
+            record.feed_item = feed_item.to_dict()
+        self.feed_items[file.path] = feed_item
+        renderer.submit(RenderJob(file.path, article, destination_path))
+
+    def _page_destination(self, path: Path) -> Path:
+        return self.config.destination / path.parent / Path(f'{path.stem}.html')
+
+    def _add_page(self, file: FileNode, resolved: ResolvedMeta):
+        """
+        Record the inputs of a page in the dependency graph.
+        """
+        matcher = self.router.get_meta_matcher(file.path) if self.config.meta is not None else None
+        frame = self.router.get_frame(file.path)
+        self.dependencies.add(
+            self._page_destination(file.path).relative_to(self.config.destination).as_posix(),
+            OutputDependencies(
+                kind='page',
+                source=file.path.as_posix(),
+                frame=frame.as_posix() if frame is not None else None,
+                cover_image=resolved.cover_image.as_posix() if resolved.cover_image is not None else None,
+                cover_pattern=cover_image_pattern(file.path)
+                if matcher is not None and matcher.action == 'TAKE_FROM_CONTENT' else None,
+                meta_matcher=matcher.file if matcher is not None else None,
+                feeds=[feed.title for feed in self.router.get_feeds(file.path)],
+                config=PAGE_CONFIG_FRAGMENTS,
+            ))
+
+    def _add_asset(self, path: Path):
+        """
+        Record the input of an asset in the dependency graph.
+        """
+        self.dependencies.add(path.as_posix(),
+                              OutputDependencies(kind='asset', source=path.as_posix(), config=ASSET_CONFIG_FRAGMENTS))
+
+    def _remove_output(self, path: Path):
+        """
+        Delete the output produced from a source file which no longer exists.
+        """
+        if path.suffix == '.md':
+            destination_path = self._page_destination(path)
+            self.feed_items.pop(path, None)
+            self.manifest.pages.pop(path.as_posix(), None)
+        else:
+            destination_path = self.config.destination / path
+        self.dependencies.remove(destination_path.relative_to(self.config.destination).as_posix())
+        if destination_path.is_file():
+            destination_path.unlink()
+            print(f'Deleted {destination_path.as_posix()}')
+
+    def _write_stylesheet(self):
+        """
+        Write the stylesheet of the highlighted code blocks, shared by every page.
+        """
+        if self.template_engine.highlighter is None:
+            return
+        path = self.config.syntaxHighlight.stylesheet
+        if (self.config.source / path).is_file():
+            raise Exception(f'The syntaxHighlight stylesheet {path.as_posix()} is also a file of the source folder')
+        destination_path = self.config.destination / path
+        destination_path.parent.mkdir(parents=True, exist_ok=True)
+        content = self.template_engine.highlighter.stylesheet().encode('utf-8')
+        if self.config.outputWrite == 'if-changed':
+            write_if_changed(destination_path, content)
+        else:
+            destination_path.write_bytes(content)
+        self.dependencies.add(path.as_posix(),
+                              OutputDependencies(kind='stylesheet', config=['outputWrite', 'syntaxHighlight']))
+        print(f'Created {destination_path.as_posix()}')
+
+    def _generate_feeds(self, feed_ids: set[str] | None = None):
+        """
+        Write the RSS feeds from the recorded feed entries, in the order of the pages in the directory tree.
+        :param feed_ids: titles of the feeds to write, all feeds if not given
+        """
+        self.rssFeedGenerator = RssFeedGenerator(self.config.rssFeeds)
+        pages: dict[str, list[str]] = {feed.title: [] for feed in self.config.rssFeeds}
+        for file in self.root.traverse(NodeType.FILE):
+            if file.path in self.feed_items:
+                self.rssFeedGenerator.add_feed_item(file, self.feed_items[file.path])
+                for feed in self.router.get_feeds(file.path):
+                    pages[feed.title].append(file.path.as_posix())
+        self.feed_write_stats = self.rssFeedGenerator.generate_feeds(
+            self.config.destination, feed_ids, if_changed=self.config.outputWrite == 'if-changed')
+
+        for feed in self.config.rssFeeds:
+            self.dependencies.add(feed.outputLocation.as_posix(),
+                                  OutputDependencies(kind='feed',
+                                                     matcher=feed.matcher,
+                                                     pages=pages[feed.title],
+                                                     feeds=[feed.title],
+                                                     config=['baseHref', 'meta', 'outputWrite',
+                                                             feed_config_fragment(feed.title)]))
+
+    def _save_shard_result(self):
+        """
+        Write the partial result of the shard into the destination folder: its outputs, and the feed entries of its
+        pages along with their position in the directory tree, so a merge writes the feeds in the same order as a build.
+        """
+        config = shard_config(self.config)
+        markdown_files = (file for file in self.root.traverse(NodeType.FILE) if file.is_markdown())
+        ShardResult(
+            shard=self.shard,
+            config_fingerprint=config_fingerprint(config),
+            fingerprint=build_fingerprint(config, self.root, _oid_to_str(self.head)),
+            files=set(self.dependencies.outputs),
+            directories=self._output_directories(),
+            feed_items=[ShardFeedItem(order=order, path=file.path.as_posix(), item=self.feed_items[file.path].to_dict())
+                        for order, file in enumerate(markdown_files) if file.path in self.feed_items],
+            pages=self.manifest.pages if self.incremental else None,
+        ).save(self.config.destination)
+
+    def _output_directories(self) -> set[str]:
+        return {directory.path.as_posix() for directory in self.root.traverse(NodeType.DIR)
+                if directory.path != Path('')}
+
+    def _prune_outputs(self, previous: OutputRecord | None, fingerprint: str):
+        """
+        Delete the outputs of the previous build which are no longer produced, and record the outputs of this one.
+        :param previous: outputs of the previous build, nothing is deleted if not known
+        :param fingerprint: fingerprint of the inputs of this build, see :func:`build_fingerprint`
+        """
+        current = OutputRecord(files=set(self.dependencies.outputs),
+                               directories=self._output_directories(),
+                               fingerprint=fingerprint)
+        if previous is not None:
+            for path in prune_outputs(self.config.destination, previous, current):
+                print(f'Deleted {path.as_posix()}')
+        current.save(self.config.destination)
+        self.output_record = current
+
+    def _reset_stats(self):
+        self.template_engine.write_stats = WriteStats()
+        self.feed_write_stats = WriteStats()
+        if self.template_engine.html_cache is not None:
+            self.template_engine.html_cache.stats = CacheStats()
+
+    def _finish_html_cache(self):
+        """
+        Report the hits and misses of the HTML cache and evict the least recently used entries of the HTML cache and
+        of the cache of highlighted code blocks.
+        """
+        html_cache = self.template_engine.html_cache
+        if html_cache is None:
+            return
+        print(f'HTML cache: {html_cache.stats}')
+        evicted = html_cache.evict()
+        if evicted:
+            print(f'HTML cache: evicted {evicted} entries')
+        highlighter = self.template_engine.highlighter
+        if highlighter is not None and highlighter.cache is not None:
+            evicted = highlighter.cache.evict()
+            if evicted:
+                print(f'Highlight cache: evicted {evicted} entries')
+
+    def _finish_render_costs(self,
+                             renderer: SerialRenderer | ParallelRenderer,
+                             render_costs: RenderCosts | None,
+                             schedule: Schedule | None):
+        """
+        Report the expected and actual time spent rendering pages on the workers, and record the time spent rendering
+        each page in the cache directory.
+        :param renderer: renderer of the build
+        :param render_costs: render times recorded by the previous builds
+        :param schedule: order in which the pages were sent to the workers
+        """
+        if schedule is not None and renderer.makespan is not None:
+            estimated = schedule.estimated_makespan(renderer.render_times, self.jobs)
+            print(f'Render schedule: estimated makespan '
+                  f'{f"{estimated:.2f} s" if estimated is not None else "unknown (no render times recorded)"}, '
+                  f'actual {renderer.makespan:.2f} s')
+
+        if self.config.cacheDir is None:
+            return
+        render_costs = render_costs if render_costs is not None else RenderCosts()
+        pages = {file.path.as_posix(): file for file in self.root.traverse(NodeType.FILE) if file.is_markdown()}
+        render_costs.entries = {path: cost for path, cost in render_costs.entries.items() if path in pages}
+        for path, seconds in renderer.render_times.items():
+            file = pages[path.as_posix()]
+            render_costs.entries[path.as_posix()] = PageCost(seconds=seconds,
+                                                             size=file.stat.size if file.stat is not None else 0)
+        render_costs.save(self.config.cacheDir)
+
+    def _print_write_stats(self):
+        if self.config.outputWrite == 'if-changed':
+            print(f'Pages: {self.template_engine.write_stats}')
+            print(f'Feeds: {self.feed_write_stats}')
+
+    def _create_renderer(self,
+                         writer: OutputWriter,
+                         schedule: Schedule | None = None) -> SerialRenderer | ParallelRenderer:
+        if self.jobs > 1:
+            html_cache = self.template_engine.html_cache
+            return ParallelRenderer(self.config, self.jobs, profiler=self.profiler,
+                                    write_stats=self.template_engine.write_stats,
+                                    cache_stats=html_cache.stats if html_cache is not None else None,
+                                    costs=schedule.costs if schedule is not None else None,
+                                    chunk_cost=schedule.chunk_cost if schedule is not None else None,
+                                    log_order=schedule.order if schedule is not None else None)
+        return SerialRenderer(self.template_engine, writer)
+
+    def _load_previous_manifest(self, fingerprint: str) -> BuildManifest | None:
+        """
+        Load the manifest of the previous build if it can be used for an incremental build.
+        :param fingerprint: fingerprint of the current configuration
+        :return: the previous manifest or None if a full build is required
+        """
+        if not self.incremental:
+            return None
+
+        previous_manifest = BuildManifest.load(self.config.destination)
+        if previous_manifest is None:
+            print('No usable build manifest found, doing a full build.')
+            return None
+
+        if previous_manifest.config_fingerprint != fingerprint:
+            print('Configuration changed since the previous build, doing a full build.')
+            return None
+
+        return previous_manifest
+
+    def _page_record(self,
+                     file: FileNode,
+                     markdown: MarkDownFile,
+                     resolved: ResolvedMeta,
+                     last_edited: dict[Path, datetime],
+                     frame_hashes: dict[Path, str]) -> PageRecord:
+        """
+        Collect the inputs used to render a page.
+        :param frame_hashes: cache of frame content hashes, shared between the pages of a build
+        """
+        frame = self.template_engine.get_frame(file)
+        if frame not in frame_hashes:
+            frame_hashes[frame] = hash_bytes((self.config.source / frame).read_bytes())
+
+        edit_time = last_edited.get(self.config.source / file.path)
+        return PageRecord(
+            source_hash=hash_bytes(markdown.content.encode('utf-8')),
+            frame=frame.as_posix(),
+            frame_hash=frame_hashes[frame],
+            meta=meta_to_dict(resolved),
+            last_edited=edit_time.isoformat() if edit_time else None,
+        )
+
+    def _create_article(self,
+                        file: FileNode,
+                        markdown: MarkDownFile,
+                        resolved: ResolvedMeta,
+                        last_edited: dict[Path, datetime]) -> Article:
+        cover_image_path = resolved.cover_image.as_posix() if resolved.cover_image else None
+        cover_image = urljoin(self.config.baseHref, cover_image_path) if cover_image_path else None
+        return Article(
+            markdown=markdown,
+            title=resolved.title if resolved.title is not None else markdown.get_title(),
+            description=resolved.description,
+            cover_image=cover_image,
+            url=resolved.url,
+            last_edited=last_edited.get(self.config.source / file.path),
+            author=Author(
+                name=resolved.author,
+                email=resolved.author_email,
+                twitter_handle=resolved.twitter_handle
+            )
+        )
+
+
+def _oid_to_str(oid) -> str | None:
+    return str(oid) if oid is not None else None
+
+
+def get_last_edited_for_markdown_files(root: DirectoryNode,
+                                       source_dir: Path,
+                                       cache_dir: Path | None = None,
+                                       git_client: git.GitClient | None = None,
+                                       paths: set[Path] | None = None) -> dict[Path, datetime]:
+    """
+    Look up the last-edit time of every Markdown file from the git history.
+    :param root: root of the source directory tree
+    :param source_dir: source directory
+    :param cache_dir: if given, the last-edit times are persisted in this directory and only the commits made since
+    the previous build are walked
+    :param git_client: client of the repository containing the source directory, created if not given
+    :param paths: paths of the files to look up, relative to the source directory, every Markdown file if not given
+    :return: dict mapping the path of each Markdown file to its last-edit time
+    """
+    if git_client is None:
+        git_client = git.GitClient(source_dir)
 
     markdown_file_paths = {
-        source_dir / file.path for file in root.traverse(NodeType.FILE) if file.is_markdown()
+        source_dir / file.path for file in root.traverse(NodeType.FILE)
+        if file.is_markdown() and (paths is None or file.path in paths)
     }
+    if cache_dir is not None:
+        return get_last_edit_time_for_files_cached(git_client, markdown_file_paths, cache_dir, prune=paths is None)
     return git_client.get_last_edit_time_for_files(markdown_file_paths)
@@ -0,0 +1,120 @@
+"""Persistent build manifest used for incremental builds."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+
+from ssg.config import Config
+from ssg.engine.meta import ResolvedMeta
+
+MANIFEST_FILE_NAME = '.ssg-manifest.json'
+
+# Bump whenever the layout of the manifest or the rendering pipeline changes in a way that invalidates
+# previously generated outputs.
+MANIFEST_VERSION = 2
+
+
+def hash_bytes(content: bytes) -> str:
+    """
+    Return a hex digest identifying the given content.
+    :param content: raw bytes to hash
+    :return: SHA-256 hex digest
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+def config_fingerprint(config: Config) -> str:
+    """
+    Compute a stable fingerprint of the site configuration. Any change to config.json results in a different
+    fingerprint, which forces a full rebuild.
+    :param config: site configuration
+    :return: hex digest of the configuration
+    """
+    serialized = json.dumps(asdict(config), default=str, sort_keys=True)
+    return hash_bytes(f'{MANIFEST_VERSION}:{serialized}'.encode('utf-8'))
+
+
+def meta_to_dict(resolved: ResolvedMeta) -> dict:
+    """
+    Convert resolved meta values into a JSON serializable dictionary.
+    :param resolved: resolved meta of a page
+    :return: dictionary with plain values
+    """
+    return {key: value.as_posix() if isinstance(value, Path) else value
+            for key, value in asdict(resolved).items()}
+
+
+@dataclass
+class PageRecord:
+    """
+    Inputs used to render a single page, along with its cached RSS feed entry.
+    """
+    source_hash: str
+    frame: str
+    frame_hash: str
+    meta: dict
+    last_edited: str | None
+    feed_item: dict | None = None
+
+    def has_same_inputs(self, other: PageRecord) -> bool:
+        """
+        Check whether the page was rendered from the same inputs as ``other``.
+        :param other: record to compare with
+        :return: True if the page does not need to be rendered again
+        """
+        return (self.source_hash == other.source_hash
+                and self.frame == other.frame
+                and self.frame_hash == other.frame_hash
+                and self.meta == other.meta
+                and self.last_edited == other.last_edited)
+
+
+@dataclass
+class BuildManifest:
+    """
+    Record of the outputs produced by a build, stored in the destination folder.
+    """
+    config_fingerprint: str
+    pages: dict[str, PageRecord] = field(default_factory=dict)
+
+    @staticmethod
+    def load(destination: Path) -> BuildManifest | None:
+        """
+        Read the manifest from the destination folder.
+        :param destination: destination folder of the site
+        :return: the manifest or None if it is missing, unreadable or written by a different version
+        """
+        path = destination / MANIFEST_FILE_NAME
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if content.get('version') != MANIFEST_VERSION:
+            return None
+
+        try:
+            return BuildManifest(
+                config_fingerprint=content['configFingerprint'],
+                pages={key: PageRecord(**value) for key, value in content['pages'].items()},
+            )
+        except (KeyError, TypeError):
+            print(f'Warning! Ignoring malformed build manifest {path.as_posix()}')
+            return None
+
+    def save(self, destination: Path):
+        """
+        Write the manifest into the destination folder.
+        :param destination: destination folder of the site
+        """
+        content = {
+            'version': MANIFEST_VERSION,
+            'configFingerprint': self.config_fingerprint,
+            'pages': {key: asdict(record) for key, record in sorted(self.pages.items())},
+        }
+        with open(destination / MANIFEST_FILE_NAME, mode='w', encoding='utf-8') as file:
+            json.dump(content, file, indent=2)
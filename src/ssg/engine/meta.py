@@ -1,9 +1,9 @@
-import fnmatch
 from dataclasses import dataclass
 from pathlib import Path
 from urllib.parse import urljoin
 
 from ssg.config import Meta
+from ssg.config.path_router import PatternList
 from ssg.dirtree.file_node import FileNode
 from ssg.engine.cover_image import get_cover_image
 
@@ -27,25 +27,34 @@ class ResolvedMeta:
     author_email: str | None = None
     twitter_handle: str | None = None
 
-def get_meta(file: FileNode, meta: Meta | None, base_href: str) -> ResolvedMeta:
+def get_meta(file: FileNode,
+             meta: Meta | None,
+             base_href: str,
+             matcher_patterns: PatternList | None = None) -> ResolvedMeta:
     """
     Resolve the HTML meta tag values for ``file`` using the first matching
     route in ``meta.matchers``.
 
+    ``matcher_patterns`` is the compiled list of the ``file`` patterns of
+    ``meta.matchers``. Pass it when resolving many files, so the patterns
+    are not compiled on every call.
+
     Returns an empty :class:`ResolvedMeta` (with the default Twitter
     handle, if any) when no route matches or ``meta`` is ``None``.
     """
     if meta is None:
         return ResolvedMeta()
 
+    if matcher_patterns is None:
+        matcher_patterns = PatternList(matcher.file for matcher in meta.matchers)
+
     url_computed = urljoin(base_href, file.path.with_suffix('.html').as_posix())
     twitter_handle = meta.default.twitter_handle
     author_name = meta.default.author_name
     author_email = meta.default.author_email
-    for matcher in meta.matchers:
-        if not fnmatch.fnmatch(file.path.as_posix(), matcher.file):
-            continue
-
+    index = matcher_patterns.first_match(file.path.as_posix())
+    if index is not None:
+        matcher = meta.matchers[index]
         default_cover_image = Path(meta.default.image) if meta.default.image is not None else None
         default_description = meta.default.description if meta.default.description is not None else None
 
@@ -0,0 +1,114 @@
+"""Writing of finished outputs on a pool of threads, so disk I/O overlaps with rendering."""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+
+@dataclass
+class WriteStats:
+    """Number of files written, and of files left untouched because they already had the same content."""
+    written: int = 0
+    unchanged: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, written: bool, count: int = 1):
+        with self._lock:
+            if written:
+                self.written += count
+            else:
+                self.unchanged += count
+
+    def merge(self, other: 'WriteStats'):
+        self.add(True, other.written)
+        self.add(False, other.unchanged)
+
+    def __getstate__(self):
+        return {'written': self.written, 'unchanged': self.unchanged}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __str__(self):
+        return f'{self.written} written, {self.unchanged} unchanged'
+
+
+def write_if_changed(path: Path, content: bytes) -> bool:
+    """
+    Write a file, unless it already holds the same content. An untouched file keeps its modification time, so tools
+    syncing the destination folder (rsync, S3 sync, ...) skip it.
+    :param path: path of the file
+    :param content: new content of the file
+    :return: True if the file was written
+    """
+    try:
+        if path.stat().st_size == len(content) and path.read_bytes() == content:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(content)
+    return True
+
+
+class OutputWriter:
+    """
+    Run output jobs (writing a page, copying a file, ...) on a small pool of threads.
+
+    The number of jobs queued or running is bounded: :meth:`submit` blocks while the queue is full, so finished pages
+    waiting to be written do not pile up in memory when the disk is slower than rendering. Errors do not stop the
+    build: the first one is raised again when leaving the context, once every job is done, which makes leaving the
+    context a barrier for the outputs written so far.
+
+    Usage:
+    with OutputWriter() as writer:
+        writer.submit(write_html, content, destination_path)
+    """
+
+    def __init__(self, threads: int | None = 2, max_pending: int = 64, thread_name_prefix: str = 'ssg-writer'):
+        """
+        :param threads: number of threads, defaults to the default of ThreadPoolExecutor if None
+        :param max_pending: maximum number of jobs queued or running at once
+        :param thread_name_prefix: prefix of the names of the threads
+        """
+        self.threads = threads
+        self.thread_name_prefix = thread_name_prefix
+        self.errors: list[BaseException] = []
+        self.executor: ThreadPoolExecutor | None = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix=self.thread_name_prefix)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.executor.shutdown(wait=True, cancel_futures=exc_type is not None)
+        if exc_type is None and self.errors:
+            if len(self.errors) > 1:
+                print(f'{len(self.errors)} outputs could not be written, raising the first error.')
+            raise self.errors[0]
+        return False
+
+    def submit(self, function: Callable, *args) -> Future:
+        """
+        Queue a job. Blocks while the maximum number of jobs are queued or running.
+        :param function: job to run
+        :param args: arguments of the job
+        :return: future of the result of the job
+        """
+        self._slots.acquire()
+        try:
+            future = self.executor.submit(function, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Future):
+        self._slots.release()
+        if not future.cancelled() and future.exception() is not None:
+            with self._lock:
+                self.errors.append(future.exception())
@@ -0,0 +1,94 @@
+"""Record of the files a build wrote into the destination folder, used to delete the ones it no longer produces."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ssg.engine.outputs_file import OUTPUT_RECORD_FILE_NAME, OUTPUT_RECORD_VERSION, read_outputs_file
+
+
+def is_relative_path(path: str) -> bool:
+    """
+    Check that a recorded path stays inside the destination folder, so a tampered record cannot delete other files.
+    """
+    parts = path.split('/')
+    return bool(path) and not path.startswith('/') and '..' not in parts and parts != ['.']
+
+
+@dataclass
+class OutputRecord:
+    """
+    Outputs written by a build (pages, assets and RSS feeds) and the directories created for them, as POSIX paths
+    relative to the destination folder. Only recorded paths are ever deleted, so files put into the destination folder
+    by anything else are kept.
+
+    ``fingerprint`` identifies the inputs of the build, see :func:`ssg.engine.check.build_fingerprint`.
+    """
+    files: set[str] = field(default_factory=set)
+    directories: set[str] = field(default_factory=set)
+    fingerprint: str | None = None
+
+    @staticmethod
+    def load(destination: Path) -> OutputRecord | None:
+        """
+        Read the record of the previous build from the destination folder.
+        :param destination: destination folder of the site
+        :return: the record or None if it is missing, unreadable or written by a different version
+        """
+        content = read_outputs_file(destination)
+        if content is None:
+            return None
+
+        try:
+            return OutputRecord(files={p for p in content['files'] if is_relative_path(p)},
+                                directories={p for p in content['directories'] if is_relative_path(p)},
+                                fingerprint=content.get('fingerprint'))
+        except (KeyError, TypeError):
+            print(f'Warning! Ignoring malformed output record {(destination / OUTPUT_RECORD_FILE_NAME).as_posix()}')
+            return None
+
+    def save(self, destination: Path):
+        """
+        Write the record into the destination folder.
+        :param destination: destination folder of the site
+        """
+        content = {
+            'version': OUTPUT_RECORD_VERSION,
+            'fingerprint': self.fingerprint,
+            'files': sorted(self.files),
+            'directories': sorted(self.directories),
+        }
+        with open(destination / OUTPUT_RECORD_FILE_NAME, mode='w', encoding='utf-8') as file:
+            json.dump(content, file, indent=2)
+
+
+def prune_outputs(destination: Path, previous: OutputRecord, current: OutputRecord) -> list[Path]:
+    """
+    Delete the outputs of the previous build which the current build did not produce, e.g. the page of a renamed
+    Markdown file, then the directories created for them if they are left empty. Directories still holding files are
+    kept, whoever wrote these files.
+    :param destination: destination folder of the site
+    :param previous: outputs of the previous build
+    :param current: outputs of the current build
+    :return: the deleted files and directories
+    """
+    deleted = []
+    for path in sorted(previous.files - current.files):
+        output = destination / path
+        if output.is_file() or output.is_symlink():
+            output.unlink()
+            deleted.append(output)
+
+    # Deepest first, so a directory emptied by deleting its subdirectories is deleted too.
+    for path in sorted(previous.directories - current.directories, key=lambda p: (-p.count('/'), p)):
+        directory = destination / path
+        if directory.is_symlink() or not directory.is_dir():
+            continue
+        try:
+            directory.rmdir()
+        except OSError:
+            continue
+        deleted.append(directory)
+    return deleted
@@ -0,0 +1,27 @@
+"""
+Reading of the output record file, apart from :class:`ssg.engine.outputs.OutputRecord`, so ``--check`` can read the
+recorded fingerprint without importing dataclasses.
+"""
+
+import json
+from pathlib import Path
+
+OUTPUT_RECORD_FILE_NAME = '.ssg-outputs.json'
+
+OUTPUT_RECORD_VERSION = 1
+
+
+def read_outputs_file(destination: Path) -> dict | None:
+    """
+    :param destination: destination folder of the site
+    :return: the content of the output record of the previous build, None if it is missing, unreadable or written by a
+    different version
+    """
+    try:
+        with open(destination / OUTPUT_RECORD_FILE_NAME, 'r', encoding='utf-8') as file:
+            content = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(content, dict) or content.get('version') != OUTPUT_RECORD_VERSION:
+        return None
+    return content
@@ -0,0 +1,208 @@
+"""Wall and CPU time spent in each stage of a build and on each page, collected with ``--profile``."""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import json
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from ssg.engine.asset_sync import format_size
+
+# Stages in the order they happen during a build.
+STAGES = ['tree_walk', 'git_index', 'meta', 'markdown_read', 'markdown_conversion', 'template_embedding',
+          'html_write', 'asset_copy', 'feed_generation']
+
+_DISABLED = contextlib.nullcontext()
+
+
+@dataclass
+class StageTime:
+    """Time spent in a stage, in seconds. CPU time is the time of the thread running the stage."""
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+
+    def add(self, wall: float, cpu: float, calls: int = 1):
+        self.wall += wall
+        self.cpu += cpu
+        self.calls += calls
+
+
+class BuildProfiler:
+    """
+    Record the time spent in each stage of a build, the cost of each page and the peak memory use.
+
+    Stages may run on several threads at once (asset copies) or in worker processes (rendering with more than one
+    job), so the time of a stage is the sum of the time of each call and may exceed the time of the build. A disabled
+    profiler records nothing and adds no measurable overhead.
+
+    Usage:
+    profiler = BuildProfiler()
+    with profiler.stage('meta', page):
+        ...
+    profiler.save(path)
+    """
+
+    def __init__(self, enabled: bool = True, trace_memory: bool = False, cprofile_path: Path | None = None):
+        """
+        :param enabled: whether anything is recorded
+        :param trace_memory: record the peak memory allocated during the build with tracemalloc. Tracing every
+        allocation makes the build several times slower, and with it the time of each stage
+        :param cprofile_path: if given, the render loop is profiled with cProfile and the stats are dumped to this file
+        """
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.cprofile_path = cprofile_path
+        self.stages: dict[str, StageTime] = {}
+        self.pages: dict[str, dict[str, StageTime]] = {}
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_memory: int | None = None
+        self._lock = threading.Lock()
+        self._start: tuple[float, float] | None = None
+
+    def start(self):
+        """Start timing the build."""
+        if not self.enabled:
+            return
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._start = (time.perf_counter(), time.process_time())
+
+    def stop(self):
+        """Stop timing the build."""
+        if not self.enabled or self._start is None:
+            return
+        self.wall = time.perf_counter() - self._start[0]
+        self.cpu = time.process_time() - self._start[1]
+        self._start = None
+        if tracemalloc.is_tracing():
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def stage(self, name: str, page: Path | None = None):
+        """
+        Context manager timing a stage.
+        :param name: name of the stage, one of :data:`STAGES`
+        :param page: path of the page, relative to the source folder, the time is spent on
+        """
+        if not self.enabled:
+            return _DISABLED
+        return self._timed(name, page.as_posix() if page is not None else None)
+
+    @contextlib.contextmanager
+    def _timed(self, name: str, page: str | None):
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(name, page, time.perf_counter() - wall, time.thread_time() - cpu)
+
+    def record(self, name: str, page: str | None, wall: float, cpu: float, calls: int = 1):
+        """
+        Add the time of a stage measured elsewhere, e.g. in a worker process.
+        :param name: name of the stage
+        :param page: POSIX path of the page the time is spent on, if any
+        :param wall: wall time in seconds
+        :param cpu: CPU time in seconds
+        :param calls: number of calls measured
+        """
+        with self._lock:
+            self.stages.setdefault(name, StageTime()).add(wall, cpu, calls)
+            if page is not None:
+                self.pages.setdefault(page, {}).setdefault(name, StageTime()).add(wall, cpu, calls)
+
+    def page_records(self) -> list[tuple[str, str, float, float, int]]:
+        """
+        :return: the recorded times of each page, as accepted by :meth:`record`, so they can be sent from a worker
+        process to the main one
+        """
+        with self._lock:
+            return [(name, page, time_spent.wall, time_spent.cpu, time_spent.calls)
+                    for page, stages in self.pages.items() for name, time_spent in stages.items()]
+
+    def clear(self):
+        """Forget the recorded stage and page times."""
+        with self._lock:
+            self.stages = {}
+            self.pages = {}
+
+    @contextlib.contextmanager
+    def render_loop(self):
+        """
+        Context manager around the loop rendering pages, profiled with cProfile if a dump file is set.
+        """
+        if not self.enabled or self.cprofile_path is None:
+            yield
+            return
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            profile.dump_stats(self.cprofile_path)
+
+    def slowest_pages(self, count: int) -> list[tuple[str, StageTime]]:
+        """
+        :param count: maximum number of pages
+        :return: the pages which took the most wall time, with their total time, the slowest first
+        """
+        totals = []
+        for page, stages in self.pages.items():
+            total = StageTime()
+            for time_spent in stages.values():
+                total.add(time_spent.wall, time_spent.cpu, 0)
+            totals.append((page, total))
+        totals.sort(key=lambda item: item[1].wall, reverse=True)
+        return totals[:count]
+
+    def to_dict(self) -> dict:
+        """Convert into a JSON serializable dictionary. Pages are sorted by wall time, the slowest first."""
+        return {
+            'wall': self.wall,
+            'cpu': self.cpu,
+            'peak_memory': self.peak_memory,
+            'stages': {name: asdict(self.stages[name]) for name in self._stage_names()},
+            'pages': [{'path': page, 'wall': total.wall, 'cpu': total.cpu,
+                       'stages': {name: asdict(time_spent) for name, time_spent in self.pages[page].items()}}
+                      for page, total in self.slowest_pages(len(self.pages))],
+        }
+
+    def save(self, path: Path):
+        """
+        Write the report as JSON.
+        :param path: path of the JSON file
+        """
+        with open(path, mode='w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def summary(self, top: int = 10) -> str:
+        """
+        :param top: number of pages listed
+        :return: table of the time spent in each stage followed by the slowest pages
+        """
+        lines = [f'Build: {self.wall * 1000:.0f} ms wall, {self.cpu * 1000:.0f} ms CPU'
+                 + (f', peak memory {format_size(self.peak_memory)}' if self.peak_memory is not None else ''),
+                 '',
+                 f'{"Stage":<22}{"Wall (ms)":>12}{"CPU (ms)":>12}{"Calls":>8}']
+        for name in self._stage_names():
+            time_spent = self.stages[name]
+            lines.append(f'{name:<22}{time_spent.wall * 1000:>12.1f}{time_spent.cpu * 1000:>12.1f}'
+                         f'{time_spent.calls:>8}')
+
+        slowest = self.slowest_pages(top)
+        if slowest:
+            lines += ['', f'{"Slowest pages":<50}{"Wall (ms)":>12}{"CPU (ms)":>12}']
+            for page, total in slowest:
+                lines.append(f'{page:<50}{total.wall * 1000:>12.1f}{total.cpu * 1000:>12.1f}')
+        return '\n'.join(lines)
+
+    def _stage_names(self) -> list[str]:
+        return [name for name in STAGES if name in self.stages] + sorted(set(self.stages) - set(STAGES))
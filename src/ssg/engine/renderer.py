@@ -0,0 +1,211 @@
+"""Page renderers used by the engine, either in-process or on a pool of worker processes."""
+
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from ssg.config import Config
+from ssg.content.article import Article
+from ssg.content.html_cache import CacheStats
+from ssg.dirtree.file_node import FileNode
+from ssg.engine.output_writer import OutputWriter, WriteStats
+from ssg.engine.profiler import BuildProfiler
+from ssg.template.template_engine import TemplateEngine
+
+
+@dataclass
+class RenderJob:
+    """A page to be rendered. Only holds picklable data, so it can be sent to worker processes."""
+    path: Path
+    article: Article
+    destination_path: Path
+
+
+class SerialRenderer:
+    """
+    Render pages one after the other in the current process. If a writer is given, pages are written on its threads
+    while the next pages are rendered. The time spent rendering each page is recorded in :attr:`render_times`.
+    """
+
+    def __init__(self, template_engine: TemplateEngine, writer: OutputWriter | None = None):
+        self.template_engine = template_engine
+        self.writer = writer
+        self.render_times: dict[Path, float] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def submit(self, job: RenderJob):
+        """
+        Render a page.
+        :param job: page to be rendered
+        """
+        start = time.perf_counter()
+        self.template_engine.render(FileNode(job.path), job.article, job.destination_path, self.writer)
+        self.render_times[job.path] = time.perf_counter() - start
+        print(f'Created {job.destination_path.as_posix()}')
+
+
+# Template engine of a worker process, created once by the pool initializer so templates are parsed once per worker.
+_worker_template_engine: TemplateEngine | None = None
+
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    """
+    :return: the context starting the worker processes. Workers must not be forked from the main process, whose asset
+    and output thread pools may be running by then, so they are started by a fork server where available and spawned
+    otherwise.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        # Imported once by the fork server instead of once by each worker.
+        context.set_forkserver_preload([__name__, 'ssg.template.compiled_template', 'ssg.content.site_links'])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+def _init_worker(config: Config, profile: bool):
+    global _worker_template_engine
+    _worker_template_engine = TemplateEngine(config, profiler=BuildProfiler(enabled=profile))
+
+
+def _render_chunk(jobs: list[RenderJob]) -> tuple[list[tuple[Path, Path]], list[tuple], WriteStats, CacheStats,
+                                                  dict[Path, float]]:
+    """
+    :return: the source and destination paths of the rendered pages, the times recorded by the profiler of the worker,
+    the number of pages written and left untouched, the hits and misses of the HTML cache and the time spent rendering
+    each page, by source path
+    """
+    profiler = _worker_template_engine.profiler
+    profiler.clear()
+    _worker_template_engine.write_stats = WriteStats()
+    cache_stats = CacheStats()
+    if _worker_template_engine.html_cache is not None:
+        _worker_template_engine.html_cache.stats = cache_stats
+    render_times = {}
+    for job in jobs:
+        start = time.perf_counter()
+        _worker_template_engine.render(FileNode(job.path), job.article, job.destination_path)
+        render_times[job.path] = time.perf_counter() - start
+    return ([(job.path, job.destination_path) for job in jobs], profiler.page_records(),
+            _worker_template_engine.write_stats, cache_stats, render_times)
+
+
+class ParallelRenderer:
+    """
+    Render pages on a pool of worker processes.
+
+    Pages are sent to the workers in chunks. The number of chunks in flight is bounded, so memory use does not grow
+    with the size of the site. Chunks are collected in the order they were submitted, and the created pages are
+    logged in that order, or in ``log_order`` once every page is rendered if given, so the log output does not depend
+    on the order in which workers finish.
+
+    If the expected cost of the pages is given, a chunk is sent once the expected cost of its pages reaches
+    ``chunk_cost``, so a page expected to take long is sent alone instead of delaying the pages of its chunk. The time
+    spent rendering each page is recorded in :attr:`render_times`, and the time from sending the first chunk until the
+    last one is rendered in :attr:`makespan`.
+    """
+
+    def __init__(self,
+                 config: Config,
+                 jobs: int,
+                 chunk_size: int = 8,
+                 profiler: BuildProfiler | None = None,
+                 write_stats: WriteStats | None = None,
+                 cache_stats: CacheStats | None = None,
+                 costs: dict[Path, float] | None = None,
+                 chunk_cost: float | None = None,
+                 log_order: dict[Path, int] | None = None):
+        """
+        :param config: site configuration, used by each worker to load the templates
+        :param jobs: number of worker processes
+        :param chunk_size: number of pages sent to a worker at once
+        :param profiler: receives the time spent on each page by the workers, if given
+        :param write_stats: receives the number of pages written and left untouched by the workers, if given
+        :param cache_stats: receives the hits and misses of the HTML cache of the workers, if given
+        :param costs: expected cost of each page, by source path, see :class:`ssg.engine.schedule.Schedule`
+        :param chunk_cost: expected cost of the pages of a chunk from which it is sent, if given
+        :param log_order: position of each page in the log, by source path, if given
+        """
+        self.config = config
+        self.jobs = jobs
+        self.chunk_size = chunk_size
+        self.profiler = profiler if profiler is not None else BuildProfiler(enabled=False)
+        self.write_stats = write_stats if write_stats is not None else WriteStats()
+        self.cache_stats = cache_stats if cache_stats is not None else CacheStats()
+        self.costs = costs if costs is not None else {}
+        self.chunk_cost = chunk_cost
+        self.log_order = log_order
+        self.created: list[tuple[Path, Path]] = []
+        self.max_in_flight = 2 * jobs
+        self.executor: ProcessPoolExecutor | None = None
+        self.chunk: list[RenderJob] = []
+        self.chunk_expected_cost = 0.0
+        self.in_flight: deque[Future] = deque()
+        self.render_times: dict[Path, float] = {}
+        self.started: float | None = None
+        self.makespan: float | None = None
+
+    def __enter__(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.jobs,
+                                            mp_context=_worker_context(),
+                                            initializer=_init_worker,
+                                            initargs=(self.config, self.profiler.enabled))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self._flush()
+                while self.in_flight:
+                    self._collect_oldest()
+                if self.started is not None:
+                    self.makespan = time.perf_counter() - self.started
+                for _, destination_path in sorted(self.created, key=lambda page: self.log_order[page[0]]):
+                    print(f'Created {destination_path.as_posix()}')
+        finally:
+            self.executor.shutdown(wait=True, cancel_futures=exc_type is not None)
+        return False
+
+    def submit(self, job: RenderJob):
+        """
+        Queue a page for rendering. Blocks while too many chunks are in flight.
+        :param job: page to be rendered
+        """
+        cost = self.costs.get(job.path, 0.0)
+        if self.chunk and self.chunk_cost is not None and self.chunk_expected_cost + cost > self.chunk_cost:
+            self._flush()
+        self.chunk.append(job)
+        self.chunk_expected_cost += cost
+        if len(self.chunk) >= self.chunk_size:
+            self._flush()
+
+    def _flush(self):
+        if not self.chunk:
+            return
+        while len(self.in_flight) >= self.max_in_flight:
+            self._collect_oldest()
+        if self.started is None:
+            self.started = time.perf_counter()
+        self.in_flight.append(self.executor.submit(_render_chunk, self.chunk))
+        self.chunk = []
+        self.chunk_expected_cost = 0.0
+
+    def _collect_oldest(self):
+        pages, records, write_stats, cache_stats, render_times = self.in_flight.popleft().result()
+        for record in records:
+            self.profiler.record(*record)
+        self.write_stats.merge(write_stats)
+        self.cache_stats.merge(cache_stats)
+        self.render_times.update(render_times)
+        if self.log_order is not None:
+            self.created.extend(pages)
+            return
+        for _, destination_path in pages:
+            print(f'Created {destination_path.as_posix()}')
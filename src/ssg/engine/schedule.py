@@ -0,0 +1,147 @@
+"""
+Order in which pages are sent to the worker processes. Pages expected to take longest are sent first, so a few large
+pages rendered last do not leave the other workers idle at the end of the build.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+from collections.abc import Container
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ssg.dirtree.file_node import FileNode
+
+RENDER_COSTS_FILE_NAME = 'render-costs.json'
+
+# Number of chunks each worker receives on average. Cheap pages are grouped into chunks of about the same expected
+# render time, while pages expected to take longer than a chunk are sent alone.
+CHUNKS_PER_WORKER = 8
+
+
+@dataclass
+class PageCost:
+    """Time spent rendering a page, in seconds, and the size of its Markdown source at the time."""
+    seconds: float
+    size: int
+
+
+class RenderCosts:
+    """
+    Render time of each page measured by the previous builds, persisted in the cache directory. Entries are keyed by
+    POSIX paths relative to the source folder.
+    """
+
+    def __init__(self, entries: dict[str, PageCost] | None = None):
+        self.entries: dict[str, PageCost] = entries if entries is not None else {}
+
+    @staticmethod
+    def load(cache_dir: Path) -> RenderCosts | None:
+        """
+        Read the render times from the cache directory.
+        :param cache_dir: cache directory
+        :return: the render times or None if they are missing or unreadable
+        """
+        try:
+            with open(cache_dir / RENDER_COSTS_FILE_NAME, 'r', encoding='utf-8') as file:
+                content = json.load(file)
+            return RenderCosts({path: PageCost(seconds=float(seconds), size=int(size))
+                                for path, (seconds, size) in content['entries'].items()})
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, cache_dir: Path):
+        """
+        Write the render times into the cache directory, creating the directory if needed.
+        :param cache_dir: cache directory
+        """
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(cache_dir / RENDER_COSTS_FILE_NAME, mode='w', encoding='utf-8') as file:
+            json.dump({'entries': {path: [round(cost.seconds, 6), cost.size]
+                                   for path, cost in sorted(self.entries.items())}}, file, indent=2)
+
+    def seconds_per_byte(self) -> float | None:
+        """
+        :return: the average render time per byte of Markdown of the recorded pages, None if nothing is recorded
+        """
+        size = sum(cost.size for cost in self.entries.values())
+        if size == 0:
+            return None
+        return sum(cost.seconds for cost in self.entries.values()) / size
+
+    def estimate(self, file: FileNode, seconds_per_byte: float | None) -> float | None:
+        """
+        Expected render time of a page: its recorded time, scaled by the change of size of its source since then, or
+        the average time per byte times its size if it was never rendered.
+        :param file: Markdown file of the page
+        :param seconds_per_byte: see :meth:`seconds_per_byte`
+        :return: the expected time in seconds, None if nothing is recorded
+        """
+        size = _size(file)
+        cost = self.entries.get(file.path.as_posix())
+        if cost is not None:
+            return cost.seconds * size / cost.size if cost.size > 0 else cost.seconds
+        return size * seconds_per_byte if seconds_per_byte is not None else None
+
+
+@dataclass
+class Schedule:
+    """
+    Pages in the order they are sent to the workers, with the expected cost of each and their position in the
+    directory tree, which is the order the rendered pages are logged in. Costs are render times in seconds if previous
+    builds recorded any (``timed``), otherwise the sizes of the Markdown sources.
+    """
+    pages: list[FileNode]
+    costs: dict[Path, float] = field(default_factory=dict)
+    order: dict[Path, int] = field(default_factory=dict)
+    timed: bool = False
+    chunk_cost: float | None = None
+
+    def estimated_makespan(self, rendered: Container[Path], workers: int) -> float | None:
+        """
+        :param rendered: source paths of the pages rendered, the others were up to date in an incremental build
+        :param workers: number of worker processes
+        :return: the expected time needed to render the pages, None if the costs are not render times
+        """
+        if not self.timed:
+            return None
+        return estimate_makespan([self.costs[file.path] for file in self.pages if file.path in rendered], workers)
+
+
+def schedule_pages(pages: list[FileNode], render_costs: RenderCosts | None, workers: int) -> Schedule:
+    """
+    Order pages by descending expected cost, ties broken by path.
+    :param pages: Markdown files of the pages to render, in the order of the directory tree
+    :param render_costs: render times recorded by the previous builds, if any
+    :param workers: number of worker processes
+    :return: the schedule of the pages
+    """
+    seconds_per_byte = render_costs.seconds_per_byte() if render_costs is not None else None
+    if seconds_per_byte is not None:
+        costs = {file.path: render_costs.estimate(file, seconds_per_byte) for file in pages}
+    else:
+        costs = {file.path: float(_size(file)) for file in pages}
+    ordered = sorted(pages, key=lambda file: (-costs[file.path], file.path.as_posix()))
+    return Schedule(pages=ordered,
+                    costs=costs,
+                    order={file.path: index for index, file in enumerate(pages)},
+                    timed=seconds_per_byte is not None,
+                    chunk_cost=sum(costs.values()) / (workers * CHUNKS_PER_WORKER))
+
+
+def estimate_makespan(costs: list[float], workers: int) -> float:
+    """
+    Time needed to render pages of the given costs, sent in this order to the first idle worker.
+    :param costs: cost of each page, in the order the pages are sent
+    :param workers: number of worker processes
+    :return: the time at which the last worker finishes
+    """
+    finish_times = [0.0] * workers
+    for cost in costs:
+        heapq.heapreplace(finish_times, finish_times[0] + cost)
+    return max(finish_times)
+
+
+def _size(file: FileNode) -> int:
+    return file.stat.size if file.stat is not None else 0
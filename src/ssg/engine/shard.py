@@ -0,0 +1,283 @@
+"""
+Sharding of a build across machines: each shard renders part of the pages and assets into its own destination folder
+along with a partial result, and :func:`merge_shards` combines the shards into the site, writing the RSS feeds.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import heapq
+import json
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+
+from ssg.config import Config
+from ssg.config.path_router import PathRouter
+from ssg.dirtree.directory_node import DirectoryNode
+from ssg.dirtree.file_node import FileNode
+from ssg.dirtree.node import NodeType
+from ssg.engine.asset_sync import AssetSync, asset_sync_mode
+from ssg.engine.check import source_fingerprint
+from ssg.engine.manifest import BuildManifest, PageRecord, config_fingerprint
+from ssg.engine.outputs import OutputRecord, is_relative_path, prune_outputs
+from ssg.rss.rss_feed_generator import FeedItem, RssFeedGenerator
+
+SHARD_RESULT_FILE_NAME = '.ssg-shard.json'
+
+SHARD_RESULT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Shard:
+    """The ``index``-th of ``count`` shards of a build, numbered from 1."""
+    index: int
+    count: int
+
+    @staticmethod
+    def parse(value: str) -> Shard:
+        """
+        Parse a shard given as ``i/N``, e.g. ``2/4``.
+        :raise ValueError: if the value is not a valid shard
+        """
+        index, separator, count = value.partition('/')
+        try:
+            shard = Shard(int(index), int(count))
+        except ValueError:
+            shard = None
+        if not separator or shard is None or not 1 <= shard.index <= shard.count:
+            raise ValueError(f'Invalid shard {value!r}, expected i/N with 1 <= i <= N')
+        return shard
+
+    def __str__(self):
+        return f'{self.index}/{self.count}'
+
+
+def partition(files: list[FileNode], count: int) -> list[list[FileNode]]:
+    """
+    Split files into ``count`` parts of about the same total size. Files are assigned from the largest to the smallest
+    to the part with the smallest total size so far, ties broken by path and part number, so every machine computes
+    the same parts from the same source folder.
+    :param files: files to split
+    :param count: number of parts
+    :return: the files of each part
+    """
+    parts: list[list[FileNode]] = [[] for _ in range(count)]
+    loads = [(0, index) for index in range(count)]
+    for file in sorted(files, key=lambda f: (-_size(f), f.path.as_posix())):
+        load, index = heapq.heappop(loads)
+        parts[index].append(file)
+        heapq.heappush(loads, (load + _size(file), index))
+    return parts
+
+
+def shard_files(root: DirectoryNode, router: PathRouter, shard: Shard) -> set[Path]:
+    """
+    Select the files a shard builds. Markdown files and assets are split separately, since rendering a page costs
+    much more than copying an asset of the same size. Frames are needed by every shard and are not split.
+    :param root: root of the source directory tree
+    :param router: router of the site
+    :param shard: shard to select the files of
+    :return: paths of the selected files, relative to the source folder
+    """
+    pages = []
+    assets = []
+    for file in root.traverse(NodeType.FILE):
+        if file.is_markdown():
+            pages.append(file)
+        elif not router.is_frame(file.path):
+            assets.append(file)
+    selected = partition(pages, shard.count)[shard.index - 1] + partition(assets, shard.count)[shard.index - 1]
+    return {file.path for file in selected}
+
+
+def shard_config(config: Config) -> Config:
+    """
+    :return: the configuration without its destination folder, which differs between the shards of a build, used for
+    the fingerprints recorded in a shard result
+    """
+    return dataclasses.replace(config, destination=Path())
+
+
+def _size(file: FileNode) -> int:
+    return file.stat.size if file.stat is not None else 0
+
+
+@dataclass
+class ShardFeedItem:
+    """Feed entry of a page built by a shard, along with the position of the page among every Markdown file."""
+    order: int
+    path: str
+    item: dict
+
+
+@dataclass
+class ShardResult:
+    """
+    Partial result of a shard, stored in its destination folder: the outputs it wrote, the feed entries of its pages,
+    and the manifest records of its pages for an incremental build. Paths are POSIX paths, relative to the destination
+    folder for outputs and to the source folder for pages.
+
+    The fingerprints of the configuration and of the inputs are computed from :func:`shard_config`, so the shards of
+    a build have the same fingerprints whatever their destination folder.
+    """
+    shard: Shard
+    config_fingerprint: str
+    fingerprint: str | None
+    files: set[str] = field(default_factory=set)
+    directories: set[str] = field(default_factory=set)
+    feed_items: list[ShardFeedItem] = field(default_factory=list)
+    pages: dict[str, PageRecord] | None = None
+
+    @staticmethod
+    def load(directory: Path) -> ShardResult | None:
+        """
+        Read the result of a shard from its destination folder.
+        :param directory: destination folder of the shard
+        :return: the result or None if it is missing, unreadable or written by a different version
+        """
+        path = directory / SHARD_RESULT_FILE_NAME
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(content, dict) or content.get('version') != SHARD_RESULT_VERSION:
+            return None
+
+        try:
+            pages = content['pages']
+            return ShardResult(
+                shard=Shard(content['shard'], content['shardCount']),
+                config_fingerprint=content['configFingerprint'],
+                fingerprint=content['fingerprint'],
+                files={p for p in content['files'] if is_relative_path(p)},
+                directories={p for p in content['directories'] if is_relative_path(p)},
+                feed_items=[ShardFeedItem(**item) for item in content['feedItems']],
+                pages={key: PageRecord(**value) for key, value in pages.items()} if pages is not None else None,
+            )
+        except (KeyError, TypeError):
+            print(f'Warning! Ignoring malformed shard result {path.as_posix()}')
+            return None
+
+    def save(self, directory: Path):
+        """
+        Write the result into the destination folder of the shard.
+        :param directory: destination folder of the shard
+        """
+        content = {
+            'version': SHARD_RESULT_VERSION,
+            'shard': self.shard.index,
+            'shardCount': self.shard.count,
+            'configFingerprint': self.config_fingerprint,
+            'fingerprint': self.fingerprint,
+            'files': sorted(self.files),
+            'directories': sorted(self.directories),
+            'feedItems': [asdict(item) for item in self.feed_items],
+            'pages': {key: asdict(record) for key, record in sorted(self.pages.items())}
+            if self.pages is not None else None,
+        }
+        with open(directory / SHARD_RESULT_FILE_NAME, mode='w', encoding='utf-8') as file:
+            json.dump(content, file, indent=2)
+
+
+def load_shard_results(config: Config, directories: list[Path]) -> list[ShardResult]:
+    """
+    Read the results of every shard of a build and check that they can be merged.
+    :param config: site configuration
+    :param directories: destination folders of the shards
+    :return: the result of each shard, in the order of ``directories``
+    """
+    results = []
+    for directory in directories:
+        result = ShardResult.load(directory)
+        if result is None:
+            raise Exception(f'No shard result found in {directory.as_posix()}')
+        results.append(result)
+
+    count = results[0].shard.count
+    if any(result.shard.count != count for result in results):
+        raise Exception('Shard results of builds split into a different number of shards cannot be merged')
+    indexes = sorted(result.shard.index for result in results)
+    if indexes != list(range(1, count + 1)):
+        missing = sorted(set(range(1, count + 1)) - set(indexes))
+        if missing:
+            raise Exception(f'Missing shards: {", ".join(f"{index}/{count}" for index in missing)}')
+        raise Exception('Every shard must be given once')
+
+    fingerprint = config_fingerprint(shard_config(config))
+    for directory, result in zip(directories, results):
+        if result.config_fingerprint != fingerprint:
+            raise Exception(f'Shard {result.shard} in {directory.as_posix()} was built with a different configuration')
+    return results
+
+
+def merge_shards(config: Config, directories: list[Path]) -> OutputRecord:
+    """
+    Merge the shards of a build into the destination folder of the site: copy the outputs of every shard, write the
+    RSS feeds from the feed entries of every shard in the order of the pages in the directory tree, and record the
+    outputs like a build does, deleting the outputs of the previous build which are no longer produced. If every shard
+    was built with ``--incremental``, the build manifest of the site is written too.
+
+    A shard whose destination folder is the destination folder of the site is not copied.
+    :param config: site configuration
+    :param directories: destination folders of the shards, in any order
+    :return: the outputs of the merged site
+    """
+    results = load_shard_results(config, directories)
+    destination = config.destination
+    print(f'Merging {len(results)} shards into {destination.as_posix()}')
+    destination.mkdir(parents=True, exist_ok=True)
+
+    directories_to_create = set().union(*(result.directories for result in results))
+    for directory in sorted(directories_to_create):
+        (destination / directory).mkdir(parents=True, exist_ok=True)
+
+    with AssetSync(asset_sync_mode(config), config.assetLink) as outputs:
+        for directory, result in zip(directories, results):
+            if directory.resolve() == destination.resolve():
+                continue
+            for path in sorted(result.files):
+                outputs.submit(directory / path, destination / path)
+
+    generator = RssFeedGenerator(config.rssFeeds)
+    for feed_item in sorted((item for result in results for item in result.feed_items), key=lambda item: item.order):
+        generator.add_feed_item(FileNode(Path(feed_item.path)), FeedItem.from_dict(feed_item.item))
+    stats = generator.generate_feeds(destination, if_changed=config.outputWrite == 'if-changed')
+    if config.outputWrite == 'if-changed':
+        print(f'Feeds: {stats}')
+
+    current = OutputRecord(
+        files=set().union(*(result.files for result in results)) | {feed.outputLocation.as_posix()
+                                                                      for feed in config.rssFeeds},
+        directories=directories_to_create,
+        fingerprint=_merged_fingerprint(config, results))
+    previous = OutputRecord.load(destination)
+    if previous is not None:
+        for path in prune_outputs(destination, previous, current):
+            print(f'Deleted {path.as_posix()}')
+    current.save(destination)
+
+    if all(result.pages is not None for result in results):
+        manifest = BuildManifest(config_fingerprint=config_fingerprint(config))
+        for result in results:
+            manifest.pages.update(result.pages)
+        manifest.save(destination)
+    return current
+
+
+def _merged_fingerprint(config: Config, results: list[ShardResult]) -> str | None:
+    """
+    :return: the fingerprint of the inputs of the merged site, if every shard was built from the current inputs of the
+    source folder, otherwise None, so ``--check`` reports the site as out of date
+    """
+    fingerprints = {result.fingerprint for result in results}
+    if len(fingerprints) != 1 or None in fingerprints:
+        return None
+    try:
+        if source_fingerprint(shard_config(config)) != fingerprints.pop():
+            return None
+        return source_fingerprint(config)
+    except OSError:
+        # The source folder is not available where the shards are merged.
+        return None
@@ -0,0 +1,144 @@
+"""Rebuild the site whenever the source folder changes."""
+
+import os
+import time
+from pathlib import Path
+
+from ssg.config import read_config
+from ssg.config.path_router import PatternList
+from ssg.engine.engine import Engine, EngineUpdate
+
+# Modification time and size of a file.
+FileStat = tuple[int, int]
+
+
+def snapshot(source: Path, exclude: PatternList, ignore: frozenset[Path] = frozenset()) -> dict[Path, FileStat]:
+    """
+    Record the modification time and size of every file of the source folder which is not excluded.
+    :param source: source folder
+    :param exclude: exclude patterns, matched the same way as by :func:`create_directory_tree`
+    :param ignore: absolute paths of folders which are skipped, e.g. the destination folder if it is inside the source
+    :return: dict mapping the path of each file, relative to the source folder, to its stat
+    """
+    files: dict[Path, FileStat] = {}
+    pending = [(source, '')]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            relative = prefix + entry.name
+            if exclude.matches_name_or_path(entry.name, relative):
+                continue
+            try:
+                if entry.is_dir():
+                    if Path(entry.path).resolve() not in ignore:
+                        pending.append((Path(entry.path), f'{relative}/'))
+                elif entry.is_file():
+                    stat = entry.stat()
+                    files[Path(relative)] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                continue
+    return files
+
+
+def changed_paths(before: dict[Path, FileStat], after: dict[Path, FileStat]) -> set[Path]:
+    """
+    :return: paths of the files which were modified, created or deleted between two snapshots
+    """
+    return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+
+class Watcher:
+    """
+    Build the site, then poll the source folder and rebuild only what is affected by each change.
+
+    The engine, and with it the configuration, the directory tree, the parsed templates and the last-edit times, is
+    kept in memory between rebuilds. A change to the configuration file rebuilds the whole site.
+
+    Usage:
+    watcher = Watcher(config_path)
+    watcher.watch()
+    """
+
+    def __init__(self,
+                 config_path: Path,
+                 incremental: bool = False,
+                 jobs: int = 1,
+                 interval: float = 0.5,
+                 destination: Path | None = None):
+        """
+        :param config_path: path of the config.json file
+        :param incremental: passed to :class:`Engine`, for the builds of the whole site
+        :param jobs: passed to :class:`Engine`, for the builds of the whole site
+        :param interval: seconds between two polls of the source folder
+        :param destination: destination folder replacing the one of the configuration, if given
+        """
+        self.config_path = config_path
+        self.incremental = incremental
+        self.jobs = jobs
+        self.interval = interval
+        self.destination = destination
+        self.engine: Engine | None = None
+        self.config_stat: FileStat | None = None
+        self.files: dict[Path, FileStat] = {}
+
+    def build(self):
+        """
+        Read the configuration and build the whole site.
+        """
+        stat = self.config_path.stat()
+        self.config_stat = (stat.st_mtime_ns, stat.st_size)
+        config = read_config(self.config_path)
+        if self.destination is not None:
+            config.destination = self.destination
+        self.engine = Engine(config, incremental=self.incremental, jobs=self.jobs)
+        self.files = self._snapshot()
+        self.engine.run()
+
+    def poll(self) -> EngineUpdate | None:
+        """
+        Rebuild what changed since the previous poll.
+        :return: what was rebuilt, or None if the whole site was built again because the configuration changed
+        """
+        stat = self.config_path.stat()
+        if (stat.st_mtime_ns, stat.st_size) != self.config_stat:
+            print('Configuration changed, rebuilding the site.')
+            self.build()
+            return None
+
+        files = self._snapshot()
+        paths = changed_paths(self.files, files)
+        self.files = files
+
+        start = time.perf_counter()
+        update = self.engine.update(paths)
+        if not update.is_empty():
+            print(f'Rebuilt {len(update.pages)} pages, {len(update.assets)} assets and {len(update.feeds)} feeds, '
+                  f'deleted {len(update.removed)} files in {(time.perf_counter() - start) * 1000:.0f} ms')
+        return update
+
+    def watch(self):
+        """
+        Build the site, then rebuild it on every change until interrupted. Errors are reported without stopping.
+        """
+        self.build()
+        print(f'Watching {self.engine.config.source.as_posix()} for changes. Press Ctrl+C to stop.')
+        try:
+            while True:
+                time.sleep(self.interval)
+                try:
+                    self.poll()
+                except Exception as e:
+                    print(f'Error while rebuilding the site: {e}')
+        except KeyboardInterrupt:
+            pass
+
+    def _snapshot(self) -> dict[Path, FileStat]:
+        config = self.engine.config
+        source = config.source.resolve()
+        ignore = frozenset(path.resolve() for path in (config.destination, config.cacheDir)
+                           if path is not None and path.resolve().is_relative_to(source))
+        return snapshot(config.source, self.engine.router.exclude, ignore)
@@ -12,7 +12,7 @@ class GitClient:
         # repo.workdir is the absolute path to the repo root (ends with a separator)
         self.repo_root = Path(self.repo.workdir)
 
-    def _to_repo_relative(self, path: Path) -> Path:
+    def to_repo_relative(self, path: Path) -> Path:
         """
         Normalize a path to be relative to the repository working directory.
         Works for both absolute paths and relative paths (resolved against CWD).
@@ -20,7 +20,30 @@ class GitClient:
         resolved = path if path.is_absolute() else path.resolve()
         return resolved.relative_to(self.repo_root)
 
-    def get_last_edit_time_for_files(self, file_paths: set[Path]) -> dict[Path, datetime]:
+    def get_head(self) -> pygit2.Oid | None:
+        """
+        Return the OID of the commit HEAD points to, or None for an empty repository.
+        """
+        try:
+            return self.repo.head.target
+        except pygit2.GitError:
+            return None
+
+    def is_ancestor(self, ancestor: pygit2.Oid, descendant: pygit2.Oid) -> bool:
+        """
+        Check whether a commit is an ancestor of another one. A commit is considered its own ancestor.
+        Unknown commits (e.g. garbage collected after a force-push) are not ancestors of anything.
+        """
+        if ancestor == descendant:
+            return True
+        try:
+            return self.repo.descendant_of(descendant, ancestor)
+        except (pygit2.GitError, KeyError, ValueError):
+            return False
+
+    def get_last_edit_time_for_files(self,
+                                     file_paths: set[Path],
+                                     since: pygit2.Oid | None = None) -> dict[Path, datetime]:
         """
         Return the last-committed timestamp for each of the given file paths.
 
@@ -28,14 +51,21 @@ class GitClient:
         (topological + time sorted). The first commit that touches a file is
         considered its last-edit time. The initial (root) commit is also
         inspected so that files that were added in the root commit and never
-        modified afterwards still receive a timestamp. For merge commits, the
-        diff against the first parent is used.
+        modified afterwards still receive a timestamp. For merge commits, only
+        the first parent is compared, which mirrors the behavior of `git log`
+        without `-m`.
+
+        Commits are not diffed in full. Only the tree entries along the paths
+        that are still being looked up are compared with the parent, and
+        subtrees whose OID did not change are skipped entirely.
 
         Uncommitted files (new, never-committed) are excluded from the walk and
         will not appear in the returned dictionary. If the repository has no
         commits, an empty dictionary is returned.
 
         :param file_paths: set of file paths (absolute or relative to CWD) to look up.
+        :param since: if given, commits reachable from this commit are not walked,
+               so only files edited after it are found.
         :return: dict mapping each found path to its last-committed datetime (UTC).
                Paths that are uncommitted or have no history are not included.
         """
@@ -47,52 +77,39 @@ class GitClient:
         # Map repo-relative path -> original caller path so we can return
         # results keyed by the same paths the caller passed in.
         relative_to_original: dict[Path, Path] = {
-            self._to_repo_relative(p): p for p in file_paths
+            self.to_repo_relative(p): p for p in file_paths
         }
 
         uncommitted_relative = {
-            self._to_repo_relative(p)
+            self.to_repo_relative(p)
             for p in self._identify_uncommitted_files(file_paths)
         }
-        to_find = set(relative_to_original.keys()) - uncommitted_relative
+        to_find = PathTrie(set(relative_to_original.keys()) - uncommitted_relative)
 
         if not to_find:
             return last_edited
 
-        try:
-            head_target = self.repo.head.target
-        except pygit2.GitError:
+        head_target = self.get_head()
+        if head_target is None:
             # Unborn HEAD / empty repository: nothing to walk.
             return last_edited
 
         walker = self.repo.walk(head_target, SortMode.TOPOLOGICAL | SortMode.TIME)
+        if since is not None:
+            walker.hide(since)
 
         for commit in walker:
-            if not to_find:
-                break
-
-            if commit.parents:
-                # For merge commits we only diff against the first parent, which
-                # mirrors the behavior of `git log` without `-m`.
-                parent = commit.parents[0]
-                diff = self.repo.diff(parent, commit)
-            else:
-                # Root commit: diff the tree against an empty tree so that files
-                # introduced in the initial commit are also picked up.
-                diff = commit.tree.diff_to_tree(swap=True)
-
+            # Root commit: compare against an empty tree so that files
+            # introduced in the initial commit are also picked up.
+            parent_tree = commit.parents[0].tree if commit.parents else None
             commit_time = datetime.fromtimestamp(commit.commit_time, UTC)
 
-            for patch in diff:
-                delta = patch.delta
-                new_path = delta.new_file.path
-                if not isinstance(new_path, str) or not new_path:
-                    continue
-                file_path = Path(new_path)
-                if file_path in to_find:
-                    original_path = relative_to_original[file_path]
-                    last_edited[original_path] = commit_time
-                    to_find.remove(file_path)
+            for file_path in to_find.changed_paths(parent_tree, commit.tree):
+                last_edited[relative_to_original[file_path]] = commit_time
+                to_find.remove(file_path)
+
+            if not to_find:
+                break
 
         return last_edited
 
@@ -124,9 +141,92 @@ class GitClient:
 
         for file_path in file_paths:
             # Normalize to repo-relative so it matches pygit2 status() keys
-            repo_relative_str = self._to_repo_relative(file_path).as_posix()
+            repo_relative_str = self.to_repo_relative(file_path).as_posix()
             if status.get(repo_relative_str, 0) & uncommitted_mask:
                 uncommitted_files.add(file_path)
 
         return uncommitted_files
 
+
+
+class PathTrie:
+    """
+    Set of repo-relative file paths stored as a tree of path components, so it can be matched against git trees
+    one directory level at a time.
+    """
+
+    def __init__(self, paths: set[Path]):
+        # Directories map to a nested dict, files map to None.
+        self.root: dict[str, dict | None] = {}
+        for path in paths:
+            self.add(path)
+
+    def __bool__(self):
+        return bool(self.root)
+
+    def add(self, path: Path):
+        node = self.root
+        *directories, file_name = path.parts
+        for directory in directories:
+            node = node.setdefault(directory, {})
+        node[file_name] = None
+
+    def remove(self, path: Path):
+        """
+        Remove a path, along with the directories left empty by its removal.
+        """
+        nodes = [self.root]
+        *directories, file_name = path.parts
+        for directory in directories:
+            nodes.append(nodes[-1][directory])
+        del nodes[-1][file_name]
+        # Prune the directories left empty, deepest first.
+        for depth in range(len(directories), 0, -1):
+            if nodes[depth]:
+                break
+            del nodes[depth - 1][directories[depth - 1]]
+
+    def changed_paths(self, old_tree: pygit2.Tree | None, new_tree: pygit2.Tree | None) -> list[Path]:
+        """
+        Return the paths from the trie which differ between two trees. A path differs if it was added, removed, or its
+        content or file mode changed, which are the files a full tree diff would report.
+        :param old_tree: tree of the parent commit, None for an empty tree
+        :param new_tree: tree of the commit
+        :return: list of changed paths
+        """
+        changed: list[Path] = []
+        self._collect_changed(self.root, old_tree, new_tree, (), changed)
+        return changed
+
+    @staticmethod
+    def _collect_changed(node: dict[str, dict | None],
+                         old_tree: pygit2.Tree | None,
+                         new_tree: pygit2.Tree | None,
+                         prefix: tuple[str, ...],
+                         changed: list[Path]):
+        for name, children in node.items():
+            old_entry = _tree_entry(old_tree, name)
+            new_entry = _tree_entry(new_tree, name)
+            if old_entry is None and new_entry is None:
+                continue
+            if (old_entry is not None and new_entry is not None
+                    and old_entry.id == new_entry.id and old_entry.filemode == new_entry.filemode):
+                # Identical entries: nothing below this point changed.
+                continue
+
+            if children is None:
+                # A diff reports the file only if it is a blob on at least one side.
+                if any(entry is not None and not isinstance(entry, pygit2.Tree) for entry in (old_entry, new_entry)):
+                    changed.append(Path(*prefix, name))
+            else:
+                PathTrie._collect_changed(children,
+                                          old_entry if isinstance(old_entry, pygit2.Tree) else None,
+                                          new_entry if isinstance(new_entry, pygit2.Tree) else None,
+                                          prefix + (name,),
+                                          changed)
+
+
+def _tree_entry(tree: pygit2.Tree | None, name: str) -> pygit2.Object | None:
+    if tree is None or name not in tree:
+        return None
+    return tree[name]
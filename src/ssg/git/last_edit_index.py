@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import pygit2
+
+from ssg.git.git import GitClient
+
+INDEX_FILE_NAME = 'last-edit-index.json'
+
+
+class LastEditIndex:
+    """
+    Last-edit times of files, persisted in the cache directory along with the HEAD commit they were computed at.
+
+    Entries are keyed by repo-relative POSIX paths. A ``None`` entry records a file which was looked up but has no
+    history, so it does not trigger a full history walk on every build.
+    """
+
+    def __init__(self, head: str | None = None, entries: dict[str, str | None] | None = None):
+        self.head = head
+        self.entries: dict[str, str | None] = entries if entries is not None else {}
+
+    @staticmethod
+    def load(cache_dir: Path) -> LastEditIndex | None:
+        """
+        Read the index from the cache directory.
+        :param cache_dir: cache directory
+        :return: the index or None if it is missing or unreadable
+        """
+        try:
+            with open(cache_dir / INDEX_FILE_NAME, 'r', encoding='utf-8') as file:
+                content = json.load(file)
+            return LastEditIndex(head=content['head'], entries=content['entries'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, cache_dir: Path):
+        """
+        Write the index into the cache directory, creating the directory if needed. The index is written to a
+        temporary file which then replaces the previous index, so an interrupted build or builds sharing the cache
+        directory never leave a truncated index behind.
+        :param cache_dir: cache directory
+        """
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', dir=cache_dir, prefix=f'.{INDEX_FILE_NAME}.',
+                                         delete=False) as file:
+            json.dump({'head': self.head, 'entries': dict(sorted(self.entries.items()))}, file, indent=2)
+        os.replace(file.name, cache_dir / INDEX_FILE_NAME)
+
+
+def get_last_edit_time_for_files_cached(git_client: GitClient,
+                                        file_paths: set[Path],
+                                        cache_dir: Path,
+                                        prune: bool = True) -> dict[Path, datetime]:
+    """
+    Same as :meth:`GitClient.get_last_edit_time_for_files`, but backed by a :class:`LastEditIndex` stored in
+    ``cache_dir``.
+
+    When the HEAD the index was computed at is an ancestor of the current HEAD, only the commits between the two are
+    walked. Files not present in the index are looked up with a full walk, restricted to those files. If the cached
+    HEAD is no longer an ancestor (e.g. after a force-push), the index is discarded and rebuilt with a full walk.
+
+    :param git_client: client of the repository containing the files
+    :param file_paths: set of file paths (absolute or relative to CWD) to look up.
+    :param cache_dir: directory where the index is stored
+    :param prune: if True, ``file_paths`` are every file of the site and the entries of other files are dropped from
+    the index. Otherwise, e.g. for the pages of a shard, the other entries are kept and brought up to date along with
+    the requested files, so the next lookup of these files does not need a full walk.
+    :return: dict mapping each found path to its last-committed datetime (UTC).
+    """
+    head = git_client.get_head()
+    if head is None:
+        return git_client.get_last_edit_time_for_files(file_paths)
+
+    index = LastEditIndex.load(cache_dir)
+    cached_head = pygit2.Oid(hex=index.head) if index is not None and index.head else None
+    if cached_head is None or not git_client.is_ancestor(cached_head, head):
+        if index is not None:
+            print('Cached last-edit index is not an ancestor of HEAD, walking the full git history.')
+        index = LastEditIndex()
+        cached_head = None
+
+    keys = {path: git_client.to_repo_relative(path).as_posix() for path in file_paths}
+    if prune:
+        # Only keep the files of the current build, so the index does not grow with deleted files.
+        index.entries = {key: value for key, value in index.entries.items() if key in keys.values()}
+    indexed = {git_client.repo_root / key: key for key in index.entries} | keys
+
+    found: dict[Path, datetime] = {}
+    if cached_head is not None and cached_head != head:
+        found = git_client.get_last_edit_time_for_files(set(indexed), since=cached_head)
+
+    missing = {path for path in file_paths if path not in found and keys[path] not in index.entries}
+    if missing:
+        found.update(git_client.get_last_edit_time_for_files(missing))
+    for path in missing:
+        index.entries[keys[path]] = None
+
+    for path, edit_time in found.items():
+        index.entries[indexed[path]] = edit_time.isoformat()
+
+    index.head = str(head)
+    index.save(cache_dir)
+
+    return {path: datetime.fromisoformat(index.entries[key]) for path, key in keys.items()
+            if index.entries[key] is not None}
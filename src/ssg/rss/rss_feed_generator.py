@@ -1,15 +1,16 @@
-import fnmatch
-import mimetypes
+import heapq
+import itertools
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
 
-from feedgen.feed import FeedGenerator
-
 from ssg.config import RssFeed
+from ssg.config.path_router import PatternList
 from ssg.content.article import Article
 from ssg.dirtree.file_node import FileNode
+from ssg.engine.output_writer import WriteStats
+from ssg.rss.rss_writer import write_rss_feed
 
 
 @dataclass
@@ -25,6 +26,70 @@ class FeedItem:
     author_name: str | None
     author_email: str | None
 
+    @staticmethod
+    def from_article(article: Article) -> 'FeedItem':
+        """Build the feed entry describing the given article."""
+        return FeedItem(
+            title=article.title,
+            description=article.description if article.description is not None else article.title,
+            link=article.url,
+            guid=article.url,
+            cover_image=article.cover_image,
+            pubDate=article.last_edited,
+            author_name=article.author.name,
+            author_email=article.author.email,
+        )
+
+    def to_dict(self) -> dict:
+        """Convert the entry into a JSON serializable dictionary."""
+        content = asdict(self)
+        content['pubDate'] = self.pubDate.isoformat() if self.pubDate is not None else None
+        return content
+
+    @staticmethod
+    def from_dict(content: dict) -> 'FeedItem':
+        """Restore an entry previously converted with :meth:`to_dict`."""
+        pub_date = content.get('pubDate')
+        return FeedItem(**{**content, 'pubDate': datetime.fromisoformat(pub_date) if pub_date else None})
+
+
+class LatestFeedItems:
+    """
+    The ``limit`` most recent entries of a feed, kept in a min-heap ordered by pubDate, so adding an entry takes
+    O(log limit) time and the entries pushed out of the feed are not kept in memory. Entries without a pubDate are
+    never written to a feed and are dropped.
+    """
+
+    def __init__(self, limit: int):
+        """
+        :param limit: maximum number of entries kept
+        """
+        self.limit = limit
+        # Entries are (pubDate, -sequence, item): among entries published at the same time, the one added first is
+        # kept, the same as when sorting every entry.
+        self._heap: list[tuple[datetime, int, FeedItem]] = []
+        self._sequence = itertools.count()
+
+    def append(self, feed_item: FeedItem):
+        """Add an entry, pushing out the oldest one if the limit is reached."""
+        if feed_item.pubDate is None or self.limit <= 0:
+            return
+        entry = (feed_item.pubDate, -next(self._sequence), feed_item)
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def newest_first(self) -> list[FeedItem]:
+        """:return: the kept entries, the most recent first"""
+        return [item for _, _, item in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        return (item for _, _, item in self._heap)
+
 
 class RssFeedGenerator:
     """Collects articles and generates RSS feeds based on configured matchers."""
@@ -35,55 +100,50 @@ class RssFeedGenerator:
 
         for config in rss_feed_configs:
             self.rss_feed_configs[config.title] = config
+        self.matchers = PatternList(config.matcher for config in self.rss_feed_configs.values())
+        self.feed_ids = list(self.rss_feed_configs)
 
-        self.feeds: dict[str, list[FeedItem]] = defaultdict(list)
+        # Feeds without a limit keep every entry, feeds with a limit only the most recent ones.
+        self.feeds: dict[str, list[FeedItem] | LatestFeedItems] = defaultdict(list)
+        for feed_id, config in self.rss_feed_configs.items():
+            if config.limit is not None:
+                self.feeds[feed_id] = LatestFeedItems(config.limit)
 
     def add_to_feed(self, file: FileNode, article: Article):
         """Append the article to every feed whose matcher matches the file path."""
+        self.add_feed_item(file, FeedItem.from_article(article))
+
+    def add_feed_item(self, file: FileNode, feed_item: FeedItem):
+        """Append an already built feed entry to every feed whose matcher matches the file path."""
+        for index in self.matchers.all_matches(file.path.as_posix()):
+            self.feeds[self.feed_ids[index]].append(feed_item)
+
+    def generate_feeds(self,
+                       destination_base_path: Path,
+                       feed_ids: set[str] | None = None,
+                       if_changed: bool = False) -> WriteStats:
+        """
+        Write each configured RSS feed (sorted by pubDate, respecting limit) to disk under the given base path.
+        If ``feed_ids`` is given, only the feeds with these titles are written. With ``if_changed``, feeds whose
+        entries did not change are left untouched.
+        :return: number of feeds written and left untouched
+        """
+        stats = WriteStats()
         for feed_id, rss_feed_config in self.rss_feed_configs.items():
-            if fnmatch.fnmatch(file.path.as_posix(), rss_feed_config.matcher):
-                feed = self.feeds[feed_id]
-                feed.append(FeedItem(
-                    title=article.title,
-                    description=article.description if article.description is not None else article.title,
-                    link=article.url,
-                    guid=article.url,
-                    cover_image=article.cover_image,
-                    pubDate=article.last_edited,
-                    author_name=article.author.name,
-                    author_email=article.author.email,
-                ))
-                self.feeds[feed_id] = feed
-
-    def generate_feeds(self, destination_base_path: Path):
-        """Write each configured RSS feed (sorted by pubDate, respecting limit) to disk under the given base path."""
-        for feed_id, rss_feed_config in self.rss_feed_configs.items():
-            feed_generator = FeedGenerator()
-            feed_generator.title(rss_feed_config.title)
-            feed_generator.description(rss_feed_config.description)
-            feed_generator.link(href=rss_feed_config.link, rel="alternate")
-            feed_generator.link(href=rss_feed_config.feed_url, rel="self")
-            feed_generator.language(rss_feed_config.language)
-
-            feed = [f for f in self.feeds[feed_id] if f.pubDate is not None]
-            feed.sort(key=lambda x: x.pubDate, reverse=True)
-
-            limit = rss_feed_config.limit if rss_feed_config.limit is not None else len(feed)
-
-            for feed_item in feed[:limit]:
-                entry = feed_generator.add_entry(order='append')
-                entry.title(feed_item.title)
-                entry.description(feed_item.description)
-                entry.link({'href': feed_item.link})
-                entry.guid(feed_item.guid, permalink=True)
-                entry.pubDate(feed_item.pubDate)
-                entry.author({'name': feed_item.author_name, 'email': feed_item.author_email})
-
-                if feed_item.cover_image is not None:
-                    mime, _ = mimetypes.guess_type(feed_item.cover_image)
-                    entry.enclosure(url=feed_item.cover_image, length=0, type=mime)
-            rss_content = feed_generator.rss_str(pretty=True)
-
-            destination_path = destination_base_path / rss_feed_config.outputLocation
-            with open(destination_path, mode='wb') as destination_file:
-                destination_file.write(rss_content)
+            if feed_ids is not None and feed_id not in feed_ids:
+                continue
+            stats.add(write_rss_feed(destination_base_path / rss_feed_config.outputLocation, rss_feed_config,
+                                     self.get_feed_items(feed_id), if_changed=if_changed))
+        return stats
+
+    def get_feed_items(self, feed_id: str) -> list[FeedItem]:
+        """
+        :param feed_id: title of the feed
+        :return: the entries written to the feed: entries with a pubDate, the most recent first, up to the limit
+        """
+        feed = self.feeds[feed_id]
+        if isinstance(feed, LatestFeedItems):
+            return feed.newest_first()
+        # sorted is stable, so entries published at the same time keep the order they were added in.
+        return sorted((item for item in feed if item.pubDate is not None), key=lambda item: item.pubDate,
+                      reverse=True)
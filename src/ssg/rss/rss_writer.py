@@ -0,0 +1,102 @@
+"""Streaming writer of RSS 2.0 documents, writing each entry to the file as soon as it is formatted."""
+
+from __future__ import annotations
+
+import io
+import mimetypes
+import re
+from datetime import UTC, datetime
+from email.utils import format_datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, TextIO
+from xml.sax.saxutils import escape, quoteattr
+
+from ssg.config import RssFeed
+
+if TYPE_CHECKING:
+    from ssg.rss.rss_feed_generator import FeedItem
+
+ATOM_NAMESPACE = 'http://www.w3.org/2005/Atom'
+CONTENT_NAMESPACE = 'http://purl.org/rss/1.0/modules/content/'
+RSS_DOCS = 'http://www.rssboard.org/rss-specification'
+# Kept from feedgen, which used to write the feeds, so the feeds do not change.
+GENERATOR = 'python-feedgen'
+
+_LAST_BUILD_DATE_RE = re.compile(rb'<lastBuildDate>[^<]*</lastBuildDate>')
+
+
+def write_rss_feed(path: Path,
+                   config: RssFeed,
+                   items: Iterable[FeedItem],
+                   build_date: datetime | None = None,
+                   if_changed: bool = False) -> bool:
+    """
+    Write an RSS feed. The document has the same layout as the one feedgen generated, but it is never held in
+    memory as a whole: the channel header is written first, then each item as it is taken from ``items``.
+    :param path: path of the XML file
+    :param config: settings of the feed
+    :param items: entries of the feed, in the order they appear in the feed
+    :param build_date: value of ``lastBuildDate``, defaults to now
+    :param if_changed: build the document in memory and leave the file untouched if it only differs from the existing
+    one by its ``lastBuildDate``, which then remains the time the feed last changed
+    :return: True if the file was written
+    """
+    if build_date is None:
+        build_date = datetime.now(UTC)
+    if not if_changed:
+        with open(path, mode='w', encoding='utf-8', newline='\n') as file:
+            _write_feed(file, config, items, build_date)
+        return True
+
+    buffer = io.StringIO(newline='\n')
+    _write_feed(buffer, config, items, build_date)
+    content = buffer.getvalue().encode('utf-8')
+    try:
+        if _LAST_BUILD_DATE_RE.sub(b'', path.read_bytes()) == _LAST_BUILD_DATE_RE.sub(b'', content):
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(content)
+    return True
+
+
+def _write_feed(file: TextIO, config: RssFeed, items: Iterable[FeedItem], build_date: datetime):
+    file.write("<?xml version='1.0' encoding='UTF-8'?>\n")
+    file.write(f'<rss xmlns:atom={quoteattr(ATOM_NAMESPACE)} xmlns:content={quoteattr(CONTENT_NAMESPACE)} '
+               f'version="2.0">\n')
+    file.write('  <channel>\n')
+    _write_element(file, 4, 'title', config.title)
+    # Like feedgen, the self link is also used as the link of the channel.
+    _write_element(file, 4, 'link', config.feed_url)
+    _write_element(file, 4, 'description', config.description)
+    file.write(f'    <atom:link href={quoteattr(config.feed_url)} rel="self"/>\n')
+    _write_element(file, 4, 'docs', RSS_DOCS)
+    _write_element(file, 4, 'generator', GENERATOR)
+    _write_element(file, 4, 'language', config.language)
+    _write_element(file, 4, 'lastBuildDate', format_datetime(build_date))
+    for item in items:
+        _write_item(file, item)
+    file.write('  </channel>\n')
+    file.write('</rss>\n')
+
+
+def _write_item(file: TextIO, item: FeedItem):
+    file.write('    <item>\n')
+    _write_element(file, 6, 'title', item.title)
+    _write_element(file, 6, 'link', item.link)
+    _write_element(file, 6, 'description', item.description)
+    if item.author_email:
+        author = f'{item.author_email} ({item.author_name})' if item.author_name else item.author_email
+        _write_element(file, 6, 'author', author)
+    file.write(f'      <guid isPermaLink="true">{escape(item.guid)}</guid>\n')
+    if item.cover_image is not None:
+        mime, _ = mimetypes.guess_type(item.cover_image)
+        file.write(f'      <enclosure url={quoteattr(item.cover_image)} length="0" '
+                   f'type={quoteattr(mime or "application/octet-stream")}/>\n')
+    _write_element(file, 6, 'pubDate', format_datetime(item.pubDate))
+    file.write('    </item>\n')
+
+
+def _write_element(file: TextIO, indent: int, tag: str, text: str | None):
+    if text:
+        file.write(f'{" " * indent}<{tag}>{escape(text)}</{tag}>\n')
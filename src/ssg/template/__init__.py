@@ -1 +1,6 @@
-from .template import *
\ No newline at end of file
+import importlib
+
+
+def __getattr__(name):
+    # The template module imports BeautifulSoup, which is only needed once a page is rendered.
+    return getattr(importlib.import_module(f'{__name__}.template'), name)
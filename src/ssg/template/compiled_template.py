@@ -0,0 +1,87 @@
+import copy
+import re
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+from ssg.content.article import Article
+from ssg.template.html_file import HTMLFile, compose_page_title, og_meta_attributes
+from ssg.template.template import Template
+
+# Placeholders are made of private use characters, so they are never escaped by BeautifulSoup and cannot clash with
+# the content of a frame.
+_TITLE = '\ue000ssg-title\ue000'
+_CONTENT = '\ue000ssg-content\ue000'
+_META = '\ue000ssg-meta\ue000'
+_PLACEHOLDER_RE = re.compile(f'({_TITLE}|{_CONTENT}|{_META})')
+
+# Only used for creating the og:meta tags, so they are serialized the same way as in HTMLFile.
+_META_SOUP = BeautifulSoup('', 'lxml')
+
+
+class CompiledTemplate:
+    """
+    A template split into static segments around the places where the content of a page is inserted: the titles,
+    the end of the head (for the og:meta tags) and the content element.
+
+    The frame is parsed and processed once, and pages are produced by splicing the rendered content between the
+    segments. Once written, the result is the same as the document :meth:`HTMLFile.from_article` produces, without
+    copying the frame for every page.
+    """
+
+    def __init__(self, template: Template, base_href: str, content_element_id="main-content"):
+        """
+        :param template: template to be compiled, with its base path already set
+        :param base_href: base href of the site
+        :param content_element_id: ID of HTML element where the content is embedded
+        """
+        self.base_href = base_href
+
+        soup = copy.deepcopy(template.soup)
+        article = soup.find('article', id=content_element_id)
+        if isinstance(article, Tag):
+            article.clear()
+
+        # Links and headings of the frame are processed the same way as the ones of the content are processed during
+        # the Markdown conversion.
+        html_file = HTMLFile(soup)
+        html_file.add_target_blank_to_external_urls(base_href)
+        html_file.add_anchor_links()
+
+        if isinstance(article, Tag):
+            article.append(_CONTENT)
+        for title in soup.find_all('title'):
+            title.string = _TITLE
+        head = soup.find('head')
+        self.has_head = isinstance(head, Tag)
+        if self.has_head:
+            head.append(_META)
+
+        # Static segments are at even indices, placeholders at odd indices.
+        self.segments: list[str] = _PLACEHOLDER_RE.split(str(soup))
+
+    def render(self, article: Article, hostname: str | None = None, content: str | None = None) -> str:
+        """
+        Render an article into an HTML document.
+        :param article: article to be rendered
+        :param hostname: hostname appended to the page title
+        :param content: HTML content of the article, converted from its Markdown if not given
+        :return: HTML document as a string
+        """
+        if not self.has_head:
+            print(f'Warning! Could not find head tag in HTML document. Skipping adding og:meta fields.')
+        meta = ''.join(str(_META_SOUP.new_tag('meta', attrs=attrs))
+                       for attrs in og_meta_attributes(title=article.title,
+                                                       description=article.description,
+                                                       url=article.url,
+                                                       cover_image=article.cover_image,
+                                                       twitter_handle=article.author.twitter_handle,
+                                                       base_href=self.base_href,
+                                                       last_edited_time=article.last_edited))
+
+        values = {
+            _TITLE: NavigableString(compose_page_title(article.title, hostname)).output_ready(),
+            _CONTENT: content if content is not None else article.markdown.convert_to_html(self.base_href),
+            _META: meta,
+        }
+        return ''.join(values[segment] if i % 2 else segment for i, segment in enumerate(self.segments))
+
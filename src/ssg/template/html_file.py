@@ -1,3 +1,4 @@
+import io
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -7,19 +8,26 @@ from bs4 import BeautifulSoup, Tag
 from lxml import html, etree
 from slugify import slugify
 
+from ssg.config import HtmlOutputFormat
 from ssg.content.article import Article
+from ssg.engine.output_writer import write_if_changed
 from ssg.template.template import Template
 
 
 class HTMLFile:
     @staticmethod
     def from_article(article: Article, template: Template, base_href: str, hostname: str = None) -> 'HTMLFile':
-        soup = BeautifulSoup(article.markdown.convert_to_html(), 'lxml')
-        html_file = HTMLFile(template.embed_content(soup))
-        html_file.set_page_title(article.title, hostname=hostname)
+        # Links and headings of the content are already processed during the Markdown conversion, only the ones of
+        # the frame are processed here.
+        html_file = HTMLFile(template.embed_content(BeautifulSoup('', 'lxml')))
         html_file.add_target_blank_to_external_urls(base_href)
         html_file.add_anchor_links()
 
+        content = html_file.soup.find('article', id='main-content')
+        if isinstance(content, Tag):
+            content.append(BeautifulSoup(article.markdown.convert_to_html(base_href), 'lxml'))
+
+        html_file.set_page_title(article.title, hostname=hostname)
         html_file.insert_og_meta(title=article.title,
                                  description=article.description,
                                  url=article.url,
@@ -84,71 +92,14 @@ class HTMLFile:
             print(f'Warning! Could not find head tag in HTML document. Skipping adding og:meta fields.')
             return
 
-        if title is not None:
-            head.append(self.soup.new_tag('meta', attrs={
-                'property': 'og:title',
-                'content': title
-            }))
-
-        if description is not None:
-            head.append(self.soup.new_tag('meta', attrs={
-                'property': 'og:description',
-                'content': description
-            }))
-
-        if url is not None:
-            head.append(self.soup.new_tag('meta', attrs={
-                'property': 'og:url',
-                'content': url
-            }))
-
-        if cover_image is not None:
-            head.append(self.soup.new_tag('meta', attrs={
-                'property': 'og:image',
-                'content': urljoin(base_href, cover_image)
-            }))
-
-        # Twitter specific meta tags
-        if title is not None:
-            head.append(self.soup.new_tag('meta', attrs={
-                'property': 'twitter:title',
-                'content': title
-            }))
-
-        if description is not None:
-            head.append(self.soup.new_tag('meta', attrs={
-                'property': 'twitter:description',
-                'content': description
-            }))
-
-        if twitter_handle is not None:
-            head.append(self.soup.new_tag('meta', attrs={
-                'property': 'twitter:site',
-                'content': twitter_handle
-            }))
-
-            head.append(self.soup.new_tag('meta', attrs={
-                'property': 'twitter:creator',
-                'content': twitter_handle
-            }))
-
-        if cover_image is not None:
-            head.append(self.soup.new_tag('meta', attrs={
-                'property': 'twitter:image',
-                'content': urljoin(base_href, cover_image)
-            }))
-
-        twitter_meta_card = self.soup.new_tag('meta', attrs={
-            'property': 'twitter:card',
-            'content': 'summary_large_image'
-        })
-        head.append(twitter_meta_card)
-
-        if last_edited_time:
-            head.append(self.soup.new_tag('meta', attrs={
-                'name': 'last-updated',
-                'content': last_edited_time.strftime('%Y-%m-%d %H:%M:%S %Z')
-            }))
+        for attrs in og_meta_attributes(title=title,
+                                        description=description,
+                                        url=url,
+                                        cover_image=cover_image,
+                                        twitter_handle=twitter_handle,
+                                        base_href=base_href,
+                                        last_edited_time=last_edited_time):
+            head.append(self.soup.new_tag('meta', attrs=attrs))
 
     def set_page_title(self, title, hostname=None):
         """
@@ -156,23 +107,107 @@ class HTMLFile:
         :param title: HTML title
         :param hostname: hostname
         """
-        composed_title = title
-        if hostname is not None:
-            composed_title = f'{title} - {hostname}'
+        composed_title = compose_page_title(title, hostname)
         for titleElement in self.soup.find_all('title'):
             titleElement.string = composed_title
 
-    def write(self, destination_path: Path):
+    def write(self, destination_path: Path, output_format: HtmlOutputFormat = 'pretty'):
         """
         Write the HTML page to a file.
         :param destination_path: destination path where to write the HTML page
+        :param output_format: one of ``pretty``, ``compact`` or ``as-is``, see :func:`write_html`
         """
-        with open(destination_path, mode='w', newline='\n', encoding='utf-8') as destination_file:
-            # Parse the HTML string
-            tree = html.fromstring(str(self.soup))
+        write_html(str(self.soup), destination_path, output_format)
+
+def compose_page_title(title, hostname=None):
+    """
+    Compose the content of the HTML title of a page.
+    :param title: title of the page
+    :param hostname: hostname appended to the title, if given
+    """
+    if hostname is not None:
+        return f'{title} - {hostname}'
+    return title
 
-            # Convert to a pretty-printed string
-            formatted_html = etree.tostring(tree, pretty_print=True, method="html", encoding="unicode")  # type: ignore[arg-type]
 
-            # Output the formatted HTML
-            destination_file.write(formatted_html)
+def og_meta_attributes(title: str|None,
+                       description: str|None,
+                       url: str|None,
+                       cover_image: str|None,
+                       twitter_handle: str | None,
+                       base_href: str,
+                       last_edited_time: Optional[datetime]) -> list[dict[str, str]]:
+    """
+    Compute the attributes of the og:meta tags of a page, in the order they are added to its header.
+    """
+    meta = []
+    if title is not None:
+        meta.append({'property': 'og:title', 'content': title})
+
+    if description is not None:
+        meta.append({'property': 'og:description', 'content': description})
+
+    if url is not None:
+        meta.append({'property': 'og:url', 'content': url})
+
+    if cover_image is not None:
+        meta.append({'property': 'og:image', 'content': urljoin(base_href, cover_image)})
+
+    # Twitter specific meta tags
+    if title is not None:
+        meta.append({'property': 'twitter:title', 'content': title})
+
+    if description is not None:
+        meta.append({'property': 'twitter:description', 'content': description})
+
+    if twitter_handle is not None:
+        meta.append({'property': 'twitter:site', 'content': twitter_handle})
+        meta.append({'property': 'twitter:creator', 'content': twitter_handle})
+
+    if cover_image is not None:
+        meta.append({'property': 'twitter:image', 'content': urljoin(base_href, cover_image)})
+
+    meta.append({'property': 'twitter:card', 'content': 'summary_large_image'})
+
+    if last_edited_time:
+        meta.append({'name': 'last-updated', 'content': last_edited_time.strftime('%Y-%m-%d %H:%M:%S %Z')})
+
+    return meta
+
+
+def write_html(content: str,
+               destination_path: Path,
+               output_format: HtmlOutputFormat = 'pretty',
+               if_changed: bool = False) -> bool:
+    """
+    Write an HTML document to a file.
+
+    The document is serialized once, straight into the file:
+    - ``pretty``: the document is parsed with lxml and pretty-printed,
+    - ``compact``: the document is parsed with lxml and written without added whitespace,
+    - ``as-is``: the document is written exactly as it was given, without parsing it.
+
+    :param content: HTML document
+    :param destination_path: destination path where to write the HTML page
+    :param output_format: one of ``pretty``, ``compact`` or ``as-is``
+    :param if_changed: serialize the document in memory and leave the file untouched if it already holds the same
+    bytes
+    :return: True if the file was written
+    """
+    if output_format == 'as-is':
+        if if_changed:
+            return write_if_changed(destination_path, content.encode('utf-8'))
+        with open(destination_path, mode='w', newline='\n', encoding='utf-8') as destination_file:
+            destination_file.write(content)
+        return True
+
+    tree = html.fromstring(content)
+    if if_changed:
+        buffer = io.BytesIO()
+        with etree.htmlfile(buffer, encoding='utf-8') as destination_file:
+            destination_file.write(tree, pretty_print=output_format == 'pretty')
+        return write_if_changed(destination_path, buffer.getvalue())
+
+    with etree.htmlfile(str(destination_path), encoding='utf-8') as destination_file:
+        destination_file.write(tree, pretty_print=output_format == 'pretty')
+    return True
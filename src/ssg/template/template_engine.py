@@ -1,29 +1,78 @@
 """Template selection and HTML rendering for generated site content."""
 
-import fnmatch
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from ssg.config import Config
+from ssg.config.path_router import PathRouter
 from ssg.content.article import Article
+from ssg.content.highlight import HIGHLIGHT_CACHE_DIR_NAME, CodeHighlighter
+from ssg.content.html_cache import HTML_CACHE_DIR_NAME, HtmlCache
 from ssg.dirtree.file_node import FileNode
-from ssg.template import Template
-from ssg.template.html_file import HTMLFile
+from ssg.engine.output_writer import OutputWriter, WriteStats
+from ssg.engine.profiler import BuildProfiler
+
+if TYPE_CHECKING:
+    from ssg.template import Template
+    from ssg.template.compiled_template import CompiledTemplate
 
 
 class TemplateEngine:
     """
     Resolve frames for source files and reuse parsed templates while rendering articles.
+
+    BeautifulSoup and lxml are imported when the first template is loaded, so builds rendering no page do not import
+    them.
     """
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, router: PathRouter | None = None, profiler: BuildProfiler | None = None):
         """
         Create a template engine bound to the site configuration.
         :param config: Site configuration containing frame mappings and output settings.
+        :param router: Compiled patterns of the configuration. Created from ``config`` if not given.
+        :param profiler: Records the time spent converting, embedding and writing each page, if given.
         """
         self.cache = {}
+        self.compiled_cache = {}
         self.config = config
+        self.router = router if router is not None else PathRouter(config)
+        self.profiler = profiler if profiler is not None else BuildProfiler(enabled=False)
+        # Pages written and pages left untouched, with the ``if-changed`` output write mode.
+        self.write_stats = WriteStats()
+        # Converted Markdown, kept in the cache directory if there is one.
+        self.html_cache = HtmlCache(config.cacheDir / HTML_CACHE_DIR_NAME, config.htmlCacheSize * 1024 * 1024) \
+            if config.cacheDir is not None and config.htmlCacheSize > 0 else None
+        # Highlighted code blocks, kept in the cache directory along with the converted Markdown.
+        self.highlighter = CodeHighlighter(
+            config.syntaxHighlight,
+            HtmlCache(config.cacheDir / HIGHLIGHT_CACHE_DIR_NAME, config.htmlCacheSize * 1024 * 1024)
+            if config.cacheDir is not None and config.htmlCacheSize > 0 else None) \
+            if config.syntaxHighlight is not None else None
+
+    def get_frame(self, file: FileNode) -> Path:
+        """
+        Return the path of the frame (relative to the source folder) that matches the given file path.
+
+        :param file: Source file whose path is matched against configured frame patterns.
+        :return: Path of the first matching frame.
+        :raises AssertionError: If no configured frame matches the file path.
+        """
+        frame = self.router.get_frame(file.path)
+        if frame is not None:
+            return frame
+
+        raise AssertionError(f'No frame found for {file.path.as_posix()}')
 
-    def get_template(self, file: FileNode) -> Template:
+    def invalidate(self, frame: Path):
+        """
+        Drop the cached templates of a frame, so the frame is read again the next time it is used.
+
+        :param frame: Path of the frame, relative to the source folder.
+        """
+        self.cache.pop(frame, None)
+        self.compiled_cache.pop(frame, None)
+
+    def get_template(self, file: FileNode) -> 'Template':
         """
         Return the template that matches the given file path.
 
@@ -34,34 +83,58 @@ class TemplateEngine:
         :return: Parsed template for the matching frame.
         :raises AssertionError: If no configured frame matches the file path.
         """
-        template_path = None
-        for f in self.config.frames:
-            if fnmatch.fnmatch(file.path.as_posix(), f.file):
-                template_path = f.frame
-                break
-
-        if not template_path:
-            raise AssertionError(f'No frame found for {file.path.as_posix()}')
-
+        template_path = self.get_frame(file)
         if template_path in self.cache:
             return self.cache[template_path]
 
+        from ssg.template import Template
         template = Template.read_from_file(self.config.source / template_path)
         template.set_base_path(self.config.baseHref)
         self.cache[template_path] = template
         return self.cache[template_path]
 
-    def render(self, file: FileNode, article: Article, destination_path: Path):
+    def get_compiled_template(self, file: FileNode) -> 'CompiledTemplate':
+        """
+        Return the compiled form of the template that matches the given file path. Compiled templates are cached by
+        their frame path, so each frame is processed once.
+
+        :param file: Source file whose path is matched against configured frame patterns.
+        :return: Compiled template for the matching frame.
+        :raises AssertionError: If no configured frame matches the file path.
+        """
+        template_path = self.get_frame(file)
+        if template_path not in self.compiled_cache:
+            from ssg.template.compiled_template import CompiledTemplate
+            self.compiled_cache[template_path] = CompiledTemplate(self.get_template(file), self.config.baseHref)
+        return self.compiled_cache[template_path]
+
+    def render(self, file: FileNode, article: Article, destination_path: Path, writer: OutputWriter | None = None):
         """
         Render an article into an HTML file using the template selected for the source file.
 
+        The article is spliced into the compiled template, which produces the same document as
+        :meth:`HTMLFile.from_article` without copying the frame for every page.
+
         :param file: Source file used to choose the template.
         :param article: Article content and metadata to inject into the selected template.
         :param destination_path: Output path for the rendered HTML file.
+        :param writer: If given, the file is written on the threads of the writer instead of before returning.
         """
-        template = self.get_template(file)
-        html_file = HTMLFile.from_article(article,
-                                          template,
-                                          base_href=self.config.baseHref,
-                                          hostname=self.config.hostname)
-        html_file.write(destination_path)
+        with self.profiler.stage('markdown_conversion', file.path):
+            if self.html_cache is not None:
+                content = self.html_cache.convert(article.markdown, self.config.baseHref, self.highlighter)
+            else:
+                content = article.markdown.convert_to_html(self.config.baseHref, self.highlighter)
+        with self.profiler.stage('template_embedding', file.path):
+            document = self.get_compiled_template(file).render(article, hostname=self.config.hostname, content=content)
+        if writer is None:
+            self._write(document, file.path, destination_path)
+        else:
+            writer.submit(self._write, document, file.path, destination_path)
+
+    def _write(self, document: str, path: Path, destination_path: Path):
+        from ssg.template.html_file import write_html
+        with self.profiler.stage('html_write', path):
+            written = write_html(document, destination_path, self.config.htmlOutput,
+                                 if_changed=self.config.outputWrite == 'if-changed')
+        self.write_stats.add(written)
@@ -0,0 +1,132 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from ssg.engine.asset_sync import AssetSync, AssetSyncStats, SyncAction, format_size, is_unchanged, sync_file
+
+
+class TestAssetSyncBase(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+        self.source = Path(self.temp_dir.name) / 'image.png'
+        self.destination = Path(self.temp_dir.name) / 'copy.png'
+        self.source.write_bytes(b'image content')
+
+
+class TestIsUnchanged(TestAssetSyncBase):
+    def test_missing_destination_is_changed(self):
+        self.assertFalse(is_unchanged(self.source, self.destination, 'size-mtime'))
+        self.assertFalse(is_unchanged(self.source, self.destination, 'hash'))
+
+    def test_always_mode_never_skips(self):
+        sync_file(self.source, self.destination, 'size-mtime', 'copy')
+        self.assertFalse(is_unchanged(self.source, self.destination, 'always'))
+
+    def test_same_size_and_mtime_is_unchanged(self):
+        sync_file(self.source, self.destination, 'size-mtime', 'copy')
+        self.assertTrue(is_unchanged(self.source, self.destination, 'size-mtime'))
+
+    def test_different_mtime_is_changed_in_size_mtime_mode(self):
+        sync_file(self.source, self.destination, 'size-mtime', 'copy')
+        os.utime(self.destination, ns=(0, 0))
+        self.assertFalse(is_unchanged(self.source, self.destination, 'size-mtime'))
+        self.assertTrue(is_unchanged(self.source, self.destination, 'hash'))
+
+    def test_different_content_with_same_size_is_changed_in_hash_mode(self):
+        sync_file(self.source, self.destination, 'size-mtime', 'copy')
+        self.destination.write_bytes(b'IMAGE CONTENT')
+        stat = self.source.stat()
+        os.utime(self.destination, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertTrue(is_unchanged(self.source, self.destination, 'size-mtime'))
+        self.assertFalse(is_unchanged(self.source, self.destination, 'hash'))
+
+    def test_hardlink_to_source_is_unchanged(self):
+        os.link(self.source, self.destination)
+        self.assertTrue(is_unchanged(self.source, self.destination, 'size-mtime'))
+
+
+class TestSyncFile(TestAssetSyncBase):
+    def test_copy_keeps_modification_time(self):
+        os.utime(self.source, ns=(1_000_000_000, 1_000_000_000))
+        action, size = sync_file(self.source, self.destination, 'always', 'copy')
+
+        self.assertEqual((action, size), (SyncAction.COPIED, len(b'image content')))
+        self.assertEqual(self.destination.read_bytes(), b'image content')
+        self.assertEqual(self.destination.stat().st_mtime_ns, 1_000_000_000)
+
+    def test_unchanged_file_is_skipped(self):
+        sync_file(self.source, self.destination, 'size-mtime', 'copy')
+        action, _ = sync_file(self.source, self.destination, 'size-mtime', 'copy')
+        self.assertEqual(action, SyncAction.SKIPPED)
+
+    def test_hardlink(self):
+        action, _ = sync_file(self.source, self.destination, 'always', 'hardlink')
+        self.assertEqual(action, SyncAction.LINKED)
+        self.assertTrue(self.destination.samefile(self.source))
+
+    def test_hardlink_falls_back_to_copy(self):
+        with patch('ssg.engine.asset_sync.os.link', side_effect=OSError('cross-device link')):
+            action, _ = sync_file(self.source, self.destination, 'always', 'hardlink')
+        self.assertEqual(action, SyncAction.COPIED)
+        self.assertEqual(self.destination.read_bytes(), b'image content')
+
+    def test_reflink_falls_back_to_copy(self):
+        with patch('ssg.engine.asset_sync._reflink', side_effect=OSError('not supported')):
+            action, _ = sync_file(self.source, self.destination, 'always', 'reflink')
+        self.assertEqual(action, SyncAction.COPIED)
+        self.assertEqual(self.destination.read_bytes(), b'image content')
+
+    def test_copy_over_hardlink_does_not_modify_source(self):
+        """A destination hardlinked by a previous build must be replaced, not written through."""
+        sync_file(self.source, self.destination, 'always', 'hardlink')
+        other_source = Path(self.temp_dir.name) / 'other.png'
+        other_source.write_bytes(b'other content')
+
+        sync_file(other_source, self.destination, 'always', 'copy')
+
+        self.assertEqual(self.destination.read_bytes(), b'other content')
+        self.assertEqual(self.source.read_bytes(), b'image content')
+
+
+class TestAssetSync(TestAssetSyncBase):
+    def test_files_are_synced_and_summary_printed(self):
+        sources = []
+        for i in range(10):
+            source = Path(self.temp_dir.name) / f'source_{i}.bin'
+            source.write_bytes(b'x' * 1024)
+            sources.append(source)
+        destination_dir = Path(self.temp_dir.name) / 'destination'
+        destination_dir.mkdir()
+
+        with patch('builtins.print') as mock_print:
+            with AssetSync('size-mtime', 'copy') as assets:
+                for source in sources[:4]:
+                    assets.submit(source, destination_dir / source.name)
+        mock_print.assert_called_once_with(AssetSyncStats(copied=4, copied_bytes=4096))
+
+        with patch('builtins.print') as mock_print:
+            with AssetSync('size-mtime', 'copy') as assets:
+                for source in sources:
+                    assets.submit(source, destination_dir / source.name)
+        mock_print.assert_called_once_with(AssetSyncStats(copied=6, copied_bytes=6144, skipped=4, skipped_bytes=4096))
+        self.assertEqual(len(list(destination_dir.iterdir())), 10)
+
+    def test_errors_are_raised_when_leaving(self):
+        with self.assertRaises(FileNotFoundError):
+            with AssetSync() as assets:
+                assets.submit(Path(self.temp_dir.name) / 'missing.png', self.destination)
+
+
+class TestFormatSize(TestCase):
+    def test_format_size(self):
+        self.assertEqual(format_size(0), '0 B')
+        self.assertEqual(format_size(1536), '1.5 KB')
+        self.assertEqual(format_size(3 * 1024 ** 3), '3.0 GB')
+
+    def test_summary(self):
+        stats = AssetSyncStats(copied=1, copied_bytes=2048, skipped=2, skipped_bytes=10)
+        self.assertEqual(str(stats), 'Assets: 1 copied (2.0 KB), 0 linked (0 B), 2 skipped (10 B)')
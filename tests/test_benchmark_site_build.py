@@ -0,0 +1,87 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import pygit2
+
+from benchmarks.site_build.synthetic_site import SiteSpec, generate_site, page_path
+from benchmarks.site_build.timing import STAGES, compare, run_benchmark
+
+
+class TestGenerateSite(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.workspace = Path(self.temp_dir.name)
+
+    def test_site_matches_spec(self):
+        """The generated site must have the pages, images, covers, frames, feeds and commits of the spec."""
+        spec = SiteSpec(pages=12, depth=2, fanout=2, images=2, cover_ratio=1.0, frames=2, feeds=3, commits=5)
+
+        config_path = generate_site(self.workspace, spec)
+
+        source = self.workspace / 'source'
+        config = json.loads(config_path.read_text(encoding='utf-8'))
+        self.assertEqual(len(list(source.rglob('*.md'))), 12)
+        self.assertTrue((source / 'section-1' / 'section-0' / 'page-1.md').is_file())
+        self.assertTrue((source / page_path(spec, 5).parent / 'page-5-1.png').is_file())
+        self.assertTrue((source / page_path(spec, 5).parent / 'img-page-5' / 'cover.png').is_file())
+        self.assertEqual(len(config['frames']), 2)
+        self.assertEqual(len(config['rssFeeds']), 3)
+        repo = pygit2.Repository(source)
+        self.assertEqual(len(list(repo.walk(repo.head.target))), 5)
+
+    def test_same_seed_produces_same_site(self):
+        """Two sites generated from the same spec must have the same content."""
+        spec = SiteSpec(pages=5, commits=3)
+
+        generate_site(self.workspace / 'a', spec)
+        generate_site(self.workspace / 'b', spec)
+
+        for path in (self.workspace / 'a' / 'source').rglob('*.md'):
+            relative = path.relative_to(self.workspace / 'a')
+            self.assertEqual(path.read_text(encoding='utf-8'),
+                             (self.workspace / 'b' / relative).read_text(encoding='utf-8'))
+
+
+class TestRunBenchmark(TestCase):
+    def test_results_hold_total_and_stages(self):
+        """A benchmark run must build the site and time the whole build and every stage."""
+        with tempfile.TemporaryDirectory() as workspace:
+            config_path = generate_site(Path(workspace), SiteSpec(pages=4, commits=2))
+
+            results = run_benchmark(config_path, repeat=1)
+
+            self.assertTrue((Path(workspace) / 'destination' / 'rss.xml').is_file())
+        self.assertGreater(results['total']['median'], 0)
+        self.assertEqual(set(results['stages']), set(STAGES))
+        self.assertEqual(results['stages']['convert_to_html']['calls'], 4)
+        self.assertEqual(results['stages']['create_directory_tree']['calls'], 1)
+
+    def test_stage_functions_restored(self):
+        """The timed functions must be restored once the benchmark is done."""
+        originals = {name: getattr(owner, attribute) for name, (owner, attribute) in STAGES.items()}
+        with tempfile.TemporaryDirectory() as workspace:
+            run_benchmark(generate_site(Path(workspace), SiteSpec(pages=1, commits=1)), repeat=1)
+
+        for name, (owner, attribute) in STAGES.items():
+            self.assertIs(getattr(owner, attribute), originals[name])
+
+
+class TestCompare(TestCase):
+    @staticmethod
+    def _results(total: float, stage: float) -> dict:
+        return {'total': {'median': total}, 'stages': {'convert_to_html': {'median': stage}}}
+
+    def test_slowdown_above_threshold_is_regression(self):
+        """Times slower than the baseline by more than the threshold must be reported as regressions."""
+        rows = compare(self._results(1.2, 0.5), self._results(1.0, 0.5), threshold=0.1)
+
+        self.assertEqual(rows, [('total', 1.0, 1.2, True), ('convert_to_html', 0.5, 0.5, False)])
+
+    def test_small_absolute_slowdown_is_not_regression(self):
+        """Stages taking a few milliseconds must not regress because of noise."""
+        rows = compare(self._results(1.0, 0.002), self._results(1.0, 0.001), threshold=0.1)
+
+        self.assertFalse(rows[1][3])
@@ -0,0 +1,203 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from ssg.config.config import Config, Frame as ConfigFrame, Matcher, Meta, MetaFields, read_config
+from ssg.config.path_router import PatternList
+from ssg.dirtree.create_directory_tree import create_directory_tree
+from ssg.engine.check import build_fingerprint, is_config_file_up_to_date, is_up_to_date, read_head, source_fingerprint
+from ssg.engine.engine import Engine
+from ssg.git import GitClient
+from tests.test_git import GitRepositoryTestCase
+
+
+class TestReadHead(GitRepositoryTestCase):
+    def _assert_head(self, path: Path, expected):
+        """HEAD read from the git directory must match the expected commit and the one pygit2 finds."""
+        head = GitClient(path).get_head()
+        self.assertEqual(head, expected)
+        self.assertEqual(read_head(path), str(expected) if expected is not None else None)
+
+    def test_empty_repository(self):
+        self._assert_head(self.repo_root, None)
+
+    def test_branch(self):
+        oid = self._commit({'a.md': 'a'}, 1_700_000_000)
+        self._assert_head(self.repo_root, oid)
+
+    def test_folder_inside_working_tree(self):
+        oid = self._commit({'site/a.md': 'a'}, 1_700_000_000)
+        self._path('site').mkdir()
+        self._assert_head(self._path('site'), oid)
+
+    def test_packed_branch(self):
+        oid = self._commit({'a.md': 'a'}, 1_700_000_000)
+        ref = self.repo.head.name
+        loose_ref = Path(self.repo.path) / ref
+        loose_ref.unlink()
+        (Path(self.repo.path) / 'packed-refs').write_text(f'# pack-refs with: peeled fully-peeled sorted \n'
+                                                           f'{oid} {ref}\n', encoding='utf-8')
+        self._assert_head(self.repo_root, oid)
+
+    def test_detached_head(self):
+        first = self._commit({'a.md': 'a'}, 1_700_000_000)
+        self._commit({'a.md': 'b'}, 1_700_000_100)
+        self.repo.set_head(first)
+        self._assert_head(self.repo_root, first)
+
+    def test_linked_worktree(self):
+        oid = self._commit({'a.md': 'a'}, 1_700_000_000)
+        branch = self.repo.branches.local.create('other', self.repo[oid])
+        worktree_path = Path(self.temp_dir.name) / 'worktree'
+        self.repo.add_worktree('other', str(worktree_path), branch)
+        self._assert_head(worktree_path, oid)
+
+
+class TestFingerprint(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.source = Path(self.temp_dir.name) / 'source'
+        for path in ('index.md', 'articles/post.md', 'articles/img-post/cover.png', 'drafts/draft.md', 'empty/.keep'):
+            (self.source / path).parent.mkdir(parents=True, exist_ok=True)
+            (self.source / path).write_text(path, encoding='utf-8')
+        (self.source / 'link').symlink_to(self.source / 'articles', target_is_directory=True)
+        self.config = Config(source=self.source, destination=Path(self.temp_dir.name) / 'destination',
+                             hostname='example.com', baseHref='https://example.com/', exclude=['drafts'],
+                             meta=None, frames=[])
+
+    def _tree_fingerprint(self, head='head'):
+        root = create_directory_tree(self.source, PatternList(self.config.exclude))
+        return build_fingerprint(self.config, root, head)
+
+    def test_scan_matches_directory_tree(self):
+        """The check must compute the same fingerprint as the build, without building the tree of nodes."""
+        with patch('ssg.engine.check.read_head', return_value='head'):
+            self.assertEqual(source_fingerprint(self.config), self._tree_fingerprint())
+
+    def test_inputs_change_fingerprint(self):
+        fingerprint = self._tree_fingerprint()
+
+        self.assertNotEqual(self._tree_fingerprint(head='other'), fingerprint)
+        os.utime(self.source / 'index.md', ns=(0, 0))
+        self.assertNotEqual(self._tree_fingerprint(), fingerprint)
+
+    def test_excluded_files_do_not_change_fingerprint(self):
+        fingerprint = self._tree_fingerprint()
+
+        (self.source / 'drafts/draft.md').write_text('changed draft', encoding='utf-8')
+
+        self.assertEqual(self._tree_fingerprint(), fingerprint)
+
+
+class TestIsUpToDate(GitRepositoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.source = self._path('site')
+        self.source.mkdir()
+        (self.source / 'frame.html').write_text('<html><body><article id="main-content"></article></body></html>',
+                                                encoding='utf-8')
+        (self.source / 'index.md').write_text('# Index', encoding='utf-8')
+        self._commit({'site/index.md': '# Index'}, 1_700_000_000)
+        self.config = Config(source=self.source, destination=Path(self.temp_dir.name) / 'destination',
+                             hostname='example.com', baseHref='https://example.com/', exclude=[],
+                             meta=Meta(default=MetaFields(title='Site', image=None, description=None, url=None),
+                                       matchers=[Matcher(file='*.md', action='USE_DEFAULT', meta_fields=None)]),
+                             frames=[ConfigFrame(file='*.md', frame=Path('frame.html'))])
+        self.config.destination.mkdir()
+
+    def _build(self):
+        with patch('builtins.print'):
+            Engine(self.config).run()
+
+    def test_not_built(self):
+        self.assertFalse(is_up_to_date(self.config))
+
+    def test_up_to_date_after_build(self):
+        self._build()
+        self.assertTrue(is_up_to_date(self.config))
+
+    def test_changed_source_file(self):
+        self._build()
+        (self.source / 'index.md').write_text('# Changed index', encoding='utf-8')
+        self.assertFalse(is_up_to_date(self.config))
+
+    def test_new_commit(self):
+        self._build()
+        self._commit({'other.txt': 'other'}, 1_700_000_100)
+        self.assertFalse(is_up_to_date(self.config))
+
+    def test_changed_config(self):
+        self._build()
+        self.config.hostname = 'other.com'
+        self.assertFalse(is_up_to_date(self.config))
+
+
+class TestIsConfigFileUpToDate(GitRepositoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.source = self._path('site')
+        self.source.mkdir()
+        (self.source / 'frame.html').write_text('<html><body><article id="main-content"></article></body></html>',
+                                                encoding='utf-8')
+        (self.source / 'index.md').write_text('# Index', encoding='utf-8')
+        self._commit({'site/index.md': '# Index'}, 1_700_000_000)
+        self.destination = Path(self.temp_dir.name) / 'destination'
+        self.config_path = Path(self.temp_dir.name) / 'config.json'
+        self.content = {'source': self.source.as_posix(), 'destination': self.destination.as_posix(),
+                        'hostname': 'example.com', 'baseHref': 'https://example.com/',
+                        'meta': {'default': {'og:title': 'Site'}, 'matchers': [{'file': '*.md', 'action': 'USE_DEFAULT'}]},
+                        'frames': [{'file': '*.md', 'frame': 'frame.html'}]}
+        self._write_config()
+
+    def _write_config(self, indent: int | None = None):
+        self.config_path.write_text(json.dumps(self.content, indent=indent), encoding='utf-8')
+
+    def _build(self, destination: Path | None = None):
+        config = read_config(self.config_path)
+        if destination is not None:
+            config.destination = destination
+        config.destination.mkdir(exist_ok=True)
+        with patch('builtins.print'):
+            Engine(config).run()
+
+    def test_up_to_date_after_build(self):
+        self._build()
+
+        self.assertTrue(is_config_file_up_to_date(self.config_path))
+        self.assertTrue(is_up_to_date(read_config(self.config_path)))
+
+    def test_reformatted_config(self):
+        self._build()
+        self._write_config(indent=4)
+
+        self.assertTrue(is_config_file_up_to_date(self.config_path))
+
+    def test_changed_config(self):
+        self._build()
+        self.content['hostname'] = 'other.com'
+        self._write_config()
+
+        self.assertFalse(is_config_file_up_to_date(self.config_path))
+
+    def test_destination_given_on_command_line(self):
+        other = Path(self.temp_dir.name) / 'other'
+        self._build(other)
+
+        self.assertTrue(is_config_file_up_to_date(self.config_path, other))
+        self.assertFalse(is_config_file_up_to_date(self.config_path))
+
+    def test_configuration_model_is_not_imported(self):
+        self._build()
+        code = ('import sys; from pathlib import Path; from ssg.engine.check import is_config_file_up_to_date; '
+                f'assert is_config_file_up_to_date(Path({self.config_path.as_posix()!r})); '
+                'print(sorted(name for name in ("ssg.config.config", "dataclasses") if name in sys.modules))')
+
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+
+        self.assertEqual(output.strip(), '[]')
@@ -0,0 +1,238 @@
+import tempfile
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest import TestCase
+
+import markdown
+from bs4 import BeautifulSoup
+
+from ssg.content.article import Article, Author
+from ssg.content.markdown_file import MarkDownFile
+from ssg.template import Template
+from ssg.template.compiled_template import CompiledTemplate
+from ssg.template.html_file import HTMLFile, write_html
+
+BASE_HREF = 'https://example.com/'
+
+BASE_HTML = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Original Title</title>
+</head>
+<body>
+    <article id="main-content"></article>
+</body>
+</html>
+"""
+
+RICH_FRAME_HTML = """\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <title>Frame Title</title>
+    <link rel="stylesheet" href="css/style.css">
+    <script src="js/main.js"></script>
+</head>
+<body>
+    <nav>
+        <a href="index.md">Home</a>
+        <a href="https://github.com/someone">GitHub</a>
+        <a href="/about.html">About</a>
+    </nav>
+    <h2>Frame Heading</h2>
+    <article id="main-content"><p>Placeholder content which is replaced</p><h2>Removed</h2></article>
+    <footer><title>Second title</title><img src="img/logo.png"></footer>
+</body>
+</html>
+"""
+
+NO_HEAD_FRAME_HTML = '<article id="main-content"></article>'
+
+MARKDOWN = """\
+# A "quoted" title & <more>
+
+Intro with a [relative link](other.md), an [external one](https://other.com/page)
+and an [internal absolute link](https://example.com/page).
+
+## First Section
+
+Some *text* with "smart quotes" -- and ~~strike~~.
+
+## Second & Last Section
+
+| a | b |
+|---|---|
+| 1 | 2 |
+
+```
+code <block> & stuff
+```
+"""
+
+
+RAW_HTML_MARKDOWN = """\
+# Raw HTML
+
+<div class="links">
+<a href="other.md">Other</a>
+<a href='https://other.com/?a=1&amp;b=2' title="x">External</a>
+<a href="https://other.com/x" target="_self">Already targeted</a>
+<a href="https://example.com/internal">Internal</a>
+<a name="no-href">No href</a>
+</div>
+
+<h2 class="raw">Raw <em>heading</em> &amp; more</h2>
+
+Inline <a href="inline.md">raw link</a> and <a href="https://other.com/">raw external</a>.
+
+Unquoted <a href=unquoted.md class=c>link</a>, <a HREF="https://other.com/u" title=t>external</a> &copy; 2025.
+
+<div title="t" id="d" class="c">
+  <a href="https://other.com/z" target="_self" rel="noopener">Targeted</a>
+
+
+  <img src="img.png" alt="x"><br/><input disabled type="checkbox">
+</div>
+
+<script>var link = '<a href="script.md">'; var heading = "<h2>Not a heading</h2>";</script>
+
+<!-- <a href="comment.md">Commented</a> <h2>Hidden</h2> -->
+
+<pre>
+<a href="pre.md">In pre</a>
+
+   kept   spaces
+</pre>
+
+<table>
+  <tr>
+    <td><a href="cell.md">Cell</a></td>
+  </tr>
+</table>
+
+## It's `code` and a [link](https://other.com/y "Title")[^1]
+
+## Escaped \\*stars\\*
+
+[^1]: A footnote.
+"""
+
+
+def _render_baseline(article: Article, template: Template, hostname: str | None) -> HTMLFile:
+    """The rendering pipeline before links and headings were processed during the Markdown conversion."""
+    soup = BeautifulSoup(markdown.markdown(article.markdown.content, extensions=article.markdown.extensions), 'lxml')
+    html_file = HTMLFile(template.embed_content(soup))
+    html_file.set_page_title(article.title, hostname=hostname)
+    html_file.add_target_blank_to_external_urls(BASE_HREF)
+    html_file.add_anchor_links()
+    html_file.insert_og_meta(title=article.title,
+                             description=article.description,
+                             url=article.url,
+                             cover_image=article.cover_image,
+                             twitter_handle=article.author.twitter_handle,
+                             base_href=BASE_HREF,
+                             last_edited_time=article.last_edited)
+    return html_file
+
+
+def _make_article(markdown: str = MARKDOWN, **overrides) -> Article:
+    fields = dict(
+        markdown=MarkDownFile(markdown),
+        title='A "quoted" title & <more>',
+        description="It's a <description> & more",
+        url='https://example.com/page.html',
+        cover_image='https://example.com/img-page/cover.png',
+        last_edited=datetime(2025, 3, 10, 9, 30, 0, tzinfo=UTC),
+        author=Author(name='Jane', email='jane@example.com', twitter_handle='@jane'),
+    )
+    fields.update(overrides)
+    return Article(**fields)
+
+
+class TestCompiledTemplate(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.destination = Path(self.temp_dir.name)
+
+    def _assert_same_output(self, frame_html: str, article: Article, hostname: str | None = 'example.com'):
+        """
+        HTMLFile.from_article and the compiled template must write the same bytes as the baseline pipeline, which
+        processes the links and headings of the whole page after embedding the content.
+        """
+        template = Template(frame_html)
+        template.set_base_path(BASE_HREF)
+
+        for output_format in ('pretty', 'compact'):
+            expected_path = self.destination / 'expected.html'
+            _render_baseline(article, template, hostname).write(expected_path, output_format)
+
+            html_file_path = self.destination / 'html_file.html'
+            html_file = HTMLFile.from_article(article, template, base_href=BASE_HREF, hostname=hostname)
+            html_file.write(html_file_path, output_format)
+
+            compiled_path = self.destination / 'compiled.html'
+            compiled = CompiledTemplate(template, BASE_HREF)
+            write_html(compiled.render(article, hostname=hostname), compiled_path, output_format)
+
+            self.assertEqual(expected_path.read_bytes(), html_file_path.read_bytes())
+            self.assertEqual(expected_path.read_bytes(), compiled_path.read_bytes())
+
+    def test_base_frame_output_identical(self):
+        self._assert_same_output(BASE_HTML, _make_article())
+
+    def test_rich_frame_output_identical(self):
+        self._assert_same_output(RICH_FRAME_HTML, _make_article())
+
+    def test_frame_without_head_output_identical(self):
+        self._assert_same_output(NO_HEAD_FRAME_HTML, _make_article())
+
+    def test_without_hostname_and_optional_meta_output_identical(self):
+        article = _make_article(description=None,
+                                cover_image=None,
+                                last_edited=None,
+                                author=Author())
+        self._assert_same_output(RICH_FRAME_HTML, article, hostname=None)
+
+    def test_empty_markdown_output_identical(self):
+        self._assert_same_output(BASE_HTML, _make_article(markdown=''))
+
+    def test_raw_html_head_elements_in_markdown_output_identical(self):
+        markdown = '<style>p { color: red; }</style>\n# Title\n\nText'
+        self._assert_same_output(BASE_HTML, _make_article(markdown=markdown))
+
+    def test_raw_html_links_and_headings_output_identical(self):
+        self._assert_same_output(RICH_FRAME_HTML, _make_article(markdown=RAW_HTML_MARKDOWN))
+
+    def test_consecutive_raw_html_blocks_output_identical(self):
+        markdown = 'Text.\n\n<h2>Raw</h2>\n\n<script>var a = "<b>";</script>\n\n<!-- comment -->\n'
+        self._assert_same_output(BASE_HTML, _make_article(markdown=markdown))
+
+    def test_whitespace_between_inline_elements_output_identical(self):
+        markdown = 'A *x*   *y* and **b**\n   *c*\n\n* <b>bold</b>   <i>it</i>\n\n`a`   `b`\n\n    code   block\n'
+        self._assert_same_output(BASE_HTML, _make_article(markdown=markdown))
+
+    def test_compiled_template_is_reused_across_pages(self):
+        """Rendering a page must not modify the compiled template."""
+        template = Template(RICH_FRAME_HTML)
+        template.set_base_path(BASE_HREF)
+        compiled = CompiledTemplate(template, BASE_HREF)
+        segments = list(compiled.segments)
+
+        first = compiled.render(_make_article(title='First'), hostname='example.com')
+        compiled.render(_make_article(markdown='# Other', title='Other'), hostname='example.com')
+
+        self.assertEqual(compiled.segments, segments)
+        self.assertEqual(first, compiled.render(_make_article(title='First'), hostname='example.com'))
+
+    def test_embedded_content_is_not_wrapped_in_html_element(self):
+        """The content is embedded without the html and body elements added when parsing it."""
+        template = Template(BASE_HTML)
+        compiled = CompiledTemplate(template, BASE_HREF)
+
+        rendered = compiled.render(_make_article(markdown='Hello'), hostname='example.com')
+
+        self.assertIn('<article id="main-content"><p>Hello</p></article>', rendered)
+        self.assertEqual(rendered.count('<html>'), 1)
@@ -0,0 +1,69 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from ssg.dirtree.create_directory_tree import create_directory_tree
+from ssg.dirtree.node import NodeType
+from ssg.engine.cover_image import get_cover_image
+
+
+class TestGetCoverImage(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.source_dir = Path(self.temp_dir.name)
+
+    def _write_file(self, relative_path: str):
+        path = self.source_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('', encoding='utf-8')
+
+    def _cover_images(self) -> dict[Path, Path | None]:
+        tree = create_directory_tree(self.source_dir)
+        return {file.path: get_cover_image(file) for file in tree.traverse(NodeType.FILE) if file.is_markdown()}
+
+    def test_cover_image_in_img_folder(self):
+        self._write_file('articles/post.md')
+        self._write_file('articles/img-post/cover.png')
+        self._write_file('articles/img-post/photo.png')
+        self._write_file('articles/other.md')
+
+        self.assertEqual(self._cover_images(), {Path('articles/post.md'): Path('articles/img-post/cover.png'),
+                                                Path('articles/other.md'): None})
+
+    def test_folder_name_ending_with_img_name(self):
+        self._write_file('post.md')
+        self._write_file('2024-img-post/cover.jpg')
+
+        self.assertEqual(self._cover_images(), {Path('post.md'): Path('2024-img-post/cover.jpg')})
+
+    def test_folder_name_containing_img_more_than_once(self):
+        self._write_file('b.md')
+        self._write_file('a-img-b.md')
+        self._write_file('img-a-img-b/cover.png')
+
+        self.assertEqual(self._cover_images(), {Path('b.md'): Path('img-a-img-b/cover.png'),
+                                                Path('a-img-b.md'): Path('img-a-img-b/cover.png')})
+
+    def test_not_accepted_extension_and_nested_folders_are_ignored(self):
+        self._write_file('post.md')
+        self._write_file('img-post/cover.txt')
+        self._write_file('img-post/nested/cover.png')
+        self._write_file('sub/img-post/cover.png')
+
+        self.assertEqual(self._cover_images(), {Path('post.md'): None})
+
+    def test_multiple_cover_images_warns_and_chooses_first(self):
+        self._write_file('post.md')
+        self._write_file('img-post/cover.png')
+        self._write_file('img-post/cover.jpg')
+
+        tree = create_directory_tree(self.source_dir)
+        expected = tree.cover_images['post'][0]
+        file = next(file for file in tree.traverse(NodeType.FILE) if file.is_markdown())
+        with patch('builtins.print') as mock_print:
+            cover_image = get_cover_image(file)
+
+        self.assertEqual(cover_image, expected)
+        mock_print.assert_called_once_with(f'Warning! Multiple cover images found for post.md! Choosing {expected}')
@@ -3,6 +3,8 @@ from pathlib import Path
 from unittest import TestCase
 
 from ssg.dirtree.create_directory_tree import create_directory_tree
+from ssg.dirtree.file_node import FileStat
+from ssg.dirtree.node import NodeType
 
 class TestCreateDirectoryTreeBase(TestCase):
     def setUp(self):
@@ -153,3 +155,41 @@ class TestCreateDirectoryTreeRelationships(TestCreateDirectoryTreeBase):
         self.assertEqual(len(sub_node.files), 1)
         self.assertEqual(sub_node.files[0].path, Path("sub/child.md"))
         self.assertIs(sub_node.files[0].parent, sub_node)
+
+
+class TestCreateDirectoryTreeScanning(TestCreateDirectoryTreeBase):
+    def test_create_directory_tree_keeps_file_stat(self):
+        """The stat data read while scanning is kept on each FileNode."""
+        path = self._write_file("sub/page.md", "# Page")
+
+        tree = create_directory_tree(self.source_dir)
+
+        file = next(tree.traverse(NodeType.FILE))
+        stat = path.stat()
+        self.assertEqual(file.stat, FileStat(size=stat.st_size, mtime_ns=stat.st_mtime_ns, inode=stat.st_ino,
+                                             device=stat.st_dev))
+
+    def test_create_directory_tree_on_threads_matches_serial_scan(self):
+        """Scanning on a pool of threads must produce the same tree, in the same order, as a serial scan."""
+        for i in range(5):
+            for j in range(5):
+                self._write_file(f"dir{i}/sub{j}/page.md", "p")
+                self._write_file(f"dir{i}/file{j}.txt", "f")
+        self._write_file("dir0/ignored/x.md", "x")
+
+        serial = create_directory_tree(self.source_dir, exclude=frozenset(["ignored"]))
+        threaded = create_directory_tree(self.source_dir, exclude=frozenset(["ignored"]), threads=4)
+
+        self.assertEqual([node.path for node in threaded.traverse()], [node.path for node in serial.traverse()])
+        self.assertNotIn(Path("dir0/ignored"), self._all_paths(threaded))
+
+    def test_create_directory_tree_does_not_follow_directory_symlinks(self):
+        """Symbolic links to directories are added to the tree, but their content is not."""
+        self._write_file("real/page.md", "p")
+        (self.source_dir / "link").symlink_to(self.source_dir / "real", target_is_directory=True)
+
+        tree = create_directory_tree(self.source_dir)
+
+        all_paths = self._all_paths(tree)
+        self.assertIn(Path("link"), all_paths)
+        self.assertNotIn(Path("link/page.md"), all_paths)
@@ -0,0 +1,123 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from ssg.config.config import Config
+from ssg.engine.dependencies import (DependencyGraph, OutputDependencies, changed_config_fragments,
+                                     cover_image_pattern)
+from ssg.config.path_router import PatternList
+
+
+def _make_graph() -> DependencyGraph:
+    graph = DependencyGraph()
+    graph.add('index.html', OutputDependencies(kind='page', source='index.md', frame='index_frame.html',
+                                               config=['hostname', 'frames']))
+    graph.add('articles/post.html', OutputDependencies(kind='page', source='articles/post.md',
+                                                       frame='articles/article_frame.html',
+                                                       cover_image='articles/img-post/cover.png',
+                                                       cover_pattern=cover_image_pattern(Path('articles/post.md')),
+                                                       feeds=['Articles'], config=['hostname', 'frames']))
+    graph.add('articles/other.html', OutputDependencies(kind='page', source='articles/other.md',
+                                                        frame='articles/article_frame.html',
+                                                        cover_pattern=cover_image_pattern(Path('articles/other.md')),
+                                                        feeds=['Articles'], config=['hostname', 'frames']))
+    graph.add('style.css', OutputDependencies(kind='asset', source='style.css', config=['assetSync']))
+    graph.add('rss.xml', OutputDependencies(kind='feed', matcher='articles/*.md', feeds=['Articles'],
+                                            pages=['articles/post.md', 'articles/other.md'],
+                                            config=['rssFeeds.Articles']))
+    return graph
+
+
+class TestDependencyGraph(TestCase):
+    def setUp(self):
+        self.graph = _make_graph()
+
+    def _affected(self, *paths: str, fragments=()) -> list[str]:
+        return self.graph.affected([Path(path) for path in paths], fragments)
+
+    def test_nothing_changed(self):
+        self.assertEqual(self._affected(), [])
+
+    def test_source_change_affects_page_and_its_feeds(self):
+        self.assertEqual(self._affected('articles/post.md'), ['articles/post.html', 'rss.xml'])
+        self.assertEqual(self._affected('index.md'), ['index.html'])
+
+    def test_frame_change_affects_only_pages_using_it(self):
+        self.assertEqual(self._affected('articles/article_frame.html'), ['articles/other.html', 'articles/post.html'])
+
+    def test_cover_image_change_affects_its_page_and_feeds(self):
+        self.assertEqual(self._affected('articles/img-post/cover.png'), ['articles/post.html', 'rss.xml'])
+
+    def test_new_cover_image_affects_only_its_page_and_feeds(self):
+        self.assertEqual(self._affected('articles/img-other/cover.jpg'), ['articles/other.html', 'rss.xml'])
+        self.assertEqual(self._affected('articles/img-other/photo.jpg'), [])
+
+    def test_new_markdown_file_affects_feeds_matching_it(self):
+        self.assertEqual(self._affected('articles/new.md'), ['rss.xml'])
+        self.assertEqual(self._affected('new.md'), [])
+
+    def test_asset_change(self):
+        self.assertEqual(self._affected('style.css'), ['style.css'])
+
+    def test_config_fragments(self):
+        self.assertEqual(self._affected(fragments=['hostname']),
+                         ['articles/other.html', 'articles/post.html', 'index.html'])
+        self.assertEqual(self._affected(fragments=['rssFeeds.Articles']), ['rss.xml'])
+        self.assertEqual(self._affected(fragments=['assetSync']), ['style.css'])
+
+    def test_global_config_fragments_affect_everything(self):
+        self.assertEqual(self._affected(fragments=['source']), sorted(self.graph.outputs))
+
+    def test_removed_output(self):
+        self.graph.remove('articles/post.html')
+        self.assertEqual(self._affected('articles/img-post/cover.png'), [])
+
+    def test_save(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / 'deps.json'
+            self.graph.save(path, [Path('index.md')])
+            content = json.loads(path.read_text(encoding='utf-8'))
+
+        self.assertEqual(content['changed'], ['index.md'])
+        self.assertEqual(content['affected'], ['index.html'])
+        self.assertEqual(content['outputs']['style.css'], {'kind': 'asset', 'source': 'style.css',
+                                                           'config': ['assetSync']})
+
+
+class TestConfigFragments(TestCase):
+    def _make_config(self, **overrides) -> Config:
+        content = {
+            'source': 'source',
+            'destination': 'destination',
+            'baseHref': 'https://example.com/',
+            'hostname': 'example.com',
+            'frames': [],
+            'rssFeeds': [{'title': 'All', 'description': 'd', 'link': 'l', 'feed_url': 'f', 'language': 'en',
+                          'matcher': '*.md', 'outputLocation': 'rss.xml'}],
+        }
+        content.update(overrides)
+        return Config.from_json(content)
+
+    def test_unchanged(self):
+        self.assertEqual(changed_config_fragments(self._make_config(), self._make_config()), set())
+
+    def test_changed_fields(self):
+        self.assertEqual(changed_config_fragments(self._make_config(), self._make_config(hostname='other.com')),
+                         {'hostname'})
+
+    def test_each_feed_is_a_fragment(self):
+        new = self._make_config(rssFeeds=[{'title': 'All', 'description': 'changed', 'link': 'l', 'feed_url': 'f',
+                                           'language': 'en', 'matcher': '*.md', 'outputLocation': 'rss.xml'}])
+        self.assertEqual(changed_config_fragments(self._make_config(), new), {'rssFeeds.All'})
+
+
+class TestCoverImagePattern(TestCase):
+    def test_cover_image_pattern(self):
+        self.assertEqual(cover_image_pattern(Path('post.md')), '*img-post/cover.*')
+        self.assertEqual(cover_image_pattern(Path('articles/post.md')), 'articles/*img-post/cover.*')
+
+    def test_special_characters_are_escaped(self):
+        patterns = PatternList([cover_image_pattern(Path('a[1]/post?.md'))])
+        self.assertTrue(patterns.matches('a[1]/img-post?/cover.png'))
+        self.assertFalse(patterns.matches('a1/img-posts/cover.png'))
@@ -1,3 +1,5 @@
+import os
+import shutil
 import tempfile
 from datetime import UTC, datetime
 from pathlib import Path
@@ -6,8 +8,12 @@ from unittest.mock import MagicMock, patch
 
 from bs4 import BeautifulSoup
 
-from ssg.config.config import Config, Frame as ConfigFrame, Matcher, Meta, MetaFields
+from ssg.config.config import Config, Frame as ConfigFrame, Matcher, Meta, MetaFields, RssFeed
+from ssg.engine.asset_sync import AssetSync
 from ssg.engine.engine import Engine, create_directory_tree, get_last_edited_for_markdown_files
+from ssg.engine.manifest import MANIFEST_FILE_NAME
+from ssg.engine.outputs import OutputRecord
+from ssg.engine.profiler import BuildProfiler
 
 MINIMAL_FRAME_HTML = """\
 <!DOCTYPE html>
@@ -78,13 +84,13 @@ class TestEngineBase(TestCase):
         )
 
     @staticmethod
-    def _run_engine(config: Config, git_timestamps=None):
+    def _run_engine(config: Config, git_timestamps=None, **engine_options):
         """Run SSG with the git client mocked out."""
         with patch("ssg.engine.engine.git.GitClient") as mock_class:
             mock_instance = MagicMock()
             mock_instance.get_last_edit_time_for_files.return_value = git_timestamps or {}
             mock_class.return_value = mock_instance
-            Engine(config).run()
+            Engine(config, **engine_options).run()
 
     def _read_output(self, relative_path: Path | str) -> str:
         return (self.destination_dir / relative_path).read_text(encoding="utf-8")
@@ -154,6 +160,19 @@ class TestEngineRun(TestEngineBase):
         self.assertTrue(copied.exists())
         self.assertEqual(copied.read_text(encoding="utf-8"), css_content)
 
+    def test_unchanged_assets_are_skipped(self):
+        """With assetSync set, files already up to date in the destination must not be copied again."""
+        self._write_source_file("style.css", "body { margin: 0; }")
+        config = self._make_config()
+        config.assetSync = "size-mtime"
+
+        self._run_engine(config)
+        with patch("builtins.print") as mock_print:
+            self._run_engine(config)
+
+        summary = [str(call.args[0]) for call in mock_print.call_args_list if str(call.args[0]).startswith("Assets:")]
+        self.assertEqual(summary, ["Assets: 0 copied (0 B), 0 linked (0 B), 1 skipped (19 B)"])
+
     def test_frame_file_is_not_copied_to_destination(self):
         """Frame HTML files must be excluded from the destination directory."""
         self._run_engine(self._make_config())
@@ -211,6 +230,343 @@ class TestEngineRun(TestEngineBase):
         self.assertNotIn("last-updated", self._read_output("test.html"))
 
 
+class TestEngineParallel(TestEngineBase):
+    def test_parallel_build_matches_serial_build(self):
+        """Rendering on worker processes must produce the same pages as a serial build."""
+        for i in range(20):
+            self._write_source_file(f"articles/page_{i}.md", f"# Page {i}\n\n[Link](../test.md)")
+
+        self._run_engine(self._make_config())
+        serial = {p: p.read_bytes() for p in self.destination_dir.rglob("*.html")}
+        for path in serial:
+            path.unlink()
+
+        self._run_engine(self._make_config(), jobs=3)
+        parallel = {p: p.read_bytes() for p in self.destination_dir.rglob("*.html")}
+
+        self.assertEqual(len(serial), 21)
+        self.assertEqual(serial, parallel)
+
+    def test_assets_are_submitted_between_pages(self):
+        """Assets must be copied while the pages of a parallel build are rendered, not once they all are."""
+        for i in range(6):
+            self._write_source_file(f"page_{i}.md", f"# Page {i}" + " text" * i)
+            self._write_source_file(f"page_{i}.css", "body {}")
+
+        def submitted(jobs: int) -> list[str]:
+            order = []
+            build_page = Engine._build_page
+            submit_asset = AssetSync.submit
+
+            def record_page(engine, *args):
+                order.append("page")
+                build_page(engine, *args)
+
+            def record_asset(sync, *args):
+                order.append("asset")
+                submit_asset(sync, *args)
+
+            with patch.object(Engine, "_build_page", autospec=True, side_effect=record_page), \
+                    patch.object(AssetSync, "submit", autospec=True, side_effect=record_asset), \
+                    patch("builtins.print"):
+                self._run_engine(self._make_config(), jobs=jobs)
+            return order
+
+        self.assertEqual(submitted(3), submitted(1))
+
+    def test_parallel_build_logs_pages_in_traversal_order(self):
+        """
+        Pages rendered in parallel must be reported in the same order as in a serial build, although they are sent to
+        the workers longest first.
+        """
+        for i in range(20):
+            self._write_source_file(f"page_{i:02}.md", f"# Page {i}" + " text" * i)
+
+        with patch("builtins.print") as mock_print:
+            self._run_engine(self._make_config())
+        serial = [call.args[0] for call in mock_print.call_args_list]
+
+        with patch("builtins.print") as mock_print:
+            self._run_engine(self._make_config(), jobs=4)
+        parallel = [call.args[0] for call in mock_print.call_args_list
+                    if not str(call.args[0]).startswith("Render schedule:")]
+
+        self.assertEqual(serial, parallel)
+
+
+class TestEngineWrite(TestEngineBase):
+    def test_write_error_is_raised_after_other_pages_are_written(self):
+        """A page which cannot be written must not stop the other pages, and its error must end the build."""
+        for i in range(5):
+            self._write_source_file(f"page_{i}.md", f"# Page {i}")
+        (self.destination_dir / "page_2.html").mkdir()
+
+        with patch("builtins.print"), self.assertRaises(OSError):
+            self._run_engine(self._make_config())
+
+        for i in (0, 1, 3, 4):
+            self.assertIn(f"Page {i}", self._read_output(f"page_{i}.html"))
+
+    def test_unchanged_outputs_are_not_written_again(self):
+        """With the if-changed output write mode, a second build must leave every output untouched."""
+        self._write_source_file("style.css", "body { margin: 0; }")
+        config = self._make_config()
+        config.outputWrite = "if-changed"
+        config.rssFeeds = [RssFeed(title="All", description="All pages", link="https://example.com",
+                                   feed_url="https://example.com/rss.xml", language="en", matcher="*.md",
+                                   outputLocation=Path("rss.xml"), limit=None)]
+        with patch("builtins.print"):
+            self._run_engine(config)
+        outputs = [self.destination_dir / name for name in ("test.html", "style.css", "rss.xml")]
+        for output in outputs:
+            os.utime(output, ns=(0, 0))
+
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs), patch("builtins.print") as mock_print:
+                self._run_engine(config, jobs=jobs)
+
+                logs = [str(call.args[0]) for call in mock_print.call_args_list]
+                self.assertIn("Pages: 0 written, 1 unchanged", logs)
+                self.assertIn("Feeds: 0 written, 1 unchanged", logs)
+                self.assertIn("Assets: 0 copied (0 B), 0 linked (0 B), 1 skipped (19 B)", logs)
+                self.assertEqual([output.stat().st_mtime_ns for output in outputs], [0, 0, 0])
+
+    def test_changed_page_is_written_again(self):
+        config = self._make_config()
+        config.outputWrite = "if-changed"
+        with patch("builtins.print"):
+            self._run_engine(config)
+        self._write_source_file(self.md_file, SAMPLE_MARKDOWN.replace("Hello World", "Hello Again"))
+
+        with patch("builtins.print") as mock_print:
+            self._run_engine(config)
+
+        self.assertIn("Pages: 1 written, 0 unchanged", [str(call.args[0]) for call in mock_print.call_args_list])
+        self.assertIn("Hello Again", self._read_output("test.html"))
+
+
+class TestEngineHtmlCache(TestEngineBase):
+    def setUp(self):
+        super().setUp()
+        # The last-edit index shares the cache directory, but needs a real repository.
+        patcher = patch("ssg.engine.engine.get_last_edit_time_for_files_cached", return_value={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fresh_destination_reuses_cached_html(self):
+        """A build on a new machine restoring the cache directory must not convert unchanged pages again."""
+        self._write_source_file("other.md", "# Other")
+        config = self._make_config()
+        config.cacheDir = self.workspace_dir / "cache"
+        with patch("builtins.print"):
+            self._run_engine(config)
+        first_build = self._read_output("test.html")
+
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                config.destination = self.workspace_dir / f"destination-{jobs}"
+                config.destination.mkdir()
+                with patch("builtins.print") as mock_print:
+                    self._run_engine(config, jobs=jobs)
+
+                logs = [str(call.args[0]) for call in mock_print.call_args_list]
+                self.assertIn("HTML cache: 2 hits, 0 misses", logs)
+                self.assertEqual((config.destination / "test.html").read_text(encoding="utf-8"), first_build)
+
+    def test_changed_page_is_converted_again(self):
+        config = self._make_config()
+        config.cacheDir = self.workspace_dir / "cache"
+        with patch("builtins.print"):
+            self._run_engine(config)
+        self._write_source_file(self.md_file, "# Changed")
+
+        with patch("builtins.print") as mock_print:
+            self._run_engine(config)
+
+        self.assertIn("HTML cache: 0 hits, 1 misses", [str(call.args[0]) for call in mock_print.call_args_list])
+        self.assertIn("Changed", self._read_output("test.html"))
+
+
+class TestEngineProfile(TestEngineBase):
+    def test_stages_and_pages_are_recorded(self):
+        """A profiled build must record the time of every stage and the cost of every page."""
+        self._write_source_file("images/logo.png", "png")
+        self._write_source_file("articles/post.md", "# Post")
+        profiler = BuildProfiler()
+
+        with patch("builtins.print"):
+            self._run_engine(self._make_config(), profiler=profiler)
+
+        self.assertEqual(set(profiler.stages), {"tree_walk", "git_index", "meta", "markdown_read",
+                                                "markdown_conversion", "template_embedding", "html_write",
+                                                "asset_copy", "feed_generation"})
+        self.assertEqual(profiler.stages["html_write"].calls, 2)
+        self.assertEqual(profiler.stages["asset_copy"].calls, 1)
+        self.assertEqual(set(profiler.pages), {"test.md", "articles/post.md"})
+        self.assertGreater(profiler.wall, 0)
+
+    def test_pages_rendered_in_parallel_are_recorded(self):
+        """The time spent on pages in worker processes must be reported to the profiler of the build."""
+        for i in range(10):
+            self._write_source_file(f"page_{i}.md", f"# Page {i}")
+        profiler = BuildProfiler()
+
+        with patch("builtins.print"):
+            self._run_engine(self._make_config(), jobs=2, profiler=profiler)
+
+        self.assertEqual(profiler.stages["markdown_conversion"].calls, 11)
+        self.assertEqual(len(profiler.pages), 11)
+        self.assertIn("html_write", profiler.pages["page_3.md"])
+
+
+class TestEngineIncremental(TestEngineBase):
+    def _run_incremental(self, config: Config, git_timestamps=None) -> list[Path]:
+        """Run an incremental build and return the destination paths of the pages that were rendered."""
+        with patch("ssg.engine.engine.TemplateEngine.render", autospec=True) as mock_render:
+            mock_render.side_effect = lambda engine, file, article, destination_path, writer=None: \
+                destination_path.write_text(article.title, encoding="utf-8")
+            self._run_engine(config, git_timestamps, incremental=True)
+            return [call.args[3] for call in mock_render.call_args_list]
+
+    def test_manifest_written_only_in_incremental_mode(self):
+        """The build manifest must only be written to the destination when running incrementally."""
+        self._run_engine(self._make_config())
+        self.assertFalse((self.destination_dir / MANIFEST_FILE_NAME).exists())
+
+        self._run_engine(self._make_config(), incremental=True)
+        self.assertTrue((self.destination_dir / MANIFEST_FILE_NAME).exists())
+
+    def test_first_build_renders_every_page(self):
+        """Without a manifest every page must be rendered."""
+        self._write_source_file("other.md", "# Other")
+
+        rendered = self._run_incremental(self._make_config())
+
+        self.assertEqual({p.name for p in rendered}, {"test.html", "other.html"})
+
+    def test_unchanged_pages_are_not_rendered_again(self):
+        """A second build without changes must not render any page."""
+        self._run_incremental(self._make_config())
+
+        self.assertEqual(self._run_incremental(self._make_config()), [])
+
+    def test_changed_page_is_rendered_again(self):
+        """Only the page whose source changed must be rendered again."""
+        self._write_source_file("other.md", "# Other")
+        self._run_incremental(self._make_config())
+
+        self._write_source_file("other.md", "# Other, edited")
+        rendered = self._run_incremental(self._make_config())
+
+        self.assertEqual([p.name for p in rendered], ["other.html"])
+
+    def test_frame_change_renders_pages_again(self):
+        """Changing the frame must render the pages using it again."""
+        self._run_incremental(self._make_config())
+
+        self._write_source_file(self.frame_file, MINIMAL_FRAME_HTML.replace("Test Site", "New Site"))
+        rendered = self._run_incremental(self._make_config())
+
+        self.assertEqual([p.name for p in rendered], ["test.html"])
+
+    def test_last_edit_time_change_renders_page_again(self):
+        """A new git last-edit time must render the page again, since it is part of the output."""
+        self._run_incremental(self._make_config())
+
+        timestamp = datetime(2025, 6, 15, 12, 0, 0, tzinfo=UTC)
+        rendered = self._run_incremental(self._make_config(), {self.source_dir / self.md_file: timestamp})
+
+        self.assertEqual([p.name for p in rendered], ["test.html"])
+
+    def test_missing_output_is_rendered_again(self):
+        """A page whose output was deleted must be rendered again."""
+        self._run_incremental(self._make_config())
+
+        (self.destination_dir / "test.html").unlink()
+        rendered = self._run_incremental(self._make_config())
+
+        self.assertEqual([p.name for p in rendered], ["test.html"])
+
+    def test_config_change_triggers_full_build(self):
+        """Changing the configuration must render every page again."""
+        self._run_incremental(self._make_config())
+
+        config = self._make_config()
+        config.hostname = "other.example.com"
+        rendered = self._run_incremental(config)
+
+        self.assertEqual([p.name for p in rendered], ["test.html"])
+
+    def test_feeds_include_cached_entries(self):
+        """RSS feeds must still contain the entries of pages that were not rendered again."""
+        config = self._make_config()
+        config.rssFeeds = [RssFeed(title="All", description="All posts", link="https://example.com/",
+                                   feed_url="https://example.com/rss.xml", language="en", matcher="*.md",
+                                   limit=None, outputLocation=Path("rss.xml"))]
+        timestamp = datetime(2025, 6, 15, 12, 0, 0, tzinfo=UTC)
+        git_timestamps = {self.source_dir / self.md_file: timestamp}
+
+        self._run_incremental(config, git_timestamps)
+        (self.destination_dir / "rss.xml").unlink()
+        rendered = self._run_incremental(config, git_timestamps)
+
+        self.assertEqual(rendered, [])
+        feed = self._read_output("rss.xml")
+        self.assertIn("Hello World", feed)
+        self.assertIn("https://example.com/test.html", feed)
+
+
+class TestEnginePrune(TestEngineBase):
+    def _build(self):
+        with patch("builtins.print"):
+            self._run_engine(self._make_config())
+
+    def test_page_of_renamed_source_is_deleted(self):
+        self._build()
+        (self.source_dir / "test.md").rename(self.source_dir / "renamed.md")
+
+        self._build()
+
+        self.assertFalse((self.destination_dir / "test.html").exists())
+        self.assertTrue((self.destination_dir / "renamed.html").exists())
+
+    def test_outputs_of_deleted_folder_are_deleted(self):
+        self._write_source_file("articles/post.md", "# Post")
+        self._write_source_file("articles/images/photo.png", "png")
+        self._build()
+
+        shutil.rmtree(self.source_dir / "articles")
+        self._build()
+
+        self.assertFalse((self.destination_dir / "articles").exists())
+
+    def test_files_not_written_by_the_engine_are_kept(self):
+        self._write_source_file("articles/post.md", "# Post")
+        self._build()
+        self._write_destination_file("CNAME", "example.com")
+        self._write_destination_file("articles/notes.txt", "notes")
+
+        (self.source_dir / "articles/post.md").unlink()
+        (self.source_dir / "articles").rmdir()
+        self._build()
+
+        self.assertFalse((self.destination_dir / "articles/post.html").exists())
+        self.assertTrue((self.destination_dir / "articles/notes.txt").exists())
+        self.assertTrue((self.destination_dir / "CNAME").exists())
+
+    def test_nothing_is_deleted_without_record_of_previous_build(self):
+        self._write_destination_file("old.html", "old")
+
+        self._build()
+
+        self.assertTrue((self.destination_dir / "old.html").exists())
+
+    def _write_destination_file(self, relative_path: str, content: str):
+        path = self.destination_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+
 class TestGetLastEditedForMarkdownFiles(TestEngineBase):
     def test_get_last_edited_only_passes_markdown_files_to_git(self):
         """Only .md file paths are forwarded to the git client; other files are ignored."""
@@ -264,3 +620,154 @@ class TestGetLastEditedForMarkdownFiles(TestEngineBase):
             passed_paths = mock_instance.get_last_edit_time_for_files.call_args[0][0]
             self.assertTrue(any(p.name == "index.md" for p in passed_paths))
             self.assertTrue(any(p.name == "article.md" for p in passed_paths))
+
+
+class TestEngineUpdate(TestEngineBase):
+    def setUp(self):
+        super().setUp()
+        patcher = patch("ssg.engine.engine.git.GitClient")
+        mock_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.git_client = MagicMock()
+        self.git_client.get_last_edit_time_for_files.return_value = {}
+        self.git_client.get_head.return_value = "head"
+        mock_class.return_value = self.git_client
+
+        self.config = self._make_config()
+        self.config.rssFeeds = [
+            RssFeed(title="All", description="All", link="https://example.com/", feed_url="https://example.com/all.xml",
+                    language="en", matcher="*.md", limit=None, outputLocation=Path("all.xml")),
+            RssFeed(title="Posts", description="Posts", link="https://example.com/",
+                    feed_url="https://example.com/posts.xml", language="en", matcher="posts/*.md", limit=None,
+                    outputLocation=Path("posts.xml")),
+        ]
+        self._write_source_file("other.md", "# Other")
+        self._write_source_file("style.css", "body {}")
+        self.engine = Engine(self.config)
+        with patch("builtins.print"):
+            self.engine.run()
+
+    def _update(self, *paths: str):
+        with patch("builtins.print"):
+            return self.engine.update({Path(path) for path in paths})
+
+    def test_nothing_changed(self):
+        self.assertTrue(self._update().is_empty())
+
+    def test_nothing_changed_does_not_scan_source(self):
+        with patch("ssg.engine.engine.create_directory_tree") as scan, \
+                patch("ssg.engine.engine.build_fingerprint") as fingerprint:
+            self._update()
+
+        scan.assert_not_called()
+        fingerprint.assert_not_called()
+
+    def test_recorded_fingerprint_matches_full_build(self):
+        self._write_source_file("test.md", "# Changed Title")
+        self._write_source_file("posts/new.md", "# New Post")
+
+        self._update("test.md", "posts/new.md")
+
+        fingerprint = OutputRecord.load(self.destination_dir).fingerprint
+        with patch("builtins.print"):
+            Engine(self.config).run()
+        self.assertEqual(fingerprint, OutputRecord.load(self.destination_dir).fingerprint)
+
+    def test_changed_page_is_rendered_again(self):
+        self._write_source_file("test.md", "# Changed Title")
+
+        update = self._update("test.md")
+
+        self.assertEqual(update.pages, [Path("test.md")])
+        self.assertIn("Changed Title", self._read_output("test.html"))
+        self.assertNotIn("Changed Title", self._read_output("other.html"))
+
+    def test_only_feeds_matching_changed_page_are_written(self):
+        (self.destination_dir / "posts.xml").unlink()
+
+        update = self._update("test.md")
+
+        self.assertEqual(update.feeds, ["All"])
+        self.assertFalse((self.destination_dir / "posts.xml").exists())
+
+    def test_new_page_is_rendered(self):
+        self._write_source_file("posts/new.md", "# New Post")
+
+        update = self._update("posts/new.md")
+
+        self.assertEqual(update.pages, [Path("posts/new.md")])
+        self.assertEqual(update.feeds, ["All", "Posts"])
+        self.assertIn("New Post", self._read_output("posts/new.html"))
+
+    def test_deleted_page_is_removed(self):
+        (self.source_dir / "other.md").unlink()
+
+        update = self._update("other.md")
+
+        self.assertEqual(update.removed, [Path("other.md")])
+        self.assertFalse((self.destination_dir / "other.html").exists())
+        self.assertNotIn("other.html", self._read_output("all.xml"))
+
+    def test_changed_asset_is_synced_again(self):
+        self._write_source_file("style.css", "body { margin: 0; }")
+
+        update = self._update("style.css")
+
+        self.assertEqual((update.pages, update.assets), ([], [Path("style.css")]))
+        self.assertEqual(self._read_output("style.css"), "body { margin: 0; }")
+
+    def test_deleted_asset_is_removed(self):
+        (self.source_dir / "style.css").unlink()
+
+        self._update("style.css")
+
+        self.assertFalse((self.destination_dir / "style.css").exists())
+
+    def test_deleted_folder_is_removed(self):
+        self._write_source_file("posts/new.md", "# New Post")
+        self._update("posts/new.md")
+        (self.source_dir / "posts/new.md").unlink()
+        (self.source_dir / "posts").rmdir()
+
+        self._update("posts/new.md")
+
+        self.assertFalse((self.destination_dir / "posts").exists())
+
+    def test_changed_frame_renders_its_pages_again(self):
+        self._write_source_file(self.frame_file, MINIMAL_FRAME_HTML.replace("<body>", "<body><p>New frame</p>"))
+
+        update = self._update(self.frame_file.as_posix())
+
+        self.assertEqual(update.pages, [Path("other.md"), Path("test.md")])
+        self.assertIn("New frame", self._read_output("test.html"))
+
+    def test_new_cover_image_renders_its_page_again(self):
+        self._write_source_file("img-test/cover.png", "png")
+
+        update = self._update("img-test/cover.png")
+
+        self.assertEqual(update.pages, [Path("test.md")])
+        self.assertIn("https://example.com/img-test/cover.png", self._read_output("test.html"))
+
+    def test_moved_head_renders_pages_with_new_last_edit_time_again(self):
+        self.git_client.get_head.return_value = "new head"
+        self.git_client.get_last_edit_time_for_files.return_value = {
+            self.source_dir / "other.md": datetime(2025, 1, 1, tzinfo=UTC)
+        }
+
+        update = self._update()
+
+        self.assertEqual(update.pages, [Path("other.md")])
+        self.assertIn("2025-01-01", self._read_output("other.html"))
+
+    def test_dependencies_are_recorded(self):
+        dependencies = self.engine.dependencies.outputs
+
+        self.assertEqual(dependencies["test.html"].frame, self.frame_file.as_posix())
+        self.assertEqual(dependencies["test.html"].cover_pattern, "*img-test/cover.*")
+        self.assertEqual(dependencies["test.html"].meta_matcher, "*.md")
+        self.assertEqual(dependencies["test.html"].feeds, ["All"])
+        self.assertEqual(dependencies["style.css"].kind, "asset")
+        self.assertEqual(set(dependencies["all.xml"].pages), {"other.md", "test.md"})
+        self.assertEqual(dependencies["posts.xml"].pages, [])
+        self.assertNotIn(self.frame_file.as_posix(), dependencies)
@@ -1,12 +1,16 @@
 import os
+import random
+import tempfile
 from datetime import UTC, datetime
 from pathlib import Path
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
 import pygit2
+from pygit2.enums import FileMode, SortMode
 
-from ssg.git import GitClient
+from ssg.git import GitClient, PathTrie
+from ssg.git.last_edit_index import INDEX_FILE_NAME, LastEditIndex, get_last_edit_time_for_files_cached
 
 
 class TestGitClient(TestCase):
@@ -23,11 +27,30 @@ class TestGitClient(TestCase):
             self.client = GitClient(self.repo_root)
 
     @staticmethod
-    def _make_patch(repo_relative_path: str) -> MagicMock:
-        """Return a mock pygit2 diff patch for the given repo-relative path."""
-        p = MagicMock()
-        p.delta.new_file.path = repo_relative_path
-        return p
+    def _make_tree(files: dict[str, str]) -> MagicMock:
+        """Return a mock pygit2 tree holding the given repo-relative paths, mapped to the OIDs of their blobs."""
+        subtrees: dict[str, dict[str, str]] = {}
+        entries = {}
+        for path, oid in files.items():
+            name, _, rest = path.partition('/')
+            if rest:
+                subtrees.setdefault(name, {})[rest] = oid
+            else:
+                entries[name] = MagicMock(spec=pygit2.Blob, id=oid, filemode=FileMode.BLOB)
+        for name, subtree_files in subtrees.items():
+            entries[name] = TestGitClient._make_tree(subtree_files)
+
+        tree = MagicMock(spec=pygit2.Tree, id=repr(sorted(files.items())), filemode=FileMode.TREE)
+        tree.__contains__.side_effect = entries.__contains__
+        tree.__getitem__.side_effect = entries.__getitem__
+        return tree
+
+    @staticmethod
+    def _set_changes(commit: MagicMock, *repo_relative_paths: str):
+        """Give a mock commit and its parent trees which differ only by the content of the given paths."""
+        commit.tree = TestGitClient._make_tree({path: f'new {path}' for path in repo_relative_paths})
+        for parent in commit.parents:
+            parent.tree = TestGitClient._make_tree({path: f'old {path}' for path in repo_relative_paths})
 
     @staticmethod
     def _make_commit(commit_time: int, parent: MagicMock | None = None) -> tuple[MagicMock, MagicMock|None]:
@@ -46,7 +69,7 @@ class TestGitClient(TestCase):
 
         self.mock_repo.status.return_value = {}
         self.mock_repo.walk.return_value = iter([commit])
-        self.mock_repo.diff.return_value = [self._make_patch('src/index.md')]
+        self._set_changes(commit, 'src/index.md')
 
         result = self.client.get_last_edit_time_for_files({file_path})
 
@@ -59,7 +82,7 @@ class TestGitClient(TestCase):
 
         self.mock_repo.status.return_value = {}
         self.mock_repo.walk.return_value = iter([commit])
-        self.mock_repo.diff.return_value = [self._make_patch('src/other.md')]
+        self._set_changes(commit, 'src/other.md')
 
         result = self.client.get_last_edit_time_for_files({file_path})
 
@@ -76,14 +99,14 @@ class TestGitClient(TestCase):
         self.assertNotIn(file_path, result)
 
     def test_get_last_edit_time_root_commit_inspected(self):
-        """A root commit (no parents) is diffed against an empty tree so that
+        """A root commit (no parents) is compared against an empty tree so that
         files introduced in the initial commit still receive a timestamp."""
         file_path = self.repo_root / 'src' / 'index.md'
         ts = 1_700_000_000
         root_commit = MagicMock()
         root_commit.parents = []
         root_commit.commit_time = ts
-        root_commit.tree.diff_to_tree.return_value = [self._make_patch('src/index.md')]
+        self._set_changes(root_commit, 'src/index.md')
 
         self.mock_repo.status.return_value = {}
         self.mock_repo.walk.return_value = iter([root_commit])
@@ -91,9 +114,7 @@ class TestGitClient(TestCase):
         result = self.client.get_last_edit_time_for_files({file_path})
 
         self.assertEqual(result[file_path], datetime.fromtimestamp(ts, UTC))
-        # The root commit must be diffed against an empty tree (swap=True),
-        # not via repo.diff(parent, commit).
-        root_commit.tree.diff_to_tree.assert_called_once_with(swap=True)
+        # Only tree entries are compared, no diff is computed.
         self.mock_repo.diff.assert_not_called()
 
     def test_get_last_edit_time_multiple_files_in_different_commits(self):
@@ -104,14 +125,9 @@ class TestGitClient(TestCase):
         commit_a, parent_a = self._make_commit(ts_a)
         commit_b, parent_b = self._make_commit(ts_b)
 
-        def diff_side_effect(_, commit):
-            if commit is commit_a:
-                return [self._make_patch('src/a.md')]
-            if commit is commit_b:
-                return [self._make_patch('src/b.md')]
-            return []
+        self._set_changes(commit_a, 'src/a.md')
+        self._set_changes(commit_b, 'src/b.md')
 
-        self.mock_repo.diff.side_effect = diff_side_effect
         self.mock_repo.walk.return_value = iter([commit_a, commit_b])
         self.mock_repo.status.return_value = {}
 
@@ -136,20 +152,290 @@ class TestGitClient(TestCase):
         ts = 1_700_000_000
         first_commit, first_parent = self._make_commit(ts)
 
-        # Second commit intentionally has a parent so it WOULD be diffed if reached.
+        # Second commit intentionally touches the file too so it WOULD be compared if reached.
         second_commit, second_parent = self._make_commit(ts - 1000)
 
-        def diff_side_effect(_, commit):
-            if commit is first_commit:
-                return [self._make_patch('src/index.md')]
-            return []
-
-        self.mock_repo.diff.side_effect = diff_side_effect
-        self.mock_repo.walk.return_value = iter([first_commit, second_commit])
+        self._set_changes(first_commit, 'src/index.md')
+        self._set_changes(second_commit, 'src/index.md')
+        commits = iter([first_commit, second_commit])
+        self.mock_repo.walk.return_value = commits
         self.mock_repo.status.return_value = {}
 
         result = self.client.get_last_edit_time_for_files({file_path})
 
-        self.assertIn(file_path, result)
-        # Diff must have been called exactly once — the loop broke before second_commit
-        self.mock_repo.diff.assert_called_once_with(first_parent, first_commit)
+        self.assertEqual(result[file_path], datetime.fromtimestamp(ts, UTC))
+        # The walk must not have been advanced past first_commit — the loop broke before second_commit
+        self.assertIs(next(commits), second_commit)
+
+
+class GitRepositoryTestCase(TestCase):
+    """Base class creating a throw-away git repository whose commits are built directly through pygit2."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+        self.repo_root = Path(self.temp_dir.name).resolve()
+        self.repo = pygit2.init_repository(str(self.repo_root))
+
+    def _commit(self,
+                changes: dict[str, str | None],
+                commit_time: int,
+                parents: list[pygit2.Oid] | None = None,
+                update_head: bool = True,
+                file_mode: int = FileMode.BLOB) -> pygit2.Oid:
+        """
+        Create a commit on top of ``parents`` (HEAD by default) applying ``changes``, which map repo-relative paths
+        to their new content, or to None for deleting them.
+        """
+        if parents is None:
+            parents = [] if self.repo.head_is_unborn else [self.repo.head.target]
+
+        index = pygit2.Index()
+        if parents:
+            index.read_tree(self.repo[parents[0]].tree)
+        for path, content in changes.items():
+            if content is None:
+                index.remove(path)
+            else:
+                index.add(pygit2.IndexEntry(path, self.repo.create_blob(content.encode()), file_mode))
+        tree = index.write_tree(self.repo)
+
+        signature = pygit2.Signature('Test', 'test@example.com', commit_time, 0)
+        oid = self.repo.create_commit('HEAD' if update_head else None, signature, signature,
+                                      f'Commit at {commit_time}', tree, parents)
+        if update_head:
+            # Keep the repository index in sync with HEAD, so committed files are not reported as new.
+            self.repo.index.read_tree(tree)
+            self.repo.index.write()
+        return oid
+
+    def _path(self, repo_relative_path: str) -> Path:
+        return self.repo_root / repo_relative_path
+
+    @staticmethod
+    def _time(timestamp: int) -> datetime:
+        return datetime.fromtimestamp(timestamp, UTC)
+
+
+class TestGitClientRepository(GitRepositoryTestCase):
+    """Tree walk on real repositories, including the cases the mocks above cannot describe."""
+
+    def test_get_last_edit_time_empty_repository(self):
+        """A repository without commits returns an empty dict."""
+        self.assertEqual(GitClient(self.repo_root).get_last_edit_time_for_files({self._path('a.md')}), {})
+
+    def test_get_last_edit_time_nested_directories(self):
+        """Changes in sibling directories do not affect files in unchanged subtrees."""
+        self._commit({'docs/a/page.md': 'page', 'docs/b/page.md': 'page'}, 1_600_000_000)
+        self._commit({'docs/b/page.md': 'page 2', 'assets/big.bin': 'data'}, 1_700_000_000)
+
+        result = GitClient(self.repo_root).get_last_edit_time_for_files({self._path('docs/a/page.md'),
+                                                                         self._path('docs/b/page.md')})
+
+        self.assertEqual(result[self._path('docs/a/page.md')], self._time(1_600_000_000))
+        self.assertEqual(result[self._path('docs/b/page.md')], self._time(1_700_000_000))
+
+    def test_get_last_edit_time_file_mode_change_counts_as_edit(self):
+        """Changing only the file mode of a file is an edit, as it is reported by a diff."""
+        self._commit({'run.md': 'content'}, 1_600_000_000)
+        self._commit({'run.md': 'content'}, 1_700_000_000, file_mode=FileMode.BLOB_EXECUTABLE)
+
+        result = GitClient(self.repo_root).get_last_edit_time_for_files({self._path('run.md')})
+
+        self.assertEqual(result[self._path('run.md')], self._time(1_700_000_000))
+
+    def test_get_last_edit_time_merge_uses_first_parent(self):
+        """A merge commit is compared with its first parent only."""
+        base = self._commit({'main.md': 'main', 'side.md': 'side'}, 1_600_000_000)
+        side = self._commit({'side.md': 'side 2'}, 1_650_000_000, parents=[base], update_head=False)
+        main = self._commit({'main.md': 'main 2'}, 1_660_000_000)
+        merge_tree = self.repo[main].tree
+        index = pygit2.Index()
+        index.read_tree(merge_tree)
+        index.add(pygit2.IndexEntry('side.md', self.repo[side].tree['side.md'].id, FileMode.BLOB))
+        signature = pygit2.Signature('Test', 'test@example.com', 1_700_000_000, 0)
+        self.repo.create_commit('HEAD', signature, signature, 'Merge', index.write_tree(self.repo), [main, side])
+
+        result = GitClient(self.repo_root).get_last_edit_time_for_files({self._path('main.md'),
+                                                                         self._path('side.md')})
+
+        self.assertEqual(result[self._path('main.md')], self._time(1_660_000_000))
+        self.assertEqual(result[self._path('side.md')], self._time(1_700_000_000))
+
+    def test_get_last_edit_time_matches_full_diff_walk(self):
+        """On a random history the results match a walk that diffs every commit against its first parent."""
+        rng = random.Random(42)
+        paths = [f'{d}/{n}.md' for d in ('a', 'a/b', 'c', 'c/d/e') for n in range(4)] + ['root.md']
+        present: set[str] = set()
+        for i in range(60):
+            changes = {}
+            for path in rng.sample(paths, rng.randint(1, 4)):
+                if path in present and rng.random() < 0.2:
+                    changes[path] = None
+                    present.discard(path)
+                else:
+                    changes[path] = f'{path} {i}'
+                    present.add(path)
+            self._commit(changes, 1_600_000_000 + i * 60)
+
+        wanted = {self._path(path) for path in paths}
+        result = GitClient(self.repo_root).get_last_edit_time_for_files(wanted)
+
+        self.assertEqual(result, self._diff_walk(wanted))
+
+    def _diff_walk(self, file_paths: set[Path]) -> dict[Path, datetime]:
+        to_find = {path.relative_to(self.repo_root): path for path in file_paths}
+        last_edited = {}
+        for commit in self.repo.walk(self.repo.head.target, SortMode.TOPOLOGICAL | SortMode.TIME):
+            if commit.parents:
+                diff = self.repo.diff(commit.parents[0], commit)
+            else:
+                diff = commit.tree.diff_to_tree(swap=True)
+            for patch in diff:
+                path = Path(patch.delta.new_file.path)
+                if path in to_find:
+                    last_edited[to_find.pop(path)] = self._time(commit.commit_time)
+        return last_edited
+
+
+class TestLastEditIndex(GitRepositoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = Path(self.temp_dir.name) / 'cache'
+
+    def _lookup(self,
+                repo_relative_paths: set[str],
+                prune: bool = True) -> tuple[dict[Path, datetime], list[pygit2.Oid]]:
+        """Run a cached lookup and return its result along with the commits walked."""
+        client = GitClient(self.repo_root)
+        walked = []
+        walk = client.repo.walk
+
+        def recording_walk(*args):
+            walker = walk(*args)
+            original_hide = walker.hide
+
+            class RecordingWalker:
+                def hide(self, oid):
+                    original_hide(oid)
+
+                def __iter__(self):
+                    for commit in walker:
+                        walked.append(commit.id)
+                        yield commit
+
+            return RecordingWalker()
+
+        client.repo.walk = recording_walk
+        paths = {self._path(path) for path in repo_relative_paths}
+        return get_last_edit_time_for_files_cached(client, paths, self.cache_dir, prune), walked
+
+    def test_index_written_with_head(self):
+        """The index is saved in the cache directory along with the HEAD it was computed at."""
+        head = self._commit({'a.md': 'a'}, 1_600_000_000)
+
+        self._lookup({'a.md'})
+
+        index = LastEditIndex.load(self.cache_dir)
+        self.assertTrue((self.cache_dir / INDEX_FILE_NAME).exists())
+        self.assertEqual(index.head, str(head))
+        self.assertEqual(index.entries, {'a.md': self._time(1_600_000_000).isoformat()})
+
+    def test_unchanged_head_does_not_walk_history(self):
+        """When HEAD did not move, the result comes from the index without walking any commit."""
+        self._commit({'a.md': 'a'}, 1_600_000_000)
+        first, _ = self._lookup({'a.md'})
+
+        second, walked = self._lookup({'a.md'})
+
+        self.assertEqual(walked, [])
+        self.assertEqual(first, second)
+
+    def test_only_new_commits_are_walked(self):
+        """After new commits, only the commits made since the cached HEAD are walked."""
+        self._commit({'a.md': 'a', 'b.md': 'b'}, 1_600_000_000)
+        self._commit({'b.md': 'b2'}, 1_650_000_000)
+        self._lookup({'a.md', 'b.md'})
+
+        new_commit = self._commit({'a.md': 'a2'}, 1_700_000_000)
+        result, walked = self._lookup({'a.md', 'b.md'})
+
+        self.assertEqual(walked, [new_commit])
+        self.assertEqual(result[self._path('a.md')], self._time(1_700_000_000))
+        self.assertEqual(result[self._path('b.md')], self._time(1_650_000_000))
+
+    def test_new_path_is_looked_up_in_full_history(self):
+        """A path missing from the index is looked up in the whole history."""
+        self._commit({'a.md': 'a', 'old.md': 'old'}, 1_600_000_000)
+        self._commit({'a.md': 'a2'}, 1_650_000_000)
+        self._lookup({'a.md'})
+
+        result, _ = self._lookup({'a.md', 'old.md'})
+
+        self.assertEqual(result[self._path('a.md')], self._time(1_650_000_000))
+        self.assertEqual(result[self._path('old.md')], self._time(1_600_000_000))
+
+    def test_force_push_falls_back_to_full_walk(self):
+        """When the cached HEAD is no longer an ancestor of HEAD, the index is rebuilt from a full walk."""
+        base = self._commit({'a.md': 'a'}, 1_600_000_000)
+        self._commit({'a.md': 'rewritten later'}, 1_650_000_000)
+        self._lookup({'a.md'})
+
+        # Rewrite history: HEAD now points to a commit which does not descend from the cached HEAD.
+        self.repo.head.set_target(base)
+        self._commit({'b.md': 'b'}, 1_700_000_000)
+        result, _ = self._lookup({'a.md'})
+
+        self.assertEqual(result[self._path('a.md')], self._time(1_600_000_000))
+
+    def test_unknown_cached_head_falls_back_to_full_walk(self):
+        """A cached HEAD which does not exist in the repository is ignored."""
+        self._commit({'a.md': 'a'}, 1_600_000_000)
+        LastEditIndex(head='0' * 40, entries={'a.md': self._time(1).isoformat()}).save(self.cache_dir)
+
+        result, _ = self._lookup({'a.md'})
+
+        self.assertEqual(result[self._path('a.md')], self._time(1_600_000_000))
+
+    def test_deleted_paths_are_dropped_from_index(self):
+        """Paths which are no longer requested are removed from the index."""
+        self._commit({'a.md': 'a', 'b.md': 'b'}, 1_600_000_000)
+        self._lookup({'a.md', 'b.md'})
+
+        self._lookup({'a.md'})
+
+        self.assertEqual(set(LastEditIndex.load(self.cache_dir).entries), {'a.md'})
+
+    def test_partial_lookup_keeps_other_entries_up_to_date(self):
+        """A lookup of part of the files, e.g. by a shard, keeps and updates the entries of the other files."""
+        self._commit({'a.md': 'a', 'b.md': 'b'}, 1_600_000_000)
+        self._lookup({'a.md', 'b.md'})
+        self._commit({'b.md': 'b2'}, 1_700_000_000)
+
+        self._lookup({'a.md'}, prune=False)
+        result, walked = self._lookup({'b.md'}, prune=False)
+
+        self.assertEqual(walked, [])
+        self.assertEqual(result[self._path('b.md')], self._time(1_700_000_000))
+        self.assertEqual(set(LastEditIndex.load(self.cache_dir).entries), {'a.md', 'b.md'})
+
+    def test_save_replaces_index(self):
+        """The index is written to a temporary file replacing the previous index, which is never left behind."""
+        LastEditIndex(head='1' * 40, entries={'a.md': None}).save(self.cache_dir)
+        LastEditIndex(head='2' * 40, entries={'b.md': None}).save(self.cache_dir)
+
+        self.assertEqual([path.name for path in self.cache_dir.iterdir()], [INDEX_FILE_NAME])
+        self.assertEqual(LastEditIndex.load(self.cache_dir).entries, {'b.md': None})
+
+
+class TestPathTrie(TestCase):
+    def test_remove_prunes_empty_directories(self):
+        trie = PathTrie({Path('a/b/c.md'), Path('a/d.md')})
+
+        trie.remove(Path('a/b/c.md'))
+        self.assertEqual(trie.root, {'a': {'d.md': None}})
+
+        trie.remove(Path('a/d.md'))
+        self.assertEqual(trie.root, {})
+        self.assertFalse(trie)
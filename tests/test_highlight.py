@@ -0,0 +1,157 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+import pygments
+import pygments.lexers
+
+from ssg.config.config import Config, SyntaxHighlight
+from ssg.content.highlight import CodeHighlighter, _lexer
+from ssg.content.html_cache import HtmlCache
+from ssg.content.markdown_file import MarkDownFile
+from ssg.engine.outputs import OutputRecord
+from tests.test_engine import TestEngineBase
+
+CODE_MARKDOWN = """\
+# Code
+
+```python
+if a < b:
+    print("x")
+```
+
+```
+plain <text>
+```
+
+```no-such-language
+text
+```
+"""
+
+
+class TestCodeHighlighter(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache_directory = Path(self.temp_dir.name) / 'highlight'
+
+    def _highlighter(self, settings: SyntaxHighlight | None = None) -> CodeHighlighter:
+        return CodeHighlighter(settings or SyntaxHighlight(), HtmlCache(self.cache_directory, 1024 * 1024))
+
+    def test_code_blocks_with_known_language_are_highlighted(self):
+        html = MarkDownFile(CODE_MARKDOWN).convert_to_html('https://example.com/', self._highlighter())
+
+        self.assertIn('<div class="highlight"><pre><span></span><code><span class="k">if</span>', html)
+        self.assertIn('<span class="o">&lt;</span>', html)
+        self.assertIn('<pre><code>plain &lt;text&gt;\n</code></pre>', html)
+        self.assertIn('<pre><code class="language-no-such-language">text\n</code></pre>', html)
+        self.assertNotIn('style=', html)
+
+    def test_same_block_is_lexed_once(self):
+        """A block repeated in a page, in another page or in another build must be highlighted once."""
+        markdown = MarkDownFile('```python\nx = 1\n```\n\nText\n\n```python\nx = 1\n```\n')
+
+        with patch('pygments.highlight', wraps=pygments.highlight) as highlight:
+            first = markdown.convert_to_html(None, self._highlighter())
+            second = markdown.convert_to_html(None, self._highlighter())
+
+        self.assertEqual(highlight.call_count, 1)
+        self.assertEqual(first, second)
+
+    def test_unknown_language_is_looked_up_once(self):
+        _lexer.cache_clear()
+        markdown = MarkDownFile('```no-such-language\na\n```\n\n```no-such-language\nb\n```\n')
+
+        with patch('pygments.lexers.get_lexer_by_name', wraps=pygments.lexers.get_lexer_by_name) as get_lexer:
+            first = markdown.convert_to_html(None, self._highlighter())
+            second = markdown.convert_to_html(None, self._highlighter())
+
+        self.assertEqual(get_lexer.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertIn('<code class="language-no-such-language">a\n</code>', first)
+
+    def test_code_blocks_with_other_attributes_are_left_as_they_are(self):
+        html = MarkDownFile('```{.python #example}\nx = 1\n```\n').convert_to_html(None, self._highlighter())
+
+        self.assertIn('<pre id="example"><code class="language-python">x = 1\n</code></pre>', html)
+
+    def test_key(self):
+        highlighter = self._highlighter()
+        key = highlighter.key('python', 'x = 1')
+
+        self.assertEqual(highlighter.key('Python', 'x = 1'), key)
+        self.assertNotEqual(highlighter.key('python', 'x = 2'), key)
+        self.assertNotEqual(highlighter.key('ruby', 'x = 1'), key)
+        self.assertNotEqual(self._highlighter(SyntaxHighlight(cssClass='code')).key('python', 'x = 1'), key)
+        self.assertEqual(self._highlighter(SyntaxHighlight(style='monokai')).key('python', 'x = 1'), key)
+
+    def test_stylesheet(self):
+        stylesheet = self._highlighter(SyntaxHighlight(style='monokai', cssClass='code')).stylesheet()
+
+        self.assertIn('.code .k {', stylesheet)
+        with self.assertRaisesRegex(Exception, 'Invalid syntaxHighlight style'):
+            self._highlighter(SyntaxHighlight(style='no-such-style')).stylesheet()
+
+    def test_html_cache_key_depends_on_highlighting(self):
+        markdown = MarkDownFile(CODE_MARKDOWN)
+
+        self.assertNotEqual(HtmlCache.key(markdown, None, self._highlighter()), HtmlCache.key(markdown, None))
+
+
+class TestSyntaxHighlightConfig(TestCase):
+    @staticmethod
+    def _make_config(**overrides) -> Config:
+        content = {'source': 'source', 'destination': 'destination', 'baseHref': 'https://example.com/',
+                   'hostname': 'example.com', 'frames': []}
+        content.update(overrides)
+        return Config.from_json(content)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(self._make_config().syntaxHighlight)
+
+    def test_settings(self):
+        config = self._make_config(syntaxHighlight={'style': 'monokai', 'stylesheet': 'css/code.css'})
+
+        self.assertEqual(config.syntaxHighlight,
+                         SyntaxHighlight(style='monokai', stylesheet=Path('css/code.css'), cssClass='highlight'))
+
+    def test_invalid(self):
+        for value in (True, {'style': 1}):
+            with self.assertRaisesRegex(Exception, 'Invalid syntaxHighlight'):
+                self._make_config(syntaxHighlight=value)
+
+
+class TestEngineHighlight(TestEngineBase):
+    def setUp(self):
+        super().setUp()
+        self._write_source_file('code.md', CODE_MARKDOWN)
+        self.config = self._make_config()
+        self.config.syntaxHighlight = SyntaxHighlight(stylesheet=Path('css/highlight.css'))
+
+    def _build(self):
+        with patch('builtins.print'):
+            self._run_engine(self.config)
+
+    def test_pages_share_one_stylesheet(self):
+        self._build()
+
+        self.assertIn('<span class="k">if</span>', self._read_output('code.html'))
+        self.assertIn('.highlight .k {', self._read_output('css/highlight.css'))
+        self.assertIn('css/highlight.css', OutputRecord.load(self.destination_dir).files)
+
+    def test_stylesheet_is_deleted_when_disabled(self):
+        self._build()
+        self.config.syntaxHighlight = None
+
+        self._build()
+
+        self.assertFalse((self.destination_dir / 'css/highlight.css').exists())
+        self.assertNotIn('<span class="k">if</span>', self._read_output('code.html'))
+
+    def test_stylesheet_conflicting_with_source_file(self):
+        self._write_source_file('css/highlight.css', 'pre {}')
+
+        with self.assertRaisesRegex(Exception, 'is also a file of the source folder'):
+            self._build()
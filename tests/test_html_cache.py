@@ -0,0 +1,104 @@
+import os
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from ssg.content.html_cache import HtmlCache
+from ssg.content.markdown_file import MarkDownFile
+
+
+class TestHtmlCache(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.directory = Path(self.temp_dir.name) / 'html'
+        self.cache = HtmlCache(self.directory, max_size=1024 * 1024)
+
+    def _entries(self) -> list[Path]:
+        return sorted(self.directory.rglob('*.html'))
+
+    def test_key_depends_on_every_input(self):
+        markdown = MarkDownFile('# Title', ['extra'])
+        key = HtmlCache.key(markdown, 'https://example.com/')
+
+        self.assertEqual(HtmlCache.key(MarkDownFile('# Title', ['extra']), 'https://example.com/'), key)
+        self.assertNotEqual(HtmlCache.key(MarkDownFile('# Other', ['extra']), 'https://example.com/'), key)
+        self.assertNotEqual(HtmlCache.key(MarkDownFile('# Title', ['extra', 'smarty']), 'https://example.com/'), key)
+        self.assertNotEqual(HtmlCache.key(MarkDownFile('# Title', ['extra'], {'extra': {'x': 1}}),
+                                          'https://example.com/'), key)
+        self.assertNotEqual(HtmlCache.key(markdown, 'https://other.com/'), key)
+        with patch('ssg.content.html_cache.converter_versions', return_value=(('Markdown', '0.1'),)):
+            self.assertNotEqual(HtmlCache.key(markdown, 'https://example.com/'), key)
+
+    def test_converted_once(self):
+        """The same Markdown must be converted once, then read from the cache, also by another cache instance."""
+        markdown = MarkDownFile('# Title\n\nSome *text*.\r\n')
+        expected = markdown.convert_to_html('https://example.com/')
+
+        with patch.object(MarkDownFile, 'convert_to_html', autospec=True, return_value=expected) as convert:
+            self.assertEqual(self.cache.convert(markdown, 'https://example.com/'), expected)
+            self.assertEqual(HtmlCache(self.directory, 1024).convert(markdown, 'https://example.com/'), expected)
+
+        self.assertEqual(convert.call_count, 1)
+        self.assertEqual((self.cache.stats.hits, self.cache.stats.misses), (0, 1))
+        self.assertEqual(len(self._entries()), 1)
+
+    def test_hit_updates_modification_time(self):
+        self.cache.put('ab12', '<p>x</p>')
+        entry = self._entries()[0]
+        os.utime(entry, ns=(0, 0))
+
+        self.assertEqual(self.cache.get('ab12'), '<p>x</p>')
+        self.assertGreater(entry.stat().st_mtime_ns, 0)
+
+    def test_concurrent_writes_of_same_key(self):
+        """Entries are moved into place whole, so concurrent writers and readers never see partial content."""
+        html = '<p>' + 'x' * 100_000 + '</p>'
+        seen = []
+
+        def work():
+            for _ in range(20):
+                self.cache.put('cd34', html)
+                seen.append(self.cache.get('cd34'))
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(all(content == html for content in seen))
+        self.assertEqual(self._entries(), [self.directory / 'cd' / 'cd34.html'])
+        self.assertEqual(list(self.directory.rglob('.tmp-*')), [])
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = HtmlCache(self.directory, max_size=25)
+        for index, key in enumerate(('aa01', 'bb02', 'cc03')):
+            cache.put(key, 'x' * 10)
+            os.utime(cache._path(key), ns=(index * 10**9, index * 10**9))
+        os.utime(cache._path('aa01'), ns=(5 * 10**9, 5 * 10**9))
+
+        self.assertEqual(cache.evict(), 1)
+
+        self.assertIsNone(cache.get('bb02'))
+        self.assertIsNotNone(cache.get('aa01'))
+        self.assertIsNotNone(cache.get('cc03'))
+
+    def test_stale_temporary_files_are_deleted(self):
+        self.cache.put('ab12', '<p>x</p>')
+        stale = self.directory / 'ab' / '.tmp-stale'
+        recent = self.directory / 'ab' / '.tmp-recent'
+        stale.write_text('partial', encoding='utf-8')
+        recent.write_text('partial', encoding='utf-8')
+        os.utime(stale, ns=(0, 0))
+
+        self.cache.evict()
+
+        self.assertFalse(stale.exists())
+        self.assertTrue(recent.exists())
+
+    def test_missing_directory(self):
+        self.assertIsNone(self.cache.get('ab12'))
+        self.assertEqual(self.cache.evict(), 0)
@@ -1,3 +1,4 @@
+import os
 import tempfile
 from datetime import datetime, UTC
 from pathlib import Path
@@ -5,7 +6,7 @@ from unittest import TestCase
 
 from bs4 import BeautifulSoup
 
-from ssg.template.html_file import HTMLFile
+from ssg.template.html_file import HTMLFile, write_html
 
 BASE_HTML = """\
 <!DOCTYPE html>
@@ -321,3 +322,57 @@ class TestWrite(TestCase):
             raw = dest.read_bytes()
             self.assertNotIn(b'\r\n', raw)
 
+
+    def test_write_pretty_by_default(self):
+        hf = _make_html_file('<html><head><title>T</title></head><body><div><p>x</p></div></body></html>')
+        with tempfile.TemporaryDirectory() as tmp:
+            dest = Path(tmp) / 'output.html'
+            hf.write(dest)
+            self.assertEqual(dest.read_text(encoding='utf-8'),
+                             '<html>\n<head><title>T</title></head>\n<body><div><p>x</p></div></body>\n</html>\n')
+
+    def test_write_compact(self):
+        hf = _make_html_file('<html><head><title>T</title></head><body><div><p>x</p></div></body></html>')
+        with tempfile.TemporaryDirectory() as tmp:
+            dest = Path(tmp) / 'output.html'
+            hf.write(dest, 'compact')
+            self.assertEqual(dest.read_text(encoding='utf-8'),
+                             '<html><head><title>T</title></head><body><div><p>x</p></div></body></html>')
+
+    def test_write_as_is(self):
+        hf = _make_html_file('<!DOCTYPE html><html><head><title>T</title></head><body><p>x</p></body></html>')
+        with tempfile.TemporaryDirectory() as tmp:
+            dest = Path(tmp) / 'output.html'
+            hf.write(dest, 'as-is')
+            self.assertEqual(dest.read_text(encoding='utf-8'), str(hf.soup))
+
+
+class TestWriteIfChanged(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.dest = Path(self.temp_dir.name) / 'output.html'
+
+    def _write_twice(self, output_format, second_content=BASE_HTML):
+        self.assertTrue(write_html(BASE_HTML, self.dest, output_format, if_changed=True))
+        os.utime(self.dest, ns=(0, 0))
+        return write_html(second_content, self.dest, output_format, if_changed=True)
+
+    def test_same_bytes_as_direct_write(self):
+        """Serializing in memory must produce the same file as writing directly."""
+        for output_format in ('pretty', 'compact', 'as-is'):
+            direct = Path(self.temp_dir.name) / f'direct-{output_format}.html'
+            write_html(BASE_HTML, direct, output_format)
+            write_html(BASE_HTML, self.dest, output_format, if_changed=True)
+            self.assertEqual(self.dest.read_bytes(), direct.read_bytes())
+
+    def test_unchanged_file_is_not_written(self):
+        """A file already holding the same document must keep its modification time."""
+        for output_format in ('pretty', 'as-is'):
+            self.assertFalse(self._write_twice(output_format))
+            self.assertEqual(self.dest.stat().st_mtime_ns, 0)
+
+    def test_changed_file_is_written(self):
+        self.assertTrue(self._write_twice('pretty', BASE_HTML.replace('Original', 'New')))
+        self.assertNotEqual(self.dest.stat().st_mtime_ns, 0)
+        self.assertIn('New Title', self.dest.read_text(encoding='utf-8'))
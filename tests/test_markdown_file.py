@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from ssg.content.markdown_file import MarkDownFile
+from ssg.content.markdown_file import MarkDownFile, get_converter
 
 
 class TestMarkDownFile(TestCase):
@@ -40,3 +40,73 @@ class TestMarkDownFile(TestCase):
     def test_get_title_strips_trailing_hashes(self):
         md = MarkDownFile("# Title ###\n")
         self.assertEqual(md.get_title(), 'Title')
+
+
+class TestMarkDownFileConvertToHtml(TestCase):
+    BASE_HREF = 'https://example.com'
+
+    def test_md_link_replaced_with_html(self):
+        html = MarkDownFile('[link](page.md)').convert_to_html()
+        self.assertIn('<a href="page.html">link</a>', html)
+
+    def test_md_in_middle_of_url_not_replaced(self):
+        html = MarkDownFile('[link](https://example.com/readme.md.bak)').convert_to_html()
+        self.assertIn('href="https://example.com/readme.md.bak"', html)
+
+    def test_external_link_gets_target_blank(self):
+        html = MarkDownFile('[a](https://other.com/page) [b](https://example.com/page) [c](/about)')\
+            .convert_to_html(self.BASE_HREF)
+        self.assertIn('<a href="https://other.com/page" target="_blank">a</a>', html)
+        self.assertIn('<a href="https://example.com/page">b</a>', html)
+        self.assertIn('<a href="/about">c</a>', html)
+
+    def test_external_link_without_base_href_has_no_target(self):
+        html = MarkDownFile('[a](https://other.com/page)').convert_to_html()
+        self.assertNotIn('target', html)
+
+    def test_anchor_link_added_to_h2(self):
+        html = MarkDownFile('# Title\n\n## Section One\n\n### Sub').convert_to_html()
+        self.assertIn('<h2>Section One<a class="anchor-link" href="#section-one" id="section-one">&lt;&lt;</a></h2>',
+                      html)
+        self.assertEqual(html.count('anchor-link'), 1)
+
+    def test_anchor_id_uses_rendered_heading_text(self):
+        html = MarkDownFile("## It's `code` & *more*").convert_to_html()
+        self.assertIn('id="its-code-more"', html)
+
+    def test_raw_html_links_and_headings_processed(self):
+        html = MarkDownFile('<div><a href="page.md">x</a> <a href="https://other.com">y</a></div>\n\n'
+                            '<h2>Raw Heading</h2>').convert_to_html(self.BASE_HREF)
+        self.assertIn('<a href="page.html">x</a>', html)
+        self.assertIn('<a href="https://other.com" target="_blank">y</a>', html)
+        self.assertIn('<a class="anchor-link" href="#raw-heading" id="raw-heading">&lt;&lt;</a></h2>', html)
+
+
+class TestGetConverter(TestCase):
+    def test_converter_reused_for_same_configuration(self):
+        self.assertIs(get_converter(['extra'], base_href='https://example.com'),
+                      get_converter(['extra'], base_href='https://example.com'))
+
+    def test_converter_per_configuration(self):
+        self.assertIsNot(get_converter(['extra']), get_converter(['extra', 'smarty']))
+        self.assertIsNot(get_converter(['extra'], base_href='https://a.com'),
+                         get_converter(['extra'], base_href='https://b.com'))
+
+    def test_state_does_not_leak_between_documents(self):
+        first = MarkDownFile('Text[^1]\n\n[^1]: First note.').convert_to_html()
+        second = MarkDownFile('No notes here.').convert_to_html()
+        self.assertIn('First note.', first)
+        self.assertNotIn('First note.', second)
+        self.assertNotIn('footnote', second)
+
+    def test_configured_extensions_used(self):
+        content = '"quoted"'
+        self.assertIn('&ldquo;', MarkDownFile(content).convert_to_html())
+        self.assertNotIn('&ldquo;', MarkDownFile(content, extensions=['extra']).convert_to_html())
+
+    def test_extension_configs_used(self):
+        content = '"quoted"'
+        html = MarkDownFile(content,
+                            extensions=['smarty'],
+                            extension_configs={'smarty': {'smart_quotes': False}}).convert_to_html()
+        self.assertNotIn('&ldquo;', html)
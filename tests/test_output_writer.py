@@ -0,0 +1,107 @@
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from ssg.engine.output_writer import OutputWriter, WriteStats, write_if_changed
+
+
+class TestOutputWriter(TestCase):
+    def test_jobs_are_done_when_leaving_the_context(self):
+        """Leaving the context must wait for every queued job."""
+        done = []
+
+        with OutputWriter(threads=2) as writer:
+            for i in range(20):
+                writer.submit(lambda i: (time.sleep(0.001), done.append(i)), i)
+
+        self.assertEqual(sorted(done), list(range(20)))
+
+    def test_pending_jobs_are_bounded(self):
+        """Submitting must block while the maximum number of jobs are queued or running."""
+        release = threading.Event()
+        running = []
+
+        with OutputWriter(threads=1, max_pending=2) as writer:
+            writer.submit(release.wait)
+            writer.submit(running.append, 1)
+            blocked = threading.Thread(target=writer.submit, args=(running.append, 2))
+            blocked.start()
+            blocked.join(0.1)
+            self.assertTrue(blocked.is_alive())
+
+            release.set()
+            blocked.join(5)
+            self.assertFalse(blocked.is_alive())
+
+        self.assertEqual(running, [1, 2])
+
+    def test_first_error_raised_after_every_job_is_done(self):
+        """An error must not stop the other jobs, and the first one must be raised when leaving the context."""
+        done = []
+
+        def fail(message):
+            raise OSError(message)
+
+        with patch('builtins.print') as mock_print:
+            with self.assertRaises(OSError) as raised:
+                with OutputWriter(threads=1) as writer:
+                    writer.submit(fail, 'first')
+                    writer.submit(done.append, 1)
+                    writer.submit(fail, 'second')
+
+        self.assertEqual(str(raised.exception), 'first')
+        self.assertEqual(done, [1])
+        mock_print.assert_called_once_with('2 outputs could not be written, raising the first error.')
+
+    def test_error_inside_context_is_not_replaced(self):
+        """An error raised inside the context must be propagated instead of the errors of the jobs."""
+        def fail():
+            raise OSError('job')
+
+        with self.assertRaises(ValueError):
+            with OutputWriter(threads=1) as writer:
+                writer.submit(fail)
+                time.sleep(0.01)
+                raise ValueError('build')
+
+
+class TestWriteIfChanged(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = Path(self.temp_dir.name) / "page.html"
+
+    def test_missing_file_is_written(self):
+        self.assertTrue(write_if_changed(self.path, b"content"))
+        self.assertEqual(self.path.read_bytes(), b"content")
+
+    def test_same_content_is_not_written(self):
+        """A file holding the same bytes must keep its modification time."""
+        self.path.write_bytes(b"content")
+        os.utime(self.path, ns=(0, 0))
+
+        self.assertFalse(write_if_changed(self.path, b"content"))
+        self.assertEqual(self.path.stat().st_mtime_ns, 0)
+
+    def test_different_content_of_same_size_is_written(self):
+        self.path.write_bytes(b"content")
+
+        self.assertTrue(write_if_changed(self.path, b"CONTENT"))
+        self.assertEqual(self.path.read_bytes(), b"CONTENT")
+
+
+class TestWriteStats(TestCase):
+    def test_counts_are_added_and_merged(self):
+        stats = WriteStats()
+        stats.add(True)
+        stats.add(False, 2)
+        other = WriteStats(written=3, unchanged=1)
+
+        stats.merge(other)
+
+        self.assertEqual((stats.written, stats.unchanged), (4, 3))
+        self.assertEqual(str(stats), "4 written, 3 unchanged")
@@ -0,0 +1,93 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from ssg.engine.outputs import OUTPUT_RECORD_FILE_NAME, OutputRecord, prune_outputs
+
+
+class TestOutputRecord(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.destination = Path(self.temp_dir.name)
+
+    def test_round_trip(self):
+        record = OutputRecord(files={'index.html', 'articles/post.html'}, directories={'articles'})
+        record.save(self.destination)
+
+        self.assertEqual(OutputRecord.load(self.destination), record)
+
+    def test_missing_record(self):
+        self.assertIsNone(OutputRecord.load(self.destination))
+
+    def test_record_of_other_version_is_ignored(self):
+        (self.destination / OUTPUT_RECORD_FILE_NAME).write_text(
+            json.dumps({'version': 0, 'files': [], 'directories': []}), encoding='utf-8')
+
+        self.assertIsNone(OutputRecord.load(self.destination))
+
+    def test_paths_outside_destination_are_ignored(self):
+        """A record must never make the engine delete files outside the destination folder."""
+        (self.destination / OUTPUT_RECORD_FILE_NAME).write_text(
+            json.dumps({'version': 1, 'files': ['../outside.html', '/etc/passwd', 'page.html'],
+                        'directories': ['..', '.', '', 'articles']}), encoding='utf-8')
+
+        record = OutputRecord.load(self.destination)
+
+        self.assertEqual(record.files, {'page.html'})
+        self.assertEqual(record.directories, {'articles'})
+
+
+class TestPruneOutputs(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.destination = Path(self.temp_dir.name)
+
+    def _create(self, *paths: str):
+        for path in paths:
+            (self.destination / path).parent.mkdir(parents=True, exist_ok=True)
+            (self.destination / path).write_text('content', encoding='utf-8')
+
+    def test_stale_files_are_deleted(self):
+        self._create('old.html', 'new.html', 'kept.html')
+        previous = OutputRecord(files={'old.html', 'kept.html'})
+        current = OutputRecord(files={'new.html', 'kept.html'})
+
+        deleted = prune_outputs(self.destination, previous, current)
+
+        self.assertEqual(deleted, [self.destination / 'old.html'])
+        self.assertTrue((self.destination / 'new.html').exists())
+        self.assertTrue((self.destination / 'kept.html').exists())
+
+    def test_files_not_produced_by_a_build_are_kept(self):
+        self._create('CNAME', 'old.html')
+
+        prune_outputs(self.destination, OutputRecord(files={'old.html'}), OutputRecord())
+
+        self.assertTrue((self.destination / 'CNAME').exists())
+
+    def test_empty_stale_directories_are_deleted_deepest_first(self):
+        self._create('a/b/page.html')
+        previous = OutputRecord(files={'a/b/page.html'}, directories={'a', 'a/b'})
+
+        deleted = prune_outputs(self.destination, previous, OutputRecord())
+
+        self.assertEqual(deleted, [self.destination / 'a/b/page.html', self.destination / 'a/b', self.destination / 'a'])
+        self.assertFalse((self.destination / 'a').exists())
+
+    def test_directories_holding_other_files_are_kept(self):
+        self._create('a/page.html', 'a/notes.txt')
+        previous = OutputRecord(files={'a/page.html'}, directories={'a'})
+
+        prune_outputs(self.destination, previous, OutputRecord())
+
+        self.assertFalse((self.destination / 'a/page.html').exists())
+        self.assertTrue((self.destination / 'a/notes.txt').exists())
+
+    def test_directory_at_recorded_file_path_is_kept(self):
+        (self.destination / 'page.html').mkdir()
+
+        self.assertEqual(prune_outputs(self.destination, OutputRecord(files={'page.html'}), OutputRecord()), [])
+        self.assertTrue((self.destination / 'page.html').is_dir())
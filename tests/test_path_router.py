@@ -0,0 +1,118 @@
+import fnmatch
+import random
+from pathlib import Path
+from unittest import TestCase
+
+from ssg.config import Config
+from ssg.config.path_router import PathRouter, PatternList
+
+PATTERNS = ['*.md', 'posts/*', 'posts/**/*.md', '[!p]*/index.md', 'a?c/*', '*/img-*/cover.*', 'docs/[a-c]*', '*']
+
+
+def _make_config() -> Config:
+    return Config.from_json({
+        'source': 'source',
+        'destination': 'destination',
+        'baseHref': 'https://example.com/',
+        'hostname': 'example.com',
+        'exclude': ['.git', 'ignore', 'drafts/*.md'],
+        'meta': {
+            'default': {'og:title': 'Default'},
+            'matchers': [
+                {'file': 'index.md', 'action': 'USE_DEFAULT'},
+                {'file': 'posts/*.md', 'action': 'TAKE_FROM_CONTENT'},
+                {'file': '*', 'action': 'STATIC', 'meta': {'og:title': 'Static'}},
+            ]
+        },
+        'frames': [
+            {'file': 'posts/*', 'frame': 'frames/post.html'},
+            {'file': '*', 'frame': 'frames/default.html'},
+        ],
+        'rssFeeds': [
+            {'title': 'All', 'description': 'd', 'link': 'l', 'feed_url': 'f', 'language': 'en',
+             'matcher': '*.md', 'outputLocation': 'all.xml'},
+            {'title': 'Posts', 'description': 'd', 'link': 'l', 'feed_url': 'f', 'language': 'en',
+             'matcher': 'posts/*.md', 'outputLocation': 'posts.xml'},
+        ]
+    })
+
+
+class TestPatternList(TestCase):
+    def test_empty_list_matches_nothing(self):
+        patterns = PatternList([])
+        self.assertIsNone(patterns.first_match('index.md'))
+        self.assertEqual(patterns.all_matches('index.md'), [])
+        self.assertFalse(patterns.matches('index.md'))
+
+    def test_first_match_returns_index_of_first_matching_pattern(self):
+        patterns = PatternList(['posts/*', '*.md', '*'])
+        self.assertEqual(patterns.first_match('posts/hello.md'), 0)
+        self.assertEqual(patterns.first_match('index.md'), 1)
+        self.assertEqual(patterns.first_match('style.css'), 2)
+
+    def test_all_matches_returns_every_matching_index_in_order(self):
+        patterns = PatternList(['*.css', 'posts/*', '*.md', '*'])
+        self.assertEqual(patterns.all_matches('posts/hello.md'), [1, 2, 3])
+        self.assertEqual(patterns.all_matches('index.md'), [2, 3])
+
+    def test_special_characters_are_escaped(self):
+        patterns = PatternList(['a+b(c).md', 'x|y'])
+        self.assertEqual(patterns.first_match('a+b(c).md'), 0)
+        self.assertIsNone(patterns.first_match('aab(c).md'))
+        self.assertEqual(patterns.first_match('x|y'), 1)
+        self.assertIsNone(patterns.first_match('x'))
+
+    def test_matches_name_or_path(self):
+        patterns = PatternList(['ignore', 'drafts/*.md'])
+        self.assertTrue(patterns.matches_name_or_path('ignore', 'some/ignore'))
+        self.assertTrue(patterns.matches_name_or_path('a.md', 'drafts/a.md'))
+        self.assertFalse(patterns.matches_name_or_path('a.md', 'posts/a.md'))
+
+    def test_same_results_as_fnmatch(self):
+        """Compiled patterns must agree with matching the patterns one by one with fnmatch."""
+        rng = random.Random(42)
+        segments = ['posts', 'docs', 'abc', 'img-a', 'index.md', 'cover.png', 'b.md', 'pages']
+        patterns = PatternList(PATTERNS)
+        for _ in range(500):
+            path = '/'.join(rng.choice(segments) for _ in range(rng.randint(1, 4)))
+            expected = [i for i, pattern in enumerate(PATTERNS) if fnmatch.fnmatch(path, pattern)]
+            self.assertEqual(patterns.all_matches(path), expected, path)
+            self.assertEqual(patterns.first_match(path), expected[0] if expected else None, path)
+
+
+class TestPathRouter(TestCase):
+    def setUp(self):
+        self.config = _make_config()
+        self.router = PathRouter(self.config)
+
+    def test_get_frame(self):
+        self.assertEqual(self.router.get_frame(Path('posts/hello.md')), Path('frames/post.html'))
+        self.assertEqual(self.router.get_frame(Path('index.md')), Path('frames/default.html'))
+
+    def test_get_frame_without_match(self):
+        self.config.frames = self.config.frames[:1]
+        self.assertIsNone(PathRouter(self.config).get_frame(Path('index.md')))
+
+    def test_is_frame(self):
+        self.assertTrue(self.router.is_frame(Path('frames/post.html')))
+        self.assertFalse(self.router.is_frame(Path('frames/other.html')))
+
+    def test_get_meta_matcher(self):
+        self.assertEqual(self.router.get_meta_matcher(Path('index.md')).action, 'USE_DEFAULT')
+        self.assertEqual(self.router.get_meta_matcher(Path('posts/hello.md')).action, 'TAKE_FROM_CONTENT')
+        self.assertEqual(self.router.get_meta_matcher(Path('about.md')).action, 'STATIC')
+
+    def test_get_meta_matcher_without_meta(self):
+        self.config.meta = None
+        self.assertIsNone(PathRouter(self.config).get_meta_matcher(Path('index.md')))
+
+    def test_get_feeds(self):
+        self.assertEqual([feed.title for feed in self.router.get_feeds(Path('posts/hello.md'))], ['All', 'Posts'])
+        self.assertEqual([feed.title for feed in self.router.get_feeds(Path('index.md'))], ['All'])
+        self.assertEqual(self.router.get_feeds(Path('style.css')), [])
+
+    def test_is_excluded(self):
+        self.assertTrue(self.router.is_excluded(Path('.git')))
+        self.assertTrue(self.router.is_excluded(Path('posts/ignore')))
+        self.assertTrue(self.router.is_excluded(Path('drafts/a.md')))
+        self.assertFalse(self.router.is_excluded(Path('posts/a.md')))
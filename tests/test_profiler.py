@@ -0,0 +1,117 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from ssg.engine.profiler import BuildProfiler
+
+
+class TestBuildProfiler(TestCase):
+    def test_stage_times_are_added_up(self):
+        """Each call of a stage must be counted and its time added to the stage and to the page."""
+        profiler = BuildProfiler()
+
+        for page in ("a.md", "b.md", "a.md"):
+            with profiler.stage("markdown_conversion", Path(page)):
+                pass
+        with profiler.stage("feed_generation"):
+            pass
+
+        self.assertEqual(profiler.stages["markdown_conversion"].calls, 3)
+        self.assertEqual(profiler.pages["a.md"]["markdown_conversion"].calls, 2)
+        self.assertEqual(set(profiler.pages), {"a.md", "b.md"})
+        self.assertEqual(profiler.stages["feed_generation"].calls, 1)
+
+    def test_disabled_profiler_records_nothing(self):
+        """A disabled profiler must not record any time."""
+        profiler = BuildProfiler(enabled=False)
+
+        profiler.start()
+        with profiler.stage("meta", Path("a.md")):
+            pass
+        profiler.stop()
+
+        self.assertEqual(profiler.stages, {})
+        self.assertEqual(profiler.pages, {})
+        self.assertEqual(profiler.wall, 0.0)
+
+    def test_slowest_pages_first(self):
+        """Pages must be ordered by the sum of the time of their stages, the slowest first."""
+        profiler = BuildProfiler()
+        profiler.record("markdown_conversion", "fast.md", 0.1, 0.1)
+        profiler.record("markdown_conversion", "slow.md", 0.2, 0.2)
+        profiler.record("html_write", "slow.md", 0.2, 0.1)
+        profiler.record("markdown_conversion", "medium.md", 0.3, 0.3)
+
+        slowest = profiler.slowest_pages(2)
+
+        self.assertEqual([page for page, _ in slowest], ["slow.md", "medium.md"])
+        self.assertAlmostEqual(slowest[0][1].wall, 0.4)
+        self.assertAlmostEqual(slowest[0][1].cpu, 0.3)
+
+    def test_page_records_can_be_merged(self):
+        """Times recorded by a worker must be added to the profiler of the build as they are."""
+        worker = BuildProfiler()
+        worker.record("html_write", "a.md", 0.5, 0.25)
+        profiler = BuildProfiler()
+        profiler.record("html_write", "b.md", 1.0, 0.5)
+
+        for record in worker.page_records():
+            profiler.record(*record)
+
+        self.assertEqual(profiler.stages["html_write"].calls, 2)
+        self.assertAlmostEqual(profiler.stages["html_write"].wall, 1.5)
+        self.assertAlmostEqual(profiler.pages["a.md"]["html_write"].cpu, 0.25)
+
+    def test_memory_is_traced_when_requested(self):
+        """The peak memory must only be recorded when memory tracing is enabled."""
+        untraced = BuildProfiler()
+        untraced.start()
+        untraced.stop()
+        traced = BuildProfiler(trace_memory=True)
+        traced.start()
+        data = [bytes(1024) for _ in range(100)]
+        traced.stop()
+
+        self.assertIsNone(untraced.peak_memory)
+        self.assertGreater(traced.peak_memory, 100 * 1024)
+        del data
+
+    def test_report_saved_as_json(self):
+        """The JSON report must hold the stages in build order and the pages, the slowest first."""
+        profiler = BuildProfiler()
+        profiler.record("html_write", "a.md", 0.1, 0.1)
+        profiler.record("meta", "b.md", 0.2, 0.2)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "profile.json"
+            profiler.save(path)
+            report = json.loads(path.read_text(encoding="utf-8"))
+
+        self.assertEqual(list(report["stages"]), ["meta", "html_write"])
+        self.assertEqual([page["path"] for page in report["pages"]], ["b.md", "a.md"])
+        self.assertEqual(report["pages"][0]["stages"]["meta"]["calls"], 1)
+
+    def test_summary_lists_slowest_pages(self):
+        """The summary must list the stages and at most the requested number of pages."""
+        profiler = BuildProfiler()
+        for i in range(5):
+            profiler.record("markdown_conversion", f"page-{i}.md", i / 10, i / 10)
+
+        summary = profiler.summary(top=2)
+
+        self.assertIn("markdown_conversion", summary)
+        self.assertIn("page-4.md", summary)
+        self.assertIn("page-3.md", summary)
+        self.assertNotIn("page-2.md", summary)
+
+    def test_render_loop_dumps_cprofile_stats(self):
+        """The render loop must be profiled with cProfile when a dump file is set."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "render.prof"
+            profiler = BuildProfiler(cprofile_path=path)
+
+            with profiler.render_loop():
+                sum(range(1000))
+
+            self.assertTrue(path.is_file())
@@ -8,7 +8,8 @@ from ssg.content.article import Article, Author
 from ssg.content.markdown_file import MarkDownFile
 from ssg.config.config import RssFeed
 from ssg.dirtree.file_node import FileNode
-from ssg.rss.rss_feed_generator import FeedItem, RssFeedGenerator
+from ssg.rss.rss_feed_generator import FeedItem, LatestFeedItems, RssFeedGenerator
+from ssg.rss.rss_writer import write_rss_feed
 
 
 def _make_rss_config(
@@ -278,3 +279,130 @@ class TestRssFeedGeneratorGenerateFeeds(TestCase):
         with self.assertRaises(OSError):
             gen.generate_feeds(missing)
 
+
+    def test_limit_keeps_first_added_of_equal_dates(self):
+        """Among items published at the same time, the ones added first must be kept and written first."""
+        cfg = _make_rss_config(title="Posts", matcher="*.md", limit=2)
+        gen = RssFeedGenerator([cfg])
+        for title in ("A", "B", "C"):
+            self._add_article(gen, f"{title}.md", title=title, when=datetime(2025, 1, 1, tzinfo=UTC))
+
+        gen.generate_feeds(self.destination)
+
+        self.assertEqual(["A", "B"], self._parse_titles(self.destination / "rss.xml"))
+
+    def test_only_listed_feeds_written(self):
+        """When feed_ids is given, only these feeds must be written."""
+        cfg_a = _make_rss_config(title="A", output_location="a.xml")
+        cfg_b = _make_rss_config(title="B", output_location="b.xml")
+        gen = RssFeedGenerator([cfg_a, cfg_b])
+
+        gen.generate_feeds(self.destination, {"B"})
+
+        self.assertFalse((self.destination / "a.xml").exists())
+        self.assertTrue((self.destination / "b.xml").exists())
+
+
+class TestLatestFeedItems(TestCase):
+    @staticmethod
+    def _item(title: str, when: datetime | None) -> FeedItem:
+        return FeedItem.from_article(_make_article_mock(title=title, last_edited=when))
+
+    def test_keeps_only_the_most_recent_items(self):
+        """No more than limit items must be kept, dropping the oldest ones."""
+        items = LatestFeedItems(3)
+        for day in (5, 1, 9, 3, 7, 2):
+            items.append(self._item(f"day {day}", datetime(2025, 1, day, tzinfo=UTC)))
+
+        self.assertEqual(len(items), 3)
+        self.assertEqual(["day 9", "day 7", "day 5"], [item.title for item in items.newest_first()])
+
+    def test_items_without_pub_date_are_dropped(self):
+        """Items without a pubDate are never written, so they must not take a place in the feed."""
+        items = LatestFeedItems(2)
+        items.append(self._item("dated", datetime(2025, 1, 1, tzinfo=UTC)))
+        items.append(self._item("undated", None))
+
+        self.assertEqual(["dated"], [item.title for item in items.newest_first()])
+
+    def test_zero_limit_keeps_nothing(self):
+        """A limit of 0 must produce an empty feed."""
+        items = LatestFeedItems(0)
+        items.append(self._item("dated", datetime(2025, 1, 1, tzinfo=UTC)))
+
+        self.assertEqual(len(items), 0)
+
+
+class TestWriteRssFeed(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = Path(self.temp_dir.name) / "rss.xml"
+
+    def test_channel_written(self):
+        """The channel must hold the settings of the feed and the build date."""
+        cfg = _make_rss_config(title="Posts & News")
+
+        write_rss_feed(self.path, cfg, [], build_date=datetime(2025, 6, 1, 12, 30, tzinfo=UTC))
+
+        channel = ET.fromstring(self.path.read_bytes()).find("channel")
+        self.assertEqual(channel.findtext("title"), "Posts & News")
+        self.assertEqual(channel.findtext("link"), "https://example.com/rss.xml")
+        self.assertEqual(channel.findtext("lastBuildDate"), "Sun, 01 Jun 2025 12:30:00 +0000")
+        self.assertEqual(channel.findtext("generator"), "python-feedgen")
+        self.assertEqual(channel.find("{http://www.w3.org/2005/Atom}link").get("href"), "https://example.com/rss.xml")
+        self.assertEqual(list(channel.iter("item")), [])
+
+    def test_items_written_in_given_order(self):
+        """Items must be written in the order they are given, with escaped text and RFC 2822 dates."""
+        items = [
+            FeedItem(title="<First>", description="a & b", link="https://example.com/1?a=1&b=2",
+                     guid="https://example.com/1", pubDate=datetime(2025, 1, 2, tzinfo=UTC),
+                     cover_image="https://example.com/cover.png", author_name=None, author_email="jane@example.com"),
+            FeedItem(title="Second", description="Second", link="https://example.com/2",
+                     guid="https://example.com/2", pubDate=datetime(2025, 1, 1, tzinfo=UTC),
+                     cover_image=None, author_name="Jane Doe", author_email=None),
+        ]
+
+        write_rss_feed(self.path, _make_rss_config(), iter(items))
+
+        first, second = ET.fromstring(self.path.read_bytes()).iter("item")
+        self.assertEqual(first.findtext("title"), "<First>")
+        self.assertEqual(first.findtext("description"), "a & b")
+        self.assertEqual(first.findtext("link"), "https://example.com/1?a=1&b=2")
+        self.assertEqual(first.findtext("author"), "jane@example.com")
+        self.assertEqual(first.findtext("pubDate"), "Thu, 02 Jan 2025 00:00:00 +0000")
+        self.assertEqual(first.find("guid").get("isPermaLink"), "true")
+        self.assertEqual(first.find("enclosure").attrib,
+                         {"url": "https://example.com/cover.png", "length": "0", "type": "image/png"})
+        self.assertEqual(second.findtext("title"), "Second")
+        self.assertIsNone(second.find("author"))
+        self.assertIsNone(second.find("enclosure"))
+
+    def test_feed_differing_only_by_build_date_is_not_written(self):
+        """In if-changed mode, a new build date alone must not rewrite the feed."""
+        items = [FeedItem(title="First", description="First", link="https://example.com/1",
+                          guid="https://example.com/1", pubDate=datetime(2025, 1, 1, tzinfo=UTC),
+                          cover_image=None, author_name=None, author_email=None)]
+        write_rss_feed(self.path, _make_rss_config(), items, build_date=datetime(2025, 6, 1, tzinfo=UTC))
+        content = self.path.read_bytes()
+
+        written = write_rss_feed(self.path, _make_rss_config(), items, build_date=datetime(2025, 6, 2, tzinfo=UTC),
+                                 if_changed=True)
+
+        self.assertFalse(written)
+        self.assertEqual(self.path.read_bytes(), content)
+
+    def test_feed_with_changed_items_is_written(self):
+        write_rss_feed(self.path, _make_rss_config(), [], build_date=datetime(2025, 6, 1, tzinfo=UTC))
+        items = [FeedItem(title="First", description="First", link="https://example.com/1",
+                          guid="https://example.com/1", pubDate=datetime(2025, 1, 1, tzinfo=UTC),
+                          cover_image=None, author_name=None, author_email=None)]
+
+        written = write_rss_feed(self.path, _make_rss_config(), items, build_date=datetime(2025, 6, 2, tzinfo=UTC),
+                                 if_changed=True)
+
+        self.assertTrue(written)
+        channel = ET.fromstring(self.path.read_bytes()).find("channel")
+        self.assertEqual(channel.findtext("lastBuildDate"), "Mon, 02 Jun 2025 00:00:00 +0000")
+        self.assertEqual(len(list(channel.iter("item"))), 1)
@@ -0,0 +1,105 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from ssg.dirtree.file_node import FileNode, FileStat
+from ssg.engine.schedule import PageCost, RenderCosts, estimate_makespan, schedule_pages
+from tests.test_engine import TestEngineBase
+
+
+def _file(path: str, size: int) -> FileNode:
+    return FileNode(Path(path), stat=FileStat(size=size, mtime_ns=0, inode=0, device=0))
+
+
+class TestRenderCosts(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache_dir = Path(self.temp_dir.name) / 'cache'
+
+    def test_save_and_load(self):
+        RenderCosts({'a.md': PageCost(seconds=0.5, size=100)}).save(self.cache_dir)
+
+        self.assertEqual(RenderCosts.load(self.cache_dir).entries, {'a.md': PageCost(seconds=0.5, size=100)})
+
+    def test_missing(self):
+        self.assertIsNone(RenderCosts.load(self.cache_dir))
+
+    def test_estimate(self):
+        costs = RenderCosts({'a.md': PageCost(seconds=1.0, size=100), 'b.md': PageCost(seconds=3.0, size=100)})
+
+        self.assertEqual(costs.seconds_per_byte(), 0.02)
+        self.assertEqual(costs.estimate(_file('a.md', 200), costs.seconds_per_byte()), 2.0)
+        self.assertEqual(costs.estimate(_file('new.md', 50), costs.seconds_per_byte()), 1.0)
+        self.assertIsNone(RenderCosts().estimate(_file('new.md', 50), RenderCosts().seconds_per_byte()))
+
+
+class TestSchedulePages(TestCase):
+    def test_largest_first_without_history(self):
+        pages = [_file('a.md', 10), _file('b.md', 30), _file('c.md', 20), _file('d.md', 30)]
+
+        schedule = schedule_pages(pages, None, 2)
+
+        self.assertEqual([file.name for file in schedule.pages], ['b', 'd', 'c', 'a'])
+        self.assertIsNone(schedule.estimated_makespan({file.path for file in pages}, 2))
+
+    def test_longest_first_with_history(self):
+        """A small page which took long to render must be sent before larger pages which were quick to render."""
+        pages = [_file('small.md', 10), _file('large.md', 1000), _file('new.md', 500)]
+        costs = RenderCosts({'small.md': PageCost(seconds=5.0, size=10), 'large.md': PageCost(seconds=1.0, size=1000)})
+
+        schedule = schedule_pages(pages, costs, 2)
+
+        self.assertEqual([file.name for file in schedule.pages], ['small', 'new', 'large'])
+        self.assertTrue(schedule.timed)
+        self.assertAlmostEqual(schedule.estimated_makespan({file.path for file in pages}, 2), 5.0)
+        self.assertAlmostEqual(schedule.estimated_makespan({Path('large.md'), Path('new.md')}, 2), 2.97, places=2)
+
+    def test_estimate_makespan(self):
+        self.assertEqual(estimate_makespan([4, 3, 3, 2, 2], 2), 8)
+        self.assertEqual(estimate_makespan([2, 2, 3, 3, 4], 2), 9)
+        self.assertEqual(estimate_makespan([], 2), 0)
+
+
+class TestEngineSchedule(TestEngineBase):
+    def setUp(self):
+        super().setUp()
+        # The last-edit index shares the cache directory, but needs a real repository.
+        patcher = patch('ssg.engine.engine.get_last_edit_time_for_files_cached', return_value={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for index in range(6):
+            self._write_source_file(f'page_{index}.md', f'# Page {index}' + ' text' * index * 100)
+        self.config = self._make_config()
+        self.config.cacheDir = self.workspace_dir / 'cache'
+
+    def _build(self, jobs: int) -> list[str]:
+        with patch('builtins.print') as mock_print:
+            self._run_engine(self.config, jobs=jobs)
+        return [str(call.args[0]) for call in mock_print.call_args_list]
+
+    def test_render_times_are_recorded(self):
+        self._build(jobs=1)
+
+        costs = RenderCosts.load(self.config.cacheDir)
+
+        self.assertEqual(sorted(costs.entries), ['page_0.md', 'page_1.md', 'page_2.md', 'page_3.md', 'page_4.md',
+                                                 'page_5.md', 'test.md'])
+        self.assertTrue(all(cost.seconds > 0 for cost in costs.entries.values()))
+
+    def test_makespan_is_reported(self):
+        logs = self._build(jobs=2)
+        self.assertRegex('\n'.join(logs), r'Render schedule: estimated makespan unknown \(no render times recorded\), '
+                                           r'actual \d+\.\d\d s')
+
+        logs = self._build(jobs=2)
+        self.assertRegex('\n'.join(logs), r'Render schedule: estimated makespan \d+\.\d\d s, actual \d+\.\d\d s')
+
+    def test_deleted_page_is_forgotten(self):
+        self._build(jobs=1)
+        (self.source_dir / 'page_0.md').unlink()
+
+        self._build(jobs=1)
+
+        self.assertNotIn('page_0.md', RenderCosts.load(self.config.cacheDir).entries)
@@ -0,0 +1,213 @@
+import dataclasses
+import re
+import tempfile
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from ssg.config.config import Config, Frame as ConfigFrame, Matcher, Meta, MetaFields, RssFeed
+from ssg.dirtree.file_node import FileNode, FileStat
+from ssg.engine.check import is_up_to_date
+from ssg.engine.engine import Engine
+from ssg.engine.manifest import MANIFEST_FILE_NAME, BuildManifest
+from ssg.engine.outputs import OUTPUT_RECORD_FILE_NAME, OutputRecord
+from ssg.engine.shard import SHARD_RESULT_FILE_NAME, Shard, ShardResult, merge_shards, partition
+from tests.test_engine import TestEngineBase
+from tests.test_git import GitRepositoryTestCase
+
+RECORD_FILES = {OUTPUT_RECORD_FILE_NAME, SHARD_RESULT_FILE_NAME, MANIFEST_FILE_NAME}
+
+
+class TestShard(TestCase):
+    def test_parse(self):
+        self.assertEqual(Shard.parse('2/4'), Shard(2, 4))
+        self.assertEqual(str(Shard.parse('1/1')), '1/1')
+        for value in ('0/2', '3/2', '2', '1/x', '/', '1/0'):
+            with self.assertRaises(ValueError, msg=value):
+                Shard.parse(value)
+
+
+class TestPartition(TestCase):
+    @staticmethod
+    def _file(path: str, size: int) -> FileNode:
+        return FileNode(Path(path), stat=FileStat(size=size, mtime_ns=0, inode=0, device=0))
+
+    def test_every_file_in_one_part(self):
+        files = [self._file(f'{index}.md', index * 7 % 13) for index in range(50)]
+
+        parts = partition(files, 4)
+
+        self.assertEqual(sorted(f.path for part in parts for f in part), sorted(f.path for f in files))
+
+    def test_parts_are_balanced_by_size(self):
+        files = [self._file('big.md', 100)] + [self._file(f'{index}.md', 10) for index in range(10)]
+
+        parts = partition(files, 2)
+
+        self.assertEqual(sorted(sum(f.stat.size for f in part) for part in parts), [100, 100])
+
+    def test_independent_of_file_order(self):
+        files = [self._file(f'{index}.md', index % 3) for index in range(20)]
+
+        parts = partition(files, 3)
+
+        self.assertEqual([[f.path for f in part] for part in partition(list(reversed(files)), 3)],
+                         [[f.path for f in part] for part in parts])
+
+
+class TestShardResult(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.directory = Path(self.temp_dir.name)
+
+    def test_save_and_load(self):
+        result = ShardResult(shard=Shard(1, 2), config_fingerprint='config', fingerprint='inputs',
+                             files={'a.html', 'img/b.png'}, directories={'img'})
+        result.save(self.directory)
+
+        self.assertEqual(ShardResult.load(self.directory), result)
+
+    def test_missing(self):
+        self.assertIsNone(ShardResult.load(self.directory))
+
+    def test_malformed(self):
+        (self.directory / SHARD_RESULT_FILE_NAME).write_text('{"version": 1}', encoding='utf-8')
+
+        with patch('builtins.print'):
+            self.assertIsNone(ShardResult.load(self.directory))
+
+
+class TestShardedBuild(TestEngineBase):
+    """A site built in shards and merged must be the same as the site built at once."""
+
+    def setUp(self):
+        super().setUp()
+        self.git_timestamps = {}
+        for index in range(8):
+            path = self._write_source_file(f'posts/post-{index}.md', f'# Post {index}\n\n' + 'text ' * (index * 50))
+            # Two posts per day, so the order of the pages decides the order of the entries with the same date.
+            self.git_timestamps[path] = datetime(2025, 1, 1 + index // 2, tzinfo=UTC)
+        self._write_source_file('posts/images/photo.png', 'png' * 100)
+        self._write_source_file('style.css', 'body {}')
+        self.config = self._make_config()
+        self.config.rssFeeds = [RssFeed(title='Posts', description='Posts', link='https://example.com/',
+                                        feed_url='https://example.com/posts.xml', language='en', matcher='posts/*.md',
+                                        limit=5, outputLocation=Path('posts.xml'))]
+
+    def _build(self, destination: Path, shard: Shard | None = None, incremental: bool = False):
+        self.config.destination = destination
+        with patch('builtins.print'):
+            self._run_engine(self.config, self.git_timestamps, shard=shard, incremental=incremental)
+
+    def _build_shards(self, count: int, incremental: bool = False) -> list[Path]:
+        directories = [self.workspace_dir / f'shard-{index}' for index in range(1, count + 1)]
+        for index, directory in enumerate(directories, start=1):
+            self._build(directory, Shard(index, count), incremental)
+        return directories
+
+    def _merge(self, directories: list[Path], destination: Path) -> OutputRecord:
+        self.config.destination = destination
+        # The source folder is not a repository, the shards were built with a mocked git client.
+        with patch('builtins.print'), patch('ssg.engine.check.read_head', return_value=None):
+            return merge_shards(self.config, directories)
+
+    @staticmethod
+    def _outputs(directory: Path) -> dict[str, str]:
+        return {path.relative_to(directory).as_posix():
+                re.sub('<lastBuildDate>.*</lastBuildDate>', '', path.read_text(encoding='utf-8'))
+                for path in directory.rglob('*') if path.is_file() and path.name not in RECORD_FILES}
+
+    def test_merged_site_matches_full_build(self):
+        self._build(self.workspace_dir / 'full')
+        directories = self._build_shards(3)
+
+        record = self._merge(directories, self.workspace_dir / 'merged')
+
+        self.assertEqual(self._outputs(self.workspace_dir / 'merged'), self._outputs(self.workspace_dir / 'full'))
+        full = OutputRecord.load(self.workspace_dir / 'full')
+        self.assertEqual((record.files, record.directories), (full.files, full.directories))
+
+    def test_shards_split_pages_and_assets(self):
+        directories = self._build_shards(3)
+
+        outputs = [set(self._outputs(directory)) for directory in directories]
+
+        self.assertTrue(all(outputs))
+        self.assertEqual(sum(len(files) for files in outputs), len(set().union(*outputs)))
+        self.assertFalse(any('posts.xml' in files for files in outputs))
+
+    def test_merge_into_shard_directory(self):
+        self._build(self.workspace_dir / 'full')
+        directories = self._build_shards(2)
+
+        self._merge(directories, directories[0])
+
+        self.assertEqual(self._outputs(directories[0]), self._outputs(self.workspace_dir / 'full'))
+
+    def test_merge_deletes_outputs_no_longer_produced(self):
+        self._merge(self._build_shards(2), self.workspace_dir / 'merged')
+        (self.source_dir / 'posts/post-0.md').unlink()
+
+        self._merge(self._build_shards(2), self.workspace_dir / 'merged')
+
+        self.assertFalse((self.workspace_dir / 'merged/posts/post-0.html').exists())
+        self.assertTrue((self.workspace_dir / 'merged/posts/post-1.html').exists())
+
+    def test_incremental_shards_merge_manifest(self):
+        self._merge(self._build_shards(2, incremental=True), self.workspace_dir / 'merged')
+
+        manifest = BuildManifest.load(self.workspace_dir / 'merged')
+
+        self.assertEqual(len(manifest.pages), 9)
+
+    def test_missing_shard(self):
+        directories = self._build_shards(3)
+
+        with self.assertRaisesRegex(Exception, 'Missing shards: 2/3'):
+            self._merge([directories[0], directories[2]], self.workspace_dir / 'merged')
+
+    def test_different_configuration(self):
+        directories = self._build_shards(2)
+        self.config.hostname = 'other.com'
+
+        with self.assertRaisesRegex(Exception, 'different configuration'):
+            self._merge(directories, self.workspace_dir / 'merged')
+
+
+class TestMergedFingerprint(GitRepositoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.source = self._path('site')
+        self.source.mkdir()
+        (self.source / 'frame.html').write_text('<html><body><article id="main-content"></article></body></html>',
+                                                encoding='utf-8')
+        for name in ('a.md', 'b.md'):
+            (self.source / name).write_text(f'# {name}', encoding='utf-8')
+        self._commit({'site/a.md': '# a.md', 'site/b.md': '# b.md'}, 1_700_000_000)
+        self.config = Config(source=self.source, destination=Path(self.temp_dir.name) / 'destination',
+                             hostname='example.com', baseHref='https://example.com/', exclude=[],
+                             meta=Meta(default=MetaFields(title='Site', image=None, description=None, url=None),
+                                       matchers=[Matcher(file='*.md', action='USE_DEFAULT', meta_fields=None)]),
+                             frames=[ConfigFrame(file='*.md', frame=Path('frame.html'))])
+        self.shards = [Path(self.temp_dir.name) / f'shard-{index}' for index in (1, 2)]
+        with patch('builtins.print'):
+            for index, directory in enumerate(self.shards, start=1):
+                directory.mkdir()
+                Engine(dataclasses.replace(self.config, destination=directory), shard=Shard(index, 2)).run()
+
+    def test_merged_site_is_up_to_date(self):
+        with patch('builtins.print'):
+            merge_shards(self.config, self.shards)
+
+        self.assertTrue(is_up_to_date(self.config))
+
+    def test_source_changed_after_building_shards(self):
+        (self.source / 'a.md').write_text('# Changed', encoding='utf-8')
+
+        with patch('builtins.print'):
+            record = merge_shards(self.config, self.shards)
+
+        self.assertIsNone(record.fingerprint)
+        self.assertFalse(is_up_to_date(self.config))
@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from ssg.config.path_router import PatternList
+from ssg.engine.watch import Watcher, changed_paths, snapshot
+
+FRAME_HTML = '<html><head><title>Site</title></head><body><article id="main-content"></article></body></html>'
+
+
+class TestSnapshot(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.source_dir = Path(self.temp_dir.name)
+
+    def _write_file(self, relative_path: str, content: str = '') -> Path:
+        path = self.source_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+        return path
+
+    def test_snapshot_records_files_relative_to_source(self):
+        self._write_file('index.md', '# Index')
+        self._write_file('posts/post.md', '# Post')
+
+        files = snapshot(self.source_dir, PatternList([]))
+
+        self.assertEqual(set(files), {Path('index.md'), Path('posts/post.md')})
+        self.assertEqual(files[Path('index.md')][1], len('# Index'))
+
+    def test_snapshot_skips_excluded_and_ignored_paths(self):
+        self._write_file('index.md')
+        self._write_file('.git/HEAD')
+        self._write_file('drafts/draft.md')
+        self._write_file('dist/index.html')
+
+        files = snapshot(self.source_dir,
+                         PatternList(['.git', 'drafts/*.md']),
+                         frozenset([(self.source_dir / 'dist').resolve()]))
+
+        self.assertEqual(set(files), {Path('index.md')})
+
+    def test_changed_paths(self):
+        path = self._write_file('index.md', 'a')
+        self._write_file('removed.md')
+        before = snapshot(self.source_dir, PatternList([]))
+
+        os.utime(path, ns=(0, 0))
+        (self.source_dir / 'removed.md').unlink()
+        self._write_file('added.md')
+        after = snapshot(self.source_dir, PatternList([]))
+
+        self.assertEqual(changed_paths(before, after), {Path('index.md'), Path('removed.md'), Path('added.md')})
+        self.assertEqual(changed_paths(after, after), set())
+
+
+class TestWatcher(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        workspace = Path(self.temp_dir.name)
+        self.source_dir = workspace / 'source'
+        self.destination_dir = workspace / 'destination'
+        self.source_dir.mkdir()
+        (self.source_dir / 'frame.html').write_text(FRAME_HTML, encoding='utf-8')
+        (self.source_dir / 'index.md').write_text('# Index', encoding='utf-8')
+
+        self.config_path = workspace / 'config.json'
+        self._write_config('example.com')
+
+        patcher = patch('ssg.engine.engine.git.GitClient')
+        mock_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        git_client = MagicMock()
+        git_client.get_last_edit_time_for_files.return_value = {}
+        git_client.get_head.return_value = 'head'
+        mock_class.return_value = git_client
+
+        self.watcher = Watcher(self.config_path)
+        with patch('builtins.print'):
+            self.watcher.build()
+
+    def _write_config(self, hostname: str):
+        self.config_path.write_text(json.dumps({
+            'source': self.source_dir.as_posix(),
+            'destination': self.destination_dir.as_posix(),
+            'baseHref': 'https://example.com/',
+            'hostname': hostname,
+            'meta': {'default': {}, 'matchers': [{'file': '*.md', 'action': 'TAKE_FROM_CONTENT'}]},
+            'frames': [{'file': '*.md', 'frame': 'frame.html'}],
+        }), encoding='utf-8')
+
+    def _poll(self):
+        with patch('builtins.print'):
+            return self.watcher.poll()
+
+    def test_initial_build(self):
+        self.assertTrue((self.destination_dir / 'index.html').exists())
+
+    def test_poll_without_changes(self):
+        self.assertTrue(self._poll().is_empty())
+
+    def test_poll_renders_changed_page(self):
+        (self.source_dir / 'index.md').write_text('# Changed content', encoding='utf-8')
+
+        update = self._poll()
+
+        self.assertEqual(update.pages, [Path('index.md')])
+        self.assertIn('Changed content', (self.destination_dir / 'index.html').read_text(encoding='utf-8'))
+
+    def test_config_change_rebuilds_site(self):
+        self._write_config('other.example.com')
+
+        self.assertIsNone(self._poll())
+        self.assertEqual(self.watcher.engine.config.hostname, 'other.example.com')
+        self.assertIn('other.example.com', (self.destination_dir / 'index.html').read_text(encoding='utf-8'))